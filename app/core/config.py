@@ -26,6 +26,7 @@ class Settings(BaseSettings):
     api_v1_prefix: str = "/api/v1"
     allowed_hosts: list[str] = ["*"]
     app_port: int = 8000
+    metrics_enabled: bool = True  # Prometheus /metrics endpoint
 
     # MongoDB
     mongodb_url: str = "mongodb://localhost:27017"
@@ -33,6 +34,28 @@ class Settings(BaseSettings):
     mongodb_min_pool_size: int = 10
     mongodb_max_pool_size: int = 100
 
+    # Render jobs
+    render_max_workers: int = 2  # Renders running concurrently
+    render_max_queued_jobs: int = 8  # Jobs waiting for a worker before returning 429
+    render_retry_after_seconds: int = 10  # Retry-After hint before any job has finished
+    render_progress_interval_seconds: float = 0.5  # Progress event stream polling interval
+    render_job_flush_interval_seconds: float = 1.0  # Batched job state writes to MongoDB
+    render_job_history_size: int = 1000  # Finished jobs kept in memory for polling
+    render_job_lease_seconds: float = 60.0  # Unfinished jobs not renewed for longer are failed
+    render_instance_id: str = ""  # Stable ID of this instance, unique per process (empty = random)
+    render_stage_timings: bool = True  # Per-stage wall/CPU timings in results and logs
+    render_source_lookahead: int = 2  # Images decoded in the background ahead of rendering
+    render_pipeline_depth: int = 4  # Frames queued between rendering and encoding (0 = no encode thread)
+    render_frame_threads: int = 0  # Threads rendering effect frames per job, out of its CPU share (0 = half of it)
+
+    # Rendering caches
+    image_cache_max_bytes: int = 512 * 1024 * 1024  # 0 disables the decoded image cache
+    cache_dir: str = "/tmp/img-to-video-cache"  # Root of the on-disk render caches
+    output_cache_max_bytes: int = 2 * 1024 * 1024 * 1024  # 0 disables the finished video cache
+    output_cache_max_age_seconds: int = 7 * 24 * 3600  # Evict videos unused for longer (0 = never)
+    segment_cache_max_bytes: int = 4 * 1024 * 1024 * 1024  # 0 disables the encoded segment cache
+    segment_cache_max_age_seconds: int = 7 * 24 * 3600  # Evict segments unused for longer (0 = never)
+
     # Logging
     log_level: str = "INFO"
     log_format: str = "text"  # json or text
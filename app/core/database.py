@@ -12,6 +12,7 @@ logger = get_logger(__name__)
 
 # MongoDB client (will be initialized in lifespan)
 mongo_client: AsyncIOMotorClient | None = None
+db_client: AsyncIOMotorClient | None = None
 
 async def connect_to_mongo():
     global db_client, db   
@@ -32,6 +33,10 @@ async def connect_to_mongo():
         
     except Exception as e:
         print(f"❌ Error connecting to MongoDB: {e}")
+        # Leave the database unavailable rather than half-initialized
+        if db_client is not None:
+            db_client.close()
+        db_client = None
         raise
     
 async def close_mongo_connection():
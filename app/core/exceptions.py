@@ -24,10 +24,12 @@ class AppException(Exception):
         message: str,
         status_code: int = status.HTTP_500_INTERNAL_SERVER_ERROR,
         details: Dict[str, Any] | None = None,
+        headers: Dict[str, str] | None = None,
     ) -> None:
         self.message = message
         self.status_code = status_code
         self.details = details
+        self.headers = headers
         super().__init__(self.message)
 
 
@@ -52,6 +54,30 @@ class UnauthorizedException(AppException):
         super().__init__(message=message, status_code=status.HTTP_401_UNAUTHORIZED, details=details)
 
 
+class ConflictException(AppException):
+    """Conflict with the current state of the resource."""
+
+    def __init__(self, message: str = "Conflict", details: Dict[str, Any] | None = None) -> None:
+        super().__init__(message=message, status_code=status.HTTP_409_CONFLICT, details=details)
+
+
+class TooManyRequestsException(AppException):
+    """Server saturated, the client should retry later."""
+
+    def __init__(
+        self,
+        message: str = "Too many requests",
+        retry_after: int = 1,
+        details: Dict[str, Any] | None = None,
+    ) -> None:
+        super().__init__(
+            message=message,
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            details=details,
+            headers={"Retry-After": str(retry_after)},
+        )
+
+
 def setup_exception_handlers(app: FastAPI) -> None:
     """Register custom exception handlers.
 
@@ -69,6 +95,7 @@ def setup_exception_handlers(app: FastAPI) -> None:
                 message=exc.message,
                 details=exc.details,
             ).model_dump(),
+            headers=exc.headers,
         )
 
     @app.exception_handler(RequestValidationError)
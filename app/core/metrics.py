@@ -0,0 +1,192 @@
+"""Prometheus metrics of the rendering service.
+
+Render outcomes and rendered frames are recorded as they happen. Queue
+depth, worker usage and cache hit counters are read from the live objects
+at scrape time by ``RenderStateCollector``, so they cost nothing between
+scrapes; the application registers it on startup when metrics are enabled
+(importing this module has no side effect). Process metrics (RSS, CPU, open
+files) come from the default ``ProcessCollector`` of prometheus_client.
+"""
+
+from typing import Iterable, Iterator, Optional, Tuple
+
+from prometheus_client import REGISTRY, CONTENT_TYPE_LATEST, Counter, Histogram, generate_latest
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
+from prometheus_client.registry import Collector
+
+# Upper bounds of the image count label, e.g. 35 images -> '11-50'
+IMAGE_COUNT_BUCKETS = (10, 50, 200, 1000)
+
+# Standard video heights of the resolution label, applied to the short side
+RESOLUTION_CLASSES = (360, 480, 720, 1080, 1440, 2160)
+
+RENDER_DURATION_SECONDS = Histogram(
+    'video_render_duration_seconds',
+    'Wall time of renders that produced a new video (output cache misses)',
+    ['encoder', 'images', 'resolution'],
+    buckets=(1, 2.5, 5, 10, 20, 30, 60, 120, 300, 600, 1200, 1800)
+)
+RENDER_QUEUE_WAIT_SECONDS = Histogram(
+    'video_render_queue_wait_seconds',
+    'Time render jobs waited for a worker',
+    buckets=(0.01, 0.1, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)
+)
+RENDER_JOBS = Counter(
+    'video_render_jobs',
+    'Finished render jobs by outcome (rendered, cached or failed)',
+    ['outcome']
+)
+RENDERED_FRAMES = Counter(
+    'video_rendered_frames',
+    'Frames rendered, by segment kind and effect or transition name',
+    ['kind', 'name']
+)
+
+
+def image_count_label(num_images: int) -> str:
+    """Bucketed image count, to keep the label set small.
+
+    Args:
+        num_images: Number of images of the render
+
+    Returns:
+        Range label such as '1-10', '11-50' or '1001+'
+    """
+    low = 1
+    for high in IMAGE_COUNT_BUCKETS:
+        if num_images <= high:
+            return f"{low}-{high}"
+        low = high + 1
+    return f"{low}+"
+
+
+def resolution_label(resolution: Tuple[int, int]) -> str:
+    """Resolution class of a render, to keep the label set small.
+
+    Args:
+        resolution: Output resolution (width, height)
+
+    Returns:
+        Smallest standard class holding the short side, e.g. '720p'
+    """
+    short_side = min(resolution)
+    for height in RESOLUTION_CLASSES:
+        if short_side <= height:
+            return f"{height}p"
+    return f"{RESOLUTION_CLASSES[-1]}p+"
+
+
+def observe_render(seconds: float,
+                   num_images: int,
+                   resolution: Tuple[int, int],
+                   encoder: str,
+                   from_cache: bool) -> None:
+    """Record a successful render.
+
+    Args:
+        seconds: Wall time of the render
+        num_images: Number of images of the request
+        resolution: Output resolution (width, height)
+        encoder: Encoder backend
+        from_cache: Whether the video was served by the output cache
+    """
+    if from_cache:
+        RENDER_JOBS.labels(outcome='cached').inc()
+        return
+    RENDER_JOBS.labels(outcome='rendered').inc()
+    RENDER_DURATION_SECONDS.labels(
+        encoder=encoder,
+        images=image_count_label(num_images),
+        resolution=resolution_label(resolution)
+    ).observe(seconds)
+
+
+def observe_failed_render() -> None:
+    """Record a render that raised."""
+    RENDER_JOBS.labels(outcome='failed').inc()
+
+
+def observe_rendered_frames(segments: Iterable) -> None:
+    """Count the frames of rendered timeline segments.
+
+    Args:
+        segments: TimelineSegment objects that were rendered (not reused
+            from a cache)
+    """
+    for segment in segments:
+        RENDERED_FRAMES.labels(kind=segment.kind, name=segment.name).inc(segment.frame_count)
+
+
+class RenderStateCollector(Collector):
+    """Queue, worker and cache metrics read from the live objects on scrape."""
+
+    def describe(self) -> Iterable:
+        # Registration must not call collect(): the render job manager and
+        # caches are created lazily, on the first scrape
+        return []
+
+    def collect(self) -> Iterator:
+        # Imported here: the services import this module
+        from app.services.cache import get_image_cache, get_output_cache, get_segment_cache
+        from app.services.render_jobs import get_render_job_manager
+
+        queue = get_render_job_manager().queue_stats()
+        yield GaugeMetricFamily(
+            'video_render_queue_depth', 'Render jobs waiting for a worker', value=queue['queued']
+        )
+        yield GaugeMetricFamily(
+            'video_render_queue_capacity', 'Render jobs allowed to wait for a worker',
+            value=queue['max_queued']
+        )
+        yield GaugeMetricFamily(
+            'video_render_workers_active', 'Renders currently running', value=queue['running']
+        )
+        yield GaugeMetricFamily(
+            'video_render_workers_max', 'Renders allowed to run concurrently', value=queue['max_workers']
+        )
+
+        lookups = CounterMetricFamily(
+            'video_cache_lookups', 'Cache lookups by cache and result', labels=['cache', 'result']
+        )
+        hit_ratio = GaugeMetricFamily(
+            'video_cache_hit_ratio', 'Cache hits over lookups since start', labels=['cache']
+        )
+        for name, cache in (
+            ('image', get_image_cache()),
+            ('output', get_output_cache()),
+            ('segment', get_segment_cache()),
+        ):
+            stats = cache.stats()
+            lookups.add_metric([name, 'hit'], stats['hits'])
+            lookups.add_metric([name, 'miss'], stats['misses'])
+            hit_ratio.add_metric([name], stats['hit_ratio'])
+        yield lookups
+        yield hit_ratio
+
+
+_state_collector: Optional[RenderStateCollector] = None
+
+
+def register_state_collector() -> None:
+    """Expose the queue, worker and cache metrics (idempotent)."""
+    global _state_collector
+    if _state_collector is None:
+        _state_collector = RenderStateCollector()
+        REGISTRY.register(_state_collector)
+
+
+def unregister_state_collector() -> None:
+    """Stop exposing the queue, worker and cache metrics (idempotent)."""
+    global _state_collector
+    if _state_collector is not None:
+        REGISTRY.unregister(_state_collector)
+        _state_collector = None
+
+
+def render_latest() -> Tuple[bytes, str]:
+    """Current metrics in the Prometheus text exposition format.
+
+    Returns:
+        Tuple of (payload, content type)
+    """
+    return generate_latest(REGISTRY), CONTENT_TYPE_LATEST
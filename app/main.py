@@ -4,14 +4,17 @@ import logging
 from contextlib import asynccontextmanager
 from typing import AsyncIterator
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
 from motor.motor_asyncio import AsyncIOMotorClient
 
 from app.core.config import settings
-from app.core import database
+from app.core import database, metrics
 from app.core.exceptions import setup_exception_handlers
 from app.core.logging import get_logger, setup_logging
+from app.repositories.render_job_repository import RenderJobRepository
+from app.services.render_job_persister import RenderJobPersister
+from app.services.render_jobs import get_render_job_manager
 
 # Setup logging
 setup_logging()
@@ -21,9 +24,25 @@ logger = get_logger(__name__)
 @asynccontextmanager
 async def lifespan(app: FastAPI) -> AsyncIterator[None]:
     # Startup
+    if settings.metrics_enabled:
+        metrics.register_state_collector()
+    persister: RenderJobPersister | None = None
     try:
         await database.connect_to_mongo()
         print("✅ Connected to MongoDB Atlas")
+
+        # Persist render jobs so their state survives restarts
+        repository = RenderJobRepository(database.get_database())
+        await repository.ensure_indexes()
+        manager = get_render_job_manager()
+        await repository.mark_interrupted(settings.render_job_lease_seconds, owner=manager.instance_id)
+        persister = RenderJobPersister(
+            manager,
+            repository,
+            interval=settings.render_job_flush_interval_seconds,
+            lease_seconds=settings.render_job_lease_seconds,
+        )
+        persister.start()
     except Exception as e:
         print(f"⚠️  MongoDB connection failed (optional): {e}")
         print("✓ Application will run without MongoDB")
@@ -32,6 +51,13 @@ async def lifespan(app: FastAPI) -> AsyncIterator[None]:
 
     # Shutdown
     logger.info("Shutting down application")
+    get_render_job_manager().shutdown()
+    metrics.unregister_state_collector()
+    if persister is not None:
+        try:
+            await persister.stop()
+        except Exception as e:
+            logger.error(f"Failed to persist render jobs on shutdown: {e}")
     try:
         await database.close_mongo_connection()
         print("❌ Disconnected from MongoDB Atlas")
@@ -78,6 +104,17 @@ def create_app() -> FastAPI:
             "environment": settings.environment,
         }
 
+    if settings.metrics_enabled:
+        @app.get("/metrics", tags=["Health"], include_in_schema=False)
+        def metrics_endpoint() -> Response:
+            """Prometheus scrape endpoint.
+
+            Returns:
+                Response: Metrics in the Prometheus text format
+            """
+            payload, content_type = metrics.render_latest()
+            return Response(content=payload, media_type=content_type)
+
     # Include routers
     from app.routes import video_routes
     app.include_router(video_routes.router, prefix=settings.api_v1_prefix)
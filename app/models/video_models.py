@@ -1,7 +1,11 @@
 """Pydantic models for video generation."""
 
+from datetime import datetime
 from pydantic import BaseModel, Field, field_validator
-from typing import List, Optional
+from typing import List, Literal, Optional
+
+RenderJobState = Literal["queued", "running", "succeeded", "failed"]
+PreviewImageFormat = Literal["jpeg", "png"]
 
 
 class ImageTimestamp(BaseModel):
@@ -19,6 +23,11 @@ class ImageTimestamp(BaseModel):
         le=2.0,
         description="Intensity of the effect (0.0 to 2.0, default: 1.0)"
     )
+    effect_subpixel: bool = Field(
+        default=False,
+        description="Move pan effects by fractions of a pixel (smoother slow pans, "
+                    "slightly slower to render); ignored by other effects"
+    )
     transition_type: Optional[str] = Field(
         default=None,
         description="Transition type to use after this image (overrides global transition_type if set)"
@@ -58,6 +67,23 @@ class VideoRequest(BaseModel):
         default=(1280, 720),
         description="Output video resolution (width, height)"
     )
+    # Same choices as ENCODER_BACKENDS and ENCODER_PROFILES (see tests/test_encoder_profiles.py)
+    encoder: Literal["moviepy", "ffmpeg_pipe", "ffmpeg_parallel"] = Field(
+        default="moviepy",
+        description=(
+            "Encoder backend: 'moviepy' (single timeline clip written by moviepy), 'ffmpeg_pipe' (raw frames piped to ffmpeg) "
+            "or 'ffmpeg_parallel' (segments encoded in parallel, then stream-copy concatenated)"
+        )
+    )
+    
+    encoder_profile: Literal["draft", "standard", "archival", "still_heavy"] = Field(
+        default="standard",
+        description=(
+            "x264 profile: 'draft' (ultrafast, for previews; the video is rendered and written at half the requested "
+            "resolution, reported as 'resolution' in the result details), 'standard' (medium, CRF 23), "
+            "'archival' (slow, CRF 18) or 'still_heavy' (fast, CRF 23, 10 s GOP, for mostly static slideshows)"
+        )
+    )
     
     @field_validator('images')
     @classmethod
@@ -67,6 +93,39 @@ class VideoRequest(BaseModel):
         return sorted_images
 
 
+class PreviewFrameRequest(BaseModel):
+    """Request model for a single preview frame of a timeline."""
+    
+    images: List[ImageTimestamp] = Field(
+        ...,
+        min_length=2,
+        description="List of images with timestamps (minimum 2 images)"
+    )
+    time: float = Field(..., ge=0, description="Time in the video, in seconds")
+    transition_type: str = Field(
+        default="cross_dissolve",
+        description="Type of transition to use between images"
+    )
+    fps: int = Field(
+        default=30,
+        ge=15,
+        le=60,
+        description="Frames per second of the video (the frame at floor(time * fps) is rendered)"
+    )
+    resolution: tuple[int, int] = Field(
+        default=(1280, 720),
+        description="Frame resolution (width, height)"
+    )
+    format: PreviewImageFormat = Field(default="jpeg", description="Image format of the frame")
+    quality: int = Field(default=85, ge=1, le=100, description="JPEG quality (ignored for PNG)")
+    
+    @field_validator('images')
+    @classmethod
+    def validate_images_order(cls, v: List[ImageTimestamp]) -> List[ImageTimestamp]:
+        """Ensure images are sorted by timestamp."""
+        return sorted(v, key=lambda x: x.timestamp)
+
+
 class VideoResponse(BaseModel):
     """Response model for video generation."""
     
@@ -75,3 +134,66 @@ class VideoResponse(BaseModel):
     duration: float = Field(description="Duration of the generated video in seconds")
     message: str
     details: dict | None = None
+
+
+class RenderJobSubmitResponse(BaseModel):
+    """Response model for an accepted render job."""
+    
+    job_id: str
+    state: RenderJobState
+    queue_position: int = Field(
+        default=0,
+        description="Place in the wait queue at submission (0 = started right away, 1 = next to start)"
+    )
+    status_url: str = Field(description="URL to poll for the job status")
+
+
+class RenderJobStatus(BaseModel):
+    """Status of a render job."""
+    
+    job_id: str
+    state: RenderJobState
+    progress: float = Field(description="Fraction of frames encoded (0.0 to 1.0)")
+    frames_done: int
+    total_frames: int | None = None
+    segment_index: int | None = Field(default=None, description="Index of the segment being rendered")
+    segment_count: int | None = None
+    segment_kind: Literal["effect", "transition"] | None = None
+    segment_name: str | None = Field(default=None, description="Effect or transition type of the current segment")
+    fps: float | None = Field(default=None, description="Current render speed in frames per second")
+    eta_seconds: float | None = Field(default=None, description="Estimated time left for encoding")
+    created_at: datetime
+    started_at: datetime | None = None
+    finished_at: datetime | None = None
+    error: str | None = None
+    result: VideoResponse | None = Field(
+        default=None,
+        description="Generation result, once the job has succeeded"
+    )
+
+
+class RenderJobList(BaseModel):
+    """Page of render jobs, newest first."""
+    
+    jobs: List[RenderJobStatus]
+    next_before: datetime | None = Field(
+        default=None,
+        description="Value of 'before' for the next page (None on the last page)"
+    )
+    next_before_id: str | None = Field(
+        default=None,
+        description="Value of 'before_id' for the next page (None on the last page)"
+    )
+
+
+class RenderQueueStatus(BaseModel):
+    """Render slots usage and wait queue depth."""
+    
+    running: int = Field(description="Renders currently running")
+    queued: int = Field(description="Jobs waiting for a render slot")
+    max_workers: int = Field(description="Render slots")
+    max_queued: int = Field(description="Wait queue capacity (beyond it, requests get 429)")
+    average_job_seconds: float | None = Field(
+        default=None,
+        description="Moving average of recent render durations"
+    )
@@ -0,0 +1,185 @@
+"""MongoDB persistence of render jobs."""
+
+from datetime import datetime, timedelta
+from typing import List, Optional
+
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import ASCENDING, DESCENDING, UpdateOne
+
+from app.core import database
+from app.core.logging import get_logger
+from app.helpers.datetime_utils import now_utc
+
+logger = get_logger(__name__)
+
+# Fields left out of job listings (the request may hold thousands of images)
+LIST_PROJECTION = {"request": 0}
+
+# States of the jobs an instance still holds (and renews the lease of)
+UNFINISHED_STATES = ["queued", "running"]
+
+
+class RenderJobRepository:
+    """Store render job documents (spec, state, progress, timings, result).
+
+    Documents use the job ID as ``_id`` and are written by save_many(), in
+    a single bulk write per flush: the request is stored once, when the job
+    is inserted, and later writes only set the state and progress fields.
+    Unfinished jobs carry
+    the ``owner`` instance and a ``heartbeat_at`` lease that the owner
+    renews (see heartbeat); jobs whose lease has lapsed belong to an
+    instance that is gone.
+    """
+
+    collection_name = "render_jobs"
+
+    def __init__(self, db: AsyncIOMotorDatabase):
+        """Initialize the repository.
+
+        Args:
+            db: Motor database
+        """
+        self.collection = db[self.collection_name]
+
+    async def ensure_indexes(self) -> None:
+        """Create the indexes used by lookups and listings."""
+        await self.collection.create_index([("created_at", DESCENDING), ("_id", DESCENDING)])
+        await self.collection.create_index(
+            [("state", ASCENDING), ("created_at", DESCENDING), ("_id", DESCENDING)]
+        )
+        await self.collection.create_index([("owner", ASCENDING), ("state", ASCENDING)])
+        await self.collection.create_index([("state", ASCENDING), ("heartbeat_at", ASCENDING)])
+
+    async def save_many(self, documents: List[dict]) -> None:
+        """Insert or update job documents in one bulk write.
+
+        Every field but ``_id`` and ``request`` is set. The request is only
+        written when the write inserts the job, so an existing job's
+        request is never rewritten (and may be left out of its document).
+
+        Args:
+            documents: Job documents (see RenderJob.to_document)
+        """
+        if not documents:
+            return
+        operations = []
+        for document in documents:
+            fields = {key: value for key, value in document.items() if key not in ("_id", "request")}
+            update = {"$set": fields}
+            if "request" in document:
+                update["$setOnInsert"] = {"request": document["request"]}
+            operations.append(UpdateOne({"_id": document["_id"]}, update, upsert=True))
+        await self.collection.bulk_write(operations, ordered=False)
+
+    async def get(self, job_id: str) -> Optional[dict]:
+        """Find a job document.
+
+        Args:
+            job_id: Job identifier
+
+        Returns:
+            The document, or None if unknown
+        """
+        return await self.collection.find_one({"_id": job_id})
+
+    async def list(self,
+                   state: Optional[str] = None,
+                   limit: int = 50,
+                   before: Optional[datetime] = None,
+                   before_id: Optional[str] = None) -> List[dict]:
+        """List jobs, newest first (without their request).
+
+        Pages are selected on ``(created_at, _id)`` rather than skipped over,
+        so the cost does not grow with the size of the history, and jobs
+        created in the same millisecond are neither repeated nor skipped
+        across pages.
+
+        Args:
+            state: Optional state filter
+            limit: Maximum number of jobs returned
+            before: Only return jobs created before this date
+            before_id: Job ID of the previous page's last job: jobs created
+                at exactly ``before`` are returned when their ID sorts lower
+
+        Returns:
+            Job documents
+        """
+        query: dict = {}
+        if state is not None:
+            query["state"] = state
+        if before is not None and before_id is not None:
+            query["$or"] = [
+                {"created_at": {"$lt": before}},
+                {"created_at": before, "_id": {"$lt": before_id}},
+            ]
+        elif before is not None:
+            query["created_at"] = {"$lt": before}
+
+        cursor = (
+            self.collection.find(query, LIST_PROJECTION)
+            .sort([("created_at", DESCENDING), ("_id", DESCENDING)])
+            .limit(limit)
+        )
+        return await cursor.to_list(length=limit)
+
+    async def heartbeat(self, owner: str) -> int:
+        """Renew the lease of the unfinished jobs of an instance.
+
+        Args:
+            owner: Instance ID (see RenderJobManager.instance_id)
+
+        Returns:
+            Number of jobs renewed
+        """
+        result = await self.collection.update_many(
+            {"owner": owner, "state": {"$in": UNFINISHED_STATES}},
+            {"$set": {"heartbeat_at": now_utc()}}
+        )
+        return result.modified_count
+
+    async def mark_interrupted(self, lease_seconds: float, owner: Optional[str] = None) -> int:
+        """Fail the unfinished jobs whose instance is gone.
+
+        A job is stale once its lease has not been renewed for
+        ``lease_seconds`` (documents written before leases existed count as
+        stale). Jobs of other live instances are left alone.
+
+        Args:
+            lease_seconds: Lease duration, longer than the heartbeat interval
+            owner: ID of the calling instance: its unfinished jobs are
+                failed right away (they were left by its previous run)
+
+        Returns:
+            Number of jobs marked as failed
+        """
+        now = now_utc()
+        stale: List[dict] = [
+            {"heartbeat_at": {"$not": {"$gte": now - timedelta(seconds=lease_seconds)}}}
+        ]
+        if owner is not None:
+            stale.append({"owner": owner})
+        result = await self.collection.update_many(
+            {"state": {"$in": UNFINISHED_STATES}, "$or": stale},
+            {"$set": {
+                "state": "failed",
+                "error": "Interrupted by a service restart",
+                "eta_seconds": None,
+                "finished_at": now,
+                "updated_at": now,
+            }}
+        )
+        if result.modified_count:
+            logger.warning(f"Marked {result.modified_count} interrupted render jobs as failed")
+        return result.modified_count
+
+
+def get_render_job_repository() -> Optional[RenderJobRepository]:
+    """Get the render job repository when MongoDB is connected.
+
+    Returns:
+        RenderJobRepository, or None if the application runs without MongoDB
+    """
+    try:
+        return RenderJobRepository(database.get_database())
+    except RuntimeError:
+        return None
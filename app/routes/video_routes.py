@@ -1,19 +1,174 @@
 """API routes for video generation."""
 
-from fastapi import APIRouter, HTTPException, status
-from app.models.video_models import VideoRequest, VideoResponse
+import asyncio
+import time
+from datetime import datetime
+from typing import AsyncIterator, List, Optional
+
+import cv2
+import numpy as np
+from fastapi import APIRouter, HTTPException, Query, Request, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import Response, StreamingResponse
+from app.core.config import settings
+from app.core.exceptions import ConflictException, NotFoundException, TooManyRequestsException
+from app.helpers.datetime_utils import to_utc
+from app.models.video_models import (
+    ImageTimestamp,
+    PreviewFrameRequest,
+    PreviewImageFormat,
+    RenderJobList,
+    RenderJobState,
+    RenderJobStatus,
+    RenderQueueStatus,
+    RenderJobSubmitResponse,
+    VideoRequest,
+    VideoResponse,
+)
+from app.repositories.render_job_repository import get_render_job_repository
+from app.services.render_jobs import RenderJob, RenderQueueFullError, get_render_job_manager
 from app.services.video_generator_service import VideoGeneratorService
 from app.core.logging import get_logger
 
 logger = get_logger(__name__)
 
+# Idle time after which the event stream sends a keep-alive comment, in seconds
+EVENT_STREAM_KEEPALIVE = 15.0
+
 router = APIRouter(prefix="/videos", tags=["Videos"])
 
 
+def _to_video_response(result: dict) -> VideoResponse:
+    """Build the API response from a generation result.
+    
+    Args:
+        result: Dictionary returned by VideoGeneratorService.generate_video
+        
+    Returns:
+        VideoResponse with generation details
+    """
+    return VideoResponse(
+        success=True,
+        output_path=result['output_path'],
+        duration=result['duration'],
+        message="Video generated successfully",
+        details={
+            "num_images": result['num_images'],
+            "transition_type": result['transition_type'],
+            "resolution": result['resolution'],
+            "requested_resolution": result.get('requested_resolution'),
+            "fps": result['fps'],
+            "encoder": result['encoder'],
+            "encoder_profile": result['encoder_profile'],
+            "image_cache": result['image_cache'],
+            "segment_cache": result['segment_cache'],
+            "timings": result.get('timings'),
+            "from_cache": result['from_cache']
+        }
+    )
+
+
+def _to_job_status(document: dict) -> RenderJobStatus:
+    """Build the API status of a render job.
+    
+    Args:
+        document: Job document (see RenderJob.to_document), from memory or MongoDB
+        
+    Returns:
+        RenderJobStatus, including the result once the job has succeeded
+    """
+    result = document.get("result")
+    return RenderJobStatus(
+        job_id=document["_id"],
+        state=document["state"],
+        progress=document["progress"],
+        frames_done=document["frames_done"],
+        total_frames=document.get("total_frames"),
+        segment_index=document.get("segment_index"),
+        segment_count=document.get("segment_count"),
+        segment_kind=document.get("segment_kind"),
+        segment_name=document.get("segment_name"),
+        fps=document.get("fps"),
+        eta_seconds=document.get("eta_seconds"),
+        created_at=to_utc(document["created_at"]),
+        started_at=to_utc(document["started_at"]) if document.get("started_at") else None,
+        finished_at=to_utc(document["finished_at"]) if document.get("finished_at") else None,
+        error=document.get("error"),
+        result=_to_video_response(result) if document["state"] == "succeeded" and result else None
+    )
+
+
+async def _find_job_document(job_id: str) -> Optional[dict]:
+    """Look up a render job, in memory first, then in MongoDB.
+    
+    Jobs evicted from the in-memory history, or run before a restart, are
+    only found in the database.
+    
+    Args:
+        job_id: Job identifier
+        
+    Returns:
+        Job document, or None if unknown
+    """
+    job = get_render_job_manager().get(job_id)
+    if job is not None:
+        return job.to_document(include_request=False)
+    
+    repository = get_render_job_repository()
+    if repository is None:
+        return None
+    return await repository.get(job_id)
+
+
+async def _get_job_document(job_id: str) -> dict:
+    """Look up a render job that must exist.
+    
+    Args:
+        job_id: Job identifier
+        
+    Returns:
+        Job document
+        
+    Raises:
+        NotFoundException: If the job is unknown
+    """
+    document = await _find_job_document(job_id)
+    if document is None:
+        raise NotFoundException(f"Render job not found: {job_id}")
+    return document
+
+
+def _submit_job(request: VideoRequest) -> RenderJob:
+    """Queue a render job, shedding load when the render queue is full.
+    
+    Args:
+        request: Video generation request
+        
+    Returns:
+        The queued render job
+        
+    Raises:
+        TooManyRequestsException: If every slot is busy and the queue is full
+    """
+    try:
+        return get_render_job_manager().submit(request)
+    except RenderQueueFullError as e:
+        logger.warning(str(e))
+        raise TooManyRequestsException(
+            "Render queue is full, retry later",
+            retry_after=e.retry_after,
+            details=e.queue
+        )
+
+
 @router.post("/generate", response_model=VideoResponse, status_code=status.HTTP_201_CREATED)
 async def generate_video(request: VideoRequest) -> VideoResponse:
     """Generate a video from images with transitions.
     
+    The render runs in the render worker pool; this request waits for it
+    without blocking the event loop. Use POST /videos/jobs to get a job ID
+    back immediately instead.
+    
     Args:
         request: Video generation request with images and settings
         
@@ -21,39 +176,20 @@ async def generate_video(request: VideoRequest) -> VideoResponse:
         VideoResponse with generation details
         
     Raises:
+        TooManyRequestsException: If the render queue is full
         HTTPException: If video generation fails
     """
     logger.info(f"Received video generation request: {len(request.images)} images")
+    job = _submit_job(request)
     
     try:
-        # Create video generator service
-        service = VideoGeneratorService(
-            fps=request.fps,
-            resolution=request.resolution,
-            transition_duration=0.5  # Default transition duration
-        )
-        
-        # Generate video
-        result = service.generate_video(
-            images=request.images,
-            output_path=request.output_path,
-            transition_type=request.transition_type
-        )
+        if job.future is None:
+            raise RuntimeError(f"Render job {job.job_id} was not scheduled")
+        result = await asyncio.wrap_future(job.future)
         
         logger.info(f"Video generated successfully: {result['output_path']}")
         
-        return VideoResponse(
-            success=True,
-            output_path=result['output_path'],
-            duration=result['duration'],
-            message="Video generated successfully",
-            details={
-                "num_images": result['num_images'],
-                "transition_type": result['transition_type'],
-                "resolution": result['resolution'],
-                "fps": result['fps']
-            }
-        )
+        return _to_video_response(result)
         
     except ValueError as e:
         logger.error(f"Validation error: {str(e)}")
@@ -75,6 +211,313 @@ async def generate_video(request: VideoRequest) -> VideoResponse:
         )
 
 
+@router.post("/jobs", response_model=RenderJobSubmitResponse, status_code=status.HTTP_202_ACCEPTED)
+async def submit_render_job(request: VideoRequest, http_request: Request) -> RenderJobSubmitResponse:
+    """Queue a video generation job and return its ID immediately.
+    
+    Args:
+        request: Video generation request with images and settings
+        http_request: Incoming HTTP request (used to build the status URL)
+        
+    Returns:
+        RenderJobSubmitResponse with the job ID, queue position and status URL
+        
+    Raises:
+        TooManyRequestsException: If the render queue is full
+    """
+    job = _submit_job(request)
+    
+    return RenderJobSubmitResponse(
+        job_id=job.job_id,
+        state=job.state,
+        queue_position=job.queue_position,
+        status_url=str(http_request.url_for("get_render_job", job_id=job.job_id))
+    )
+
+
+@router.get("/queue", response_model=RenderQueueStatus)
+async def get_render_queue() -> RenderQueueStatus:
+    """Get the render slots usage and wait queue depth.
+    
+    Returns:
+        RenderQueueStatus with running/queued counts and their limits
+    """
+    return RenderQueueStatus(**get_render_job_manager().queue_stats())
+
+
+@router.get("/jobs", response_model=RenderJobList)
+async def list_render_jobs(
+    state: Optional[RenderJobState] = None,
+    limit: int = Query(default=50, ge=1, le=500),
+    before: Optional[datetime] = Query(default=None, description="Only jobs created before this date (paging cursor)"),
+    before_id: Optional[str] = Query(default=None, description="ID of the previous page's last job (paging cursor)")
+) -> RenderJobList:
+    """List render jobs, newest first.
+    
+    Served from MongoDB when connected (full history), otherwise from the
+    in-memory history. Page with the returned ``next_before`` and
+    ``next_before_id`` cursor: jobs are ordered by creation date, then ID.
+    
+    Args:
+        state: Optional state filter
+        limit: Maximum number of jobs returned
+        before: Only return jobs created before this date
+        before_id: With ``before``, also return the jobs created at exactly
+            that date whose ID sorts before this one
+        
+    Returns:
+        RenderJobList with the jobs and the cursor of the next page
+    """
+    if before is not None:
+        before = to_utc(before)
+    
+    repository = get_render_job_repository()
+    if repository is not None:
+        documents = await repository.list(state=state, limit=limit, before=before, before_id=before_id)
+    else:
+        documents = [
+            job.to_document(include_request=False)
+            for job in get_render_job_manager().list(
+                state=state, limit=limit, before=before, before_id=before_id
+            )
+        ]
+    
+    jobs = [_to_job_status(document) for document in documents]
+    last_page = len(jobs) < limit
+    return RenderJobList(
+        jobs=jobs,
+        next_before=None if last_page else jobs[-1].created_at,
+        next_before_id=None if last_page else jobs[-1].job_id
+    )
+
+
+@router.get("/jobs/{job_id}", response_model=RenderJobStatus)
+async def get_render_job(job_id: str) -> RenderJobStatus:
+    """Get the state and progress of a render job.
+    
+    Args:
+        job_id: Job identifier
+        
+    Returns:
+        RenderJobStatus, including the result once the job has succeeded
+        
+    Raises:
+        NotFoundException: If the job is unknown
+    """
+    return _to_job_status(await _get_job_document(job_id))
+
+
+async def _job_events(job_id: str, http_request: Request) -> AsyncIterator[str]:
+    """Server-Sent Events stream of a render job's status.
+    
+    The job is polled every settings.render_progress_interval_seconds; a
+    'progress' event is sent whenever the status changed, and a final 'done'
+    event (including the result) once the job has finished.
+    
+    Args:
+        job_id: Job identifier
+        http_request: Incoming HTTP request (to detect client disconnects)
+        
+    Yields:
+        Encoded SSE messages
+    """
+    last_payload = None
+    last_sent = time.monotonic()
+    
+    while not await http_request.is_disconnected():
+        document = await _find_job_document(job_id)
+        if document is None:
+            return
+        
+        job_status = _to_job_status(document)
+        if job_status.state in ("succeeded", "failed"):
+            yield f"event: done\ndata: {job_status.model_dump_json()}\n\n"
+            return
+        
+        payload = job_status.model_dump_json(exclude={"result"})
+        if payload != last_payload:
+            yield f"event: progress\ndata: {payload}\n\n"
+            last_payload = payload
+            last_sent = time.monotonic()
+        elif time.monotonic() - last_sent >= EVENT_STREAM_KEEPALIVE:
+            yield ": keep-alive\n\n"
+            last_sent = time.monotonic()
+        
+        await asyncio.sleep(settings.render_progress_interval_seconds)
+
+
+@router.get("/jobs/{job_id}/events")
+async def stream_render_job_events(job_id: str, http_request: Request) -> StreamingResponse:
+    """Stream the progress of a render job as Server-Sent Events.
+    
+    Events carry the job status: frames rendered out of total, current
+    segment (index, kind, effect or transition name), render fps and ETA.
+    
+    Args:
+        job_id: Job identifier
+        http_request: Incoming HTTP request
+        
+    Returns:
+        text/event-stream response
+        
+    Raises:
+        NotFoundException: If the job is unknown
+    """
+    await _get_job_document(job_id)
+    return StreamingResponse(
+        _job_events(job_id, http_request),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@router.get("/jobs/{job_id}/result", response_model=VideoResponse)
+async def get_render_job_result(job_id: str) -> VideoResponse:
+    """Get the result of a succeeded render job.
+    
+    Args:
+        job_id: Job identifier
+        
+    Returns:
+        VideoResponse with generation details
+        
+    Raises:
+        NotFoundException: If the job is unknown
+        ConflictException: If the job has not succeeded
+    """
+    document = await _get_job_document(job_id)
+    if document["state"] != "succeeded" or not document.get("result"):
+        raise ConflictException(
+            f"Render job {job_id} has no result",
+            details={"state": document["state"], "error": document.get("error")}
+        )
+    return _to_video_response(document["result"])
+
+
+def _render_preview_frame(service: VideoGeneratorService,
+                          images: List[ImageTimestamp],
+                          time: float,
+                          transition_type: str,
+                          image_format: PreviewImageFormat,
+                          quality: int) -> Response:
+    """Render one frame of a timeline and encode it as an image response.
+    
+    Args:
+        service: Video generator configured with the fps and resolution of the video
+        images: Images of the timeline, sorted by timestamp
+        time: Time in the video, in seconds
+        transition_type: Default transition type
+        image_format: 'jpeg' or 'png'
+        quality: JPEG quality
+        
+    Returns:
+        Image response
+        
+    Raises:
+        HTTPException: 400 if the timeline or time is invalid
+    """
+    try:
+        frame = service.render_frame(images, time, transition_type)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    
+    bgr = cv2.cvtColor(np.ascontiguousarray(frame), cv2.COLOR_RGB2BGR)
+    if image_format == "png":
+        ok, encoded = cv2.imencode(".png", bgr)
+    else:
+        ok, encoded = cv2.imencode(".jpg", bgr, [cv2.IMWRITE_JPEG_QUALITY, quality])
+    if not ok:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to encode the preview frame"
+        )
+    return Response(
+        content=encoded.tobytes(),
+        media_type=f"image/{image_format}",
+        headers={"Cache-Control": "no-store"}
+    )
+
+
+@router.post("/preview-frame", response_class=Response)
+async def preview_frame(request: PreviewFrameRequest) -> Response:
+    """Render the frame shown at a given time of a timeline, without encoding a video.
+    
+    Only the effect or transition segment covering ``time`` is rendered,
+    from images kept in the decoded image cache, so scrubbing a timeline
+    stays interactive.
+    
+    Args:
+        request: Timeline, time and image format
+        
+    Returns:
+        JPEG or PNG image
+        
+    Raises:
+        HTTPException: 400 if the timeline or time is invalid
+    """
+    service = VideoGeneratorService(fps=request.fps, resolution=request.resolution)
+    return await run_in_threadpool(
+        _render_preview_frame,
+        service,
+        request.images,
+        request.time,
+        request.transition_type,
+        request.format,
+        request.quality
+    )
+
+
+@router.get("/preview-frame", response_class=Response)
+async def preview_job_frame(
+    job_id: str,
+    time: float = Query(..., ge=0, description="Time in the video, in seconds"),
+    format: PreviewImageFormat = "jpeg",
+    quality: int = Query(default=85, ge=1, le=100, description="JPEG quality (ignored for PNG)")
+) -> Response:
+    """Render the frame shown at a given time of a render job's video.
+    
+    The frame is rendered from the job's request (at the job's fps and
+    render resolution), whether or not the job has run yet.
+    
+    Args:
+        job_id: Render job identifier
+        time: Time in the video, in seconds
+        format: Image format of the frame
+        quality: JPEG quality
+        
+    Returns:
+        JPEG or PNG image
+        
+    Raises:
+        NotFoundException: If the job is unknown
+        HTTPException: 400 if the time is outside the video
+    """
+    job = get_render_job_manager().get(job_id)
+    if job is not None:
+        request = job.request
+    else:
+        repository = get_render_job_repository()
+        document = await repository.get(job_id) if repository is not None else None
+        if document is None or "request" not in document:
+            raise NotFoundException(f"Render job not found: {job_id}")
+        request = VideoRequest.model_validate(document["request"])
+    
+    service = VideoGeneratorService(
+        fps=request.fps,
+        resolution=request.resolution,
+        encoder_profile=request.encoder_profile
+    )
+    return await run_in_threadpool(
+        _render_preview_frame,
+        service,
+        request.images,
+        time,
+        request.transition_type,
+        format,
+        quality
+    )
+
+
 @router.get("/transitions", response_model=dict)
 async def list_transitions() -> dict:
     """List all available transition types.
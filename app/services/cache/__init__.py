@@ -0,0 +1,17 @@
+"""Caches shared across video generation requests."""
+
+from app.services.cache.content_hash import file_content_hash
+from app.services.cache.file_cache import FileCache
+from app.services.cache.image_cache import DecodedImageCache, get_image_cache
+from app.services.cache.output_cache import VideoOutputCache, get_output_cache
+from app.services.cache.segment_cache import get_segment_cache
+
+__all__ = [
+    'DecodedImageCache',
+    'FileCache',
+    'VideoOutputCache',
+    'file_content_hash',
+    'get_image_cache',
+    'get_output_cache',
+    'get_segment_cache',
+]
@@ -0,0 +1,43 @@
+"""Content hashes of input files, memoized by file identity."""
+
+import hashlib
+import os
+from functools import lru_cache
+
+# Read size used when hashing files
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+def file_content_hash(path: str) -> str:
+    """SHA-256 of a file's content.
+
+    Hashes are memoized by (absolute path, mtime, size): a file is only
+    read again after it changed.
+
+    Args:
+        path: File path
+
+    Returns:
+        Hex digest
+    """
+    stat = os.stat(path)
+    return _hash_file(os.path.abspath(path), stat.st_mtime_ns, stat.st_size)
+
+
+@lru_cache(maxsize=4096)
+def _hash_file(path: str, mtime_ns: int, size: int) -> str:
+    """Hash a file (memoized on its identity).
+
+    Args:
+        path: Absolute file path
+        mtime_ns: Modification time, part of the memoization key
+        size: File size, part of the memoization key
+
+    Returns:
+        Hex digest
+    """
+    digest = hashlib.sha256()
+    with open(path, 'rb') as file:
+        for chunk in iter(lambda: file.read(HASH_CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
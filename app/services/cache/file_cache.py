@@ -0,0 +1,202 @@
+"""Size- and age-bounded cache of files in a directory."""
+
+import os
+import shutil
+import tempfile
+import threading
+import time
+from typing import Dict, List, Tuple
+
+
+def place_file(source: str, destination: str) -> None:
+    """Hard-link a file to a new path, copying when linking is impossible.
+
+    The destination is replaced atomically if it exists.
+
+    Args:
+        source: Existing file
+        destination: Path to create or replace
+    """
+    directory = os.path.dirname(os.path.abspath(destination))
+    fd, temp_path = tempfile.mkstemp(prefix='.tmp_', dir=directory)
+    os.close(fd)
+    try:
+        os.remove(temp_path)
+        try:
+            os.link(source, temp_path)
+        except OSError:
+            # Other filesystem, or links not supported
+            shutil.copy2(source, temp_path)
+        os.replace(temp_path, destination)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+
+class FileCache:
+    """Files stored under a key in a directory, with LRU and age eviction.
+
+    An entry is every file named ``<key>.<ext>``. Files are placed in and
+    out of the cache by hard link (copy across filesystems), so a placed
+    file and its cache entry share their inode, mtime included. The cache is
+    trimmed after each store: entries unused for ``max_age_seconds`` go
+    first, then the least recently used ones until the total size fits
+    ``max_bytes``.
+    """
+
+    def __init__(self, directory: str, max_bytes: int, max_age_seconds: int):
+        """Initialize the cache.
+
+        Args:
+            directory: Cache directory (created if missing)
+            max_bytes: Size budget in bytes (0 disables caching)
+            max_age_seconds: Entries unused for longer are evicted (0 = no limit)
+        """
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.max_age_seconds = max_age_seconds
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        # Separate from _lock so lookups never wait for an eviction scan
+        self._stats_lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        """Whether the cache stores anything."""
+        return self.max_bytes > 0
+
+    def path(self, key: str, extension: str) -> str:
+        """Path of a cached file.
+
+        Args:
+            key: Entry key
+            extension: File extension (e.g. '.mp4')
+
+        Returns:
+            Path inside the cache directory
+        """
+        return os.path.join(self.directory, key + extension)
+
+    def fetch_file(self, key: str, extension: str, destination: str, touch: bool = True) -> bool:
+        """Place a cached file at ``destination``.
+
+        Args:
+            key: Entry key
+            extension: File extension
+            destination: Where the file is expected
+            touch: Whether to mark the file as recently used. Touching a
+                linked file also sets the mtime of every file placed from it
+
+        Returns:
+            True on a hit, False on a miss
+        """
+        if not self.enabled:
+            return False
+        try:
+            place_file(self.path(key, extension), destination)
+        except OSError:
+            self.record_lookup(False)
+            return False
+        if touch:
+            self.touch(key, extension)
+        self.record_lookup(True)
+        return True
+
+    def record_lookup(self, hit: bool) -> None:
+        """Count a lookup in the hit/miss counters.
+
+        Args:
+            hit: Whether the entry was found
+        """
+        with self._stats_lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def stats(self) -> dict:
+        """Lookup counters since the cache was created.
+
+        Returns:
+            Dictionary with hit/miss counters and the hit ratio
+        """
+        with self._stats_lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+            }
+
+    def store_file(self, key: str, extension: str, source: str) -> None:
+        """Add a file to the cache (without trimming it).
+
+        Args:
+            key: Entry key
+            extension: File extension
+            source: File to cache
+        """
+        if not self.enabled:
+            return
+        os.makedirs(self.directory, exist_ok=True)
+        place_file(source, self.path(key, extension))
+
+    def touch(self, key: str, *extensions: str) -> None:
+        """Mark files of an entry as recently used.
+
+        Args:
+            key: Entry key
+            *extensions: Extensions of the entry's files
+        """
+        now = time.time()
+        for extension in extensions:
+            try:
+                os.utime(self.path(key, extension), (now, now))
+            except OSError:
+                pass
+
+    def evict(self) -> None:
+        """Remove expired entries, then least recently used ones over budget."""
+        with self._lock:
+            entries = self._list_entries()
+            now = time.time()
+            total = sum(size for _, size, _ in entries)
+
+            # Oldest access first
+            for last_used, size, paths in sorted(entries):
+                expired = self.max_age_seconds > 0 and now - last_used > self.max_age_seconds
+                if not expired and total <= self.max_bytes:
+                    break
+                for path in paths:
+                    try:
+                        os.remove(path)
+                    except OSError:
+                        pass
+                total -= size
+
+    def _list_entries(self) -> List[Tuple[float, int, List[str]]]:
+        """Scan the cache directory.
+
+        Returns:
+            List of (last_used, size_in_bytes, paths) per entry
+        """
+        entries: Dict[str, Tuple[float, int, List[str]]] = {}
+        try:
+            names = os.listdir(self.directory)
+        except FileNotFoundError:
+            return []
+
+        for name in names:
+            if name.startswith('.tmp_'):
+                continue
+            path = os.path.join(self.directory, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            key = os.path.splitext(name)[0]
+            last_used, size, paths = entries.get(key, (0.0, 0, []))
+            entries[key] = (max(last_used, stat.st_mtime), size + stat.st_size, paths + [path])
+        return list(entries.values())
@@ -0,0 +1,135 @@
+"""Process-wide cache of decoded (and pre-fitted) source images."""
+
+import os
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Hashable, Optional, Tuple
+
+import numpy as np
+
+from app.core.config import settings
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+class DecodedImageCache:
+    """LRU cache of decoded images bounded by a memory budget.
+
+    Entries are keyed by the file identity (absolute path, mtime, size)
+    plus whatever determines the decoded pixels (target resolution,
+    effect scale), so an edited file is never served stale. Cached arrays
+    are shared between requests and are made read-only.
+    """
+
+    def __init__(self, max_bytes: int):
+        """Initialize the cache.
+
+        Args:
+            max_bytes: Memory budget in bytes (0 disables caching)
+        """
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: "OrderedDict[Hashable, np.ndarray]" = OrderedDict()
+        self._current_bytes = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(image_path: str, *variant: Hashable) -> Tuple[Hashable, ...]:
+        """Build a cache key for an image file.
+
+        Args:
+            image_path: Path of the image file
+            *variant: Parameters that change the decoded pixels
+
+        Returns:
+            Hashable cache key
+        """
+        stat = os.stat(image_path)
+        return (os.path.abspath(image_path), stat.st_mtime_ns, stat.st_size) + variant
+
+    def get(self, key: Hashable) -> Optional[np.ndarray]:
+        """Look up a decoded image and mark it as recently used.
+
+        Args:
+            key: Key from make_key()
+
+        Returns:
+            Cached read-only frame, or None on a miss
+        """
+        with self._lock:
+            frame = self._entries.get(key)
+            if frame is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return frame
+
+    def put(self, key: Hashable, frame: np.ndarray) -> np.ndarray:
+        """Store a decoded image, evicting least recently used entries.
+
+        Frames larger than the whole budget are not cached.
+
+        Args:
+            key: Key from make_key()
+            frame: Decoded frame
+
+        Returns:
+            The frame, now read-only
+        """
+        frame.flags.writeable = False
+        if frame.nbytes > self.max_bytes:
+            return frame
+
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._current_bytes -= previous.nbytes
+
+            while self._entries and self._current_bytes + frame.nbytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._current_bytes -= evicted.nbytes
+                self.evictions += 1
+
+            self._entries[key] = frame
+            self._current_bytes += frame.nbytes
+        return frame
+
+    def clear(self) -> None:
+        """Drop every entry (counters are kept)."""
+        with self._lock:
+            self._entries.clear()
+            self._current_bytes = 0
+
+    def stats(self) -> dict:
+        """Current cache statistics.
+
+        Returns:
+            Dictionary with entries, bytes, budget and hit/miss counters
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._current_bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+            }
+
+
+@lru_cache
+def get_image_cache() -> DecodedImageCache:
+    """Get the process-wide decoded image cache (singleton pattern).
+
+    Returns:
+        DecodedImageCache sized by settings.image_cache_max_bytes
+    """
+    logger.info(f"Decoded image cache budget: {settings.image_cache_max_bytes} bytes")
+    return DecodedImageCache(settings.image_cache_max_bytes)
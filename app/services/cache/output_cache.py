@@ -0,0 +1,78 @@
+"""Content-addressed cache of finished videos on disk."""
+
+import json
+import os
+import tempfile
+from functools import lru_cache
+from typing import Optional
+
+from app.core.config import settings
+from app.services.cache.file_cache import FileCache
+
+
+class VideoOutputCache(FileCache):
+    """Finished videos stored under the hash of the request that produced them.
+
+    Each entry is a video file ``<key><ext>`` and a ``<key>.json`` holding
+    the generation result. Uses are recorded on the ``.json`` only: the
+    video shares its inode with the outputs served from it, whose mtime
+    must not change on later hits.
+    """
+
+    def fetch(self, key: str, extension: str, output_path: str) -> Optional[dict]:
+        """Place a cached video at ``output_path``.
+
+        Args:
+            key: Request hash
+            extension: Video file extension (e.g. '.mp4')
+            output_path: Where the video is expected
+
+        Returns:
+            The stored generation result, or None on a miss
+        """
+        if not self.enabled:
+            return None
+        try:
+            with open(self.path(key, '.json')) as meta_file:
+                result = json.load(meta_file)
+        except (OSError, ValueError):
+            self.record_lookup(False)
+            return None
+        if not self.fetch_file(key, extension, output_path, touch=False):
+            return None
+        self.touch(key, '.json')
+        return result
+
+    def store(self, key: str, extension: str, output_path: str, result: dict) -> None:
+        """Add a finished video to the cache, then trim the cache.
+
+        Args:
+            key: Request hash
+            extension: Video file extension (e.g. '.mp4')
+            output_path: Freshly generated video
+            result: Generation result to return on later hits
+        """
+        if not self.enabled:
+            return
+        self.store_file(key, extension, output_path)
+        fd, temp_meta = tempfile.mkstemp(prefix='.tmp_', dir=self.directory)
+        with os.fdopen(fd, 'w') as meta_file:
+            json.dump(result, meta_file)
+        os.replace(temp_meta, self.path(key, '.json'))
+
+        self.evict()
+
+
+@lru_cache
+def get_output_cache() -> VideoOutputCache:
+    """Get the process-wide video output cache (singleton pattern).
+
+    Returns:
+        VideoOutputCache configured from settings
+    """
+    return VideoOutputCache(
+        directory=os.path.join(settings.cache_dir, 'outputs'),
+        max_bytes=settings.output_cache_max_bytes,
+        max_age_seconds=settings.output_cache_max_age_seconds
+    )
+
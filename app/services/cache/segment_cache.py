@@ -0,0 +1,25 @@
+"""Disk cache of encoded timeline segments."""
+
+import os
+from functools import lru_cache
+
+from app.core.config import settings
+from app.services.cache.file_cache import FileCache
+
+
+@lru_cache
+def get_segment_cache() -> FileCache:
+    """Get the process-wide encoded segment cache (singleton pattern).
+
+    Entries are closed-GOP segment files keyed by the hash of everything
+    that determines their frames and encoding, so unchanged segments of an
+    edited timeline are reused as-is by the concat step.
+
+    Returns:
+        FileCache configured from settings
+    """
+    return FileCache(
+        directory=os.path.join(settings.cache_dir, 'segments'),
+        max_bytes=settings.segment_cache_max_bytes,
+        max_age_seconds=settings.segment_cache_max_age_seconds
+    )
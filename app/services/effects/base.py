@@ -1,8 +1,9 @@
 """Base class for all effects (continuous movements)."""
 
 from abc import ABC, abstractmethod
+import cv2
 import numpy as np
-from typing import Tuple
+from typing import Optional, Tuple
 
 
 class EffectBase(ABC):
@@ -14,31 +15,136 @@ class EffectBase(ABC):
     Examples: pan, continuous zoom, rotation
     """
     
-    def __init__(self, intensity: float = 1.0):
+    def __init__(self, intensity: float = 1.0, subpixel: bool = False):
         """Initialize effect.
         
         Args:
             intensity: Effect intensity (0.0 to 1.0+)
+            subpixel: Render movements at fractional pixel positions, for the
+                effects that support it (see PanEffect)
         """
         self.intensity = intensity
+        self.subpixel = subpixel
     
     @abstractmethod
     def apply(self, 
               frame: np.ndarray, 
               progress: float,
-              frame_size: Tuple[int, int]) -> np.ndarray:
+              frame_size: Tuple[int, int],
+              out: Optional[np.ndarray] = None) -> np.ndarray:
         """Apply effect to a frame at a given progress.
         
         Args:
             frame: Original frame (numpy array) - can be larger than frame_size
             progress: Effect progress from 0.0 to 1.0
             frame_size: Target frame size (width, height)
+            out: Optional preallocated (height, width, 3) uint8 buffer that
+                receives the result instead of a newly allocated array
             
         Returns:
             Modified frame as numpy array with size = frame_size
+            (``out`` when provided)
         """
         pass
     
+    def prepare(self, frame: np.ndarray, frame_size: Tuple[int, int]) -> np.ndarray:
+        """Work done once per segment on the source, before its frames are rendered.
+        
+        Renderers pass the returned frame to apply() for every frame of the
+        segment. Effects override this to hoist progress-independent work
+        (e.g. the cover-fit resize) out of the per-frame loop; apply() must
+        still accept the unprepared source (previews, hold frames).
+        
+        Args:
+            frame: Source frame of the segment
+            frame_size: Target frame size (width, height)
+            
+        Returns:
+            Frame to render the segment from (``frame`` itself by default)
+        """
+        return frame
+    
+    def max_source_scale(self) -> float:
+        """Largest scale applied on top of the cover-fit size during the effect.
+        
+        Used to prepare, once per image, the smallest source that still
+        covers every frame of the effect without upscaling.
+        
+        Returns:
+            Scale factor relative to the cover-fit size (1.0 = no zoom)
+        """
+        return 1.0
+    
+    def is_progress_invariant(self) -> bool:
+        """Whether apply() returns the same pixels for every progress value.
+        
+        Every built-in effect is a no-op over time at intensity 0.
+        Renderers use this to compute a hold frame once instead of once
+        per output frame.
+        
+        Returns:
+            True if the effect output does not depend on progress
+        """
+        return self.intensity == 0
+    
+    @staticmethod
+    def resize_crop(frame: np.ndarray,
+                    scaled_size: Tuple[int, int],
+                    offset: Tuple[float, float],
+                    frame_size: Tuple[int, int],
+                    out: Optional[np.ndarray] = None) -> np.ndarray:
+        """Resize then crop, computing only the pixels that are kept.
+        
+        Equivalent to ``cv2.resize(frame, scaled_size)`` cropped at ``offset``
+        to ``frame_size``, done as a single affine warp so the full resized
+        image is never allocated.
+        
+        Args:
+            frame: Source frame
+            scaled_size: Size (width, height) the frame is resized to
+            offset: Top-left corner (x, y) of the crop in the resized frame
+            frame_size: Crop size (width, height)
+            out: Optional preallocated buffer for the result
+            
+        Returns:
+            Cropped frame with size = frame_size
+        """
+        h, w = frame.shape[:2]
+        scaled_w, scaled_h = scaled_size
+        x_start, y_start = offset
+        
+        # Same pixel-center convention as cv2.resize
+        sx = w / scaled_w
+        sy = h / scaled_h
+        matrix = np.array([
+            [sx, 0.0, (x_start + 0.5) * sx - 0.5],
+            [0.0, sy, (y_start + 0.5) * sy - 0.5],
+        ])
+        return cv2.warpAffine(
+            frame,
+            matrix,
+            frame_size,
+            dst=out,
+            flags=cv2.INTER_LINEAR | cv2.WARP_INVERSE_MAP,
+            borderMode=cv2.BORDER_REPLICATE
+        )
+    
+    @staticmethod
+    def write_out(result: np.ndarray, out: Optional[np.ndarray]) -> np.ndarray:
+        """Copy a result into ``out`` when a buffer was provided.
+        
+        Args:
+            result: Computed frame
+            out: Optional preallocated buffer
+            
+        Returns:
+            ``out`` filled with the result, or ``result`` itself
+        """
+        if out is None:
+            return result
+        np.copyto(out, result)
+        return out
+    
     @staticmethod
     def ease_in_out(t: float) -> float:
         """Smooth easing function for natural movement.
@@ -1,8 +1,8 @@
 """Pan effects (panoramic movements)."""
 
-import numpy as np
 import cv2
-from typing import Tuple
+import numpy as np
+from typing import Optional, Tuple
 from app.services.effects.base import EffectBase
 from app.services.effects.registry import EffectRegistry
 
@@ -13,29 +13,59 @@ class PanEffect(EffectBase):
     Pan effects smoothly move across an image, revealing parts that
     would otherwise be cropped out. Perfect for images larger than
     the video resolution.
+    
+    The cover-fit resize does not depend on progress: renderers fit the
+    source once per segment (see prepare) and every frame is then a crop
+    of the fitted image, i.e. a view or a single copy instead of a resample.
     """
     
-    def __init__(self, intensity: float = 1.0, direction: str = 'right'):
+    def __init__(self, intensity: float = 1.0, direction: str = 'right', subpixel: bool = False):
         """Initialize pan effect.
         
         Args:
             intensity: Pan intensity (0.0 to 1.0+)
             direction: Pan direction ('right', 'left', 'up', 'down', 
                       'diagonal_tr', 'diagonal_tl', 'diagonal_br', 'diagonal_bl')
+            subpixel: Keep fractional pan offsets, rendered with a bilinear
+                translation, instead of snapping them to whole pixels
+                (smoother slow pans, at the cost of one warp per frame)
         """
-        super().__init__(intensity)
+        super().__init__(intensity, subpixel)
         self.direction = direction
     
+    def prepare(self, frame: np.ndarray, frame_size: Tuple[int, int]) -> np.ndarray:
+        """Resize the source once to its cover-fit size.
+        
+        Args:
+            frame: Source frame of the segment
+            frame_size: Target frame size (width, height)
+            
+        Returns:
+            Source resized to cover frame_size (``frame`` if it already does)
+        """
+        h, w = frame.shape[:2]
+        fit_size = self._cover_size((w, h), frame_size)
+        if fit_size == (w, h):
+            return frame
+        return cv2.resize(frame, fit_size)
+    
     def apply(self, 
               frame: np.ndarray, 
               progress: float,
-              frame_size: Tuple[int, int]) -> np.ndarray:
+              frame_size: Tuple[int, int],
+              out: Optional[np.ndarray] = None) -> np.ndarray:
         """Apply pan effect.
         
+        A source already at its cover-fit size (see prepare) is cropped
+        without resampling: the result is a view of ``frame``, copied into
+        ``out`` when a buffer is provided. Any other source is resized and
+        cropped in a single warp.
+        
         Args:
             frame: Original frame (can be larger than frame_size)
             progress: Effect progress from 0.0 to 1.0
             frame_size: Target frame size (width, height)
+            out: Optional preallocated buffer for the result
             
         Returns:
             Cropped frame with pan effect applied
@@ -46,22 +76,8 @@ class PanEffect(EffectBase):
         # Apply smooth easing for natural movement
         eased_progress = self.ease_in_out(progress)
         
-        # Calculate aspect ratios
-        frame_ratio = w / h
-        target_ratio = target_w / target_h
-        
-        # Resize frame to cover the target size (maintaining aspect ratio)
-        if frame_ratio > target_ratio:
-            # Frame is wider - fit to height
-            new_h = target_h
-            new_w = int(new_h * frame_ratio)
-        else:
-            # Frame is taller - fit to width
-            new_w = target_w
-            new_h = int(new_w / frame_ratio)
-        
-        # Resize frame
-        resized = cv2.resize(frame, (new_w, new_h))
+        # Size of the frame resized to cover the target (maintaining aspect ratio)
+        new_w, new_h = self._cover_size((w, h), frame_size)
         
         # Calculate maximum movement range
         max_x_movement = max(0, new_w - target_w)
@@ -73,16 +89,97 @@ class PanEffect(EffectBase):
             max_x_movement,
             max_y_movement
         )
+        if not self.subpixel:
+            x_offset, y_offset = int(x_offset), int(y_offset)
+        
+        if (new_w, new_h) != (w, h):
+            # Resize and crop the frame at the calculated offset in one pass
+            return self.resize_crop(frame, (new_w, new_h), (x_offset, y_offset), frame_size, out)
+        
+        if x_offset + target_w > w or y_offset + target_h > h:
+            # Past the edge (intensity > 1): replicate the border as the
+            # resize path does
+            return self.resize_crop(frame, (w, h), (x_offset, y_offset), frame_size, out)
+        
+        if x_offset != int(x_offset) or y_offset != int(y_offset):
+            return self._translate(frame, x_offset, y_offset, frame_size, out)
+        
+        x_offset, y_offset = int(x_offset), int(y_offset)
+        crop = frame[y_offset:y_offset + target_h, x_offset:x_offset + target_w]
+        return self.write_out(crop, out)
+    
+    @staticmethod
+    def _translate(frame: np.ndarray,
+                   x_offset: float,
+                   y_offset: float,
+                   frame_size: Tuple[int, int],
+                   out: Optional[np.ndarray] = None) -> np.ndarray:
+        """Crop at a fractional offset with bilinear interpolation.
+        
+        A translation only mixes neighbouring pixels with the same weights
+        everywhere, so it is done as one weighted sum of two shifted crops
+        per fractional axis, several times cheaper than a warp.
+        
+        Args:
+            frame: Fitted source frame
+            x_offset: Left edge of the crop (the crop must fit in the frame)
+            y_offset: Top edge of the crop
+            frame_size: Crop size (width, height)
+            out: Optional preallocated buffer for the result
+            
+        Returns:
+            Cropped frame with size = frame_size
+        """
+        target_w, target_h = frame_size
+        x, y = int(x_offset), int(y_offset)
+        fx, fy = x_offset - x, y_offset - y
+        if out is None:
+            out = np.empty((target_h, target_w, 3), dtype=np.uint8)
+        
+        # Horizontal pass over the rows the vertical pass needs
+        rows = target_h + 1 if fy else target_h
+        if fx:
+            blended = out if not fy else np.empty((rows, target_w, 3), dtype=np.uint8)
+            cv2.addWeighted(frame[y:y + rows, x:x + target_w], 1 - fx,
+                            frame[y:y + rows, x + 1:x + 1 + target_w], fx,
+                            0, dst=blended)
+        else:
+            blended = frame[y:y + rows, x:x + target_w]
         
-        # Crop the frame at the calculated offset
-        cropped = resized[y_offset:y_offset+target_h, x_offset:x_offset+target_w]
+        if fy:
+            cv2.addWeighted(blended[:-1], 1 - fy, blended[1:], fy, 0, dst=out)
+        return out
+    
+    @staticmethod
+    def _cover_size(size: Tuple[int, int], frame_size: Tuple[int, int]) -> Tuple[int, int]:
+        """Size of a frame resized to cover the target, keeping its aspect ratio.
         
-        return cropped
+        Args:
+            size: Frame size (width, height)
+            frame_size: Target frame size (width, height)
+            
+        Returns:
+            Cover-fit size (width, height)
+        """
+        w, h = size
+        target_w, target_h = frame_size
+        if (w == target_w and h >= target_h) or (h == target_h and w >= target_w):
+            # Already fitted (see prepare): the ratio below could round it off by one
+            return w, h
+        
+        frame_ratio = w / h
+        target_ratio = target_w / target_h
+        
+        if frame_ratio > target_ratio:
+            # Frame is wider - fit to height
+            return int(target_h * frame_ratio), target_h
+        # Frame is taller - fit to width
+        return target_w, int(target_w / frame_ratio)
     
     def _calculate_offset(self, 
                          progress: float, 
                          max_x: int, 
-                         max_y: int) -> Tuple[int, int]:
+                         max_y: int) -> Tuple[float, float]:
         """Calculate pan offset based on direction.
         
         Args:
@@ -91,7 +188,7 @@ class PanEffect(EffectBase):
             max_y: Maximum vertical movement
             
         Returns:
-            Tuple of (x_offset, y_offset)
+            Tuple of (x_offset, y_offset), possibly fractional
         """
         # Apply intensity to movement range
         max_x = int(max_x * self.intensity)
@@ -99,91 +196,91 @@ class PanEffect(EffectBase):
         
         if self.direction == 'right':
             # Pan from left to right
-            x_offset = int(progress * max_x)
-            y_offset = max_y // 2
+            x_offset = progress * max_x
+            y_offset = max_y / 2
             
         elif self.direction == 'left':
             # Pan from right to left
-            x_offset = int((1 - progress) * max_x)
-            y_offset = max_y // 2
+            x_offset = (1 - progress) * max_x
+            y_offset = max_y / 2
             
         elif self.direction == 'down':
             # Pan from top to bottom
-            x_offset = max_x // 2
-            y_offset = int(progress * max_y)
+            x_offset = max_x / 2
+            y_offset = progress * max_y
             
         elif self.direction == 'up':
             # Pan from bottom to top
-            x_offset = max_x // 2
-            y_offset = int((1 - progress) * max_y)
+            x_offset = max_x / 2
+            y_offset = (1 - progress) * max_y
             
         elif self.direction == 'diagonal_br':
             # Pan from top-left to bottom-right
-            x_offset = int(progress * max_x)
-            y_offset = int(progress * max_y)
+            x_offset = progress * max_x
+            y_offset = progress * max_y
             
         elif self.direction == 'diagonal_bl':
             # Pan from top-right to bottom-left
-            x_offset = int((1 - progress) * max_x)
-            y_offset = int(progress * max_y)
+            x_offset = (1 - progress) * max_x
+            y_offset = progress * max_y
             
         elif self.direction == 'diagonal_tr':
             # Pan from bottom-left to top-right
-            x_offset = int(progress * max_x)
-            y_offset = int((1 - progress) * max_y)
+            x_offset = progress * max_x
+            y_offset = (1 - progress) * max_y
             
         elif self.direction == 'diagonal_tl':
             # Pan from bottom-right to top-left
-            x_offset = int((1 - progress) * max_x)
-            y_offset = int((1 - progress) * max_y)
+            x_offset = (1 - progress) * max_x
+            y_offset = (1 - progress) * max_y
             
         else:
             # Default: center
-            x_offset = max_x // 2
-            y_offset = max_y // 2
+            x_offset = max_x / 2
+            y_offset = max_y / 2
         
         return x_offset, y_offset
 
 
 # Create specific pan effect classes
 class PanRightEffect(PanEffect):
-    def __init__(self, intensity: float = 1.0):
-        super().__init__(intensity, direction='right')
+    def __init__(self, intensity: float = 1.0, subpixel: bool = False):
+        super().__init__(intensity, direction='right', subpixel=subpixel)
 
 
 class PanLeftEffect(PanEffect):
-    def __init__(self, intensity: float = 1.0):
-        super().__init__(intensity, direction='left')
+    def __init__(self, intensity: float = 1.0, subpixel: bool = False):
+        super().__init__(intensity, direction='left', subpixel=subpixel)
 
 
 class PanUpEffect(PanEffect):
-    def __init__(self, intensity: float = 1.0):
-        super().__init__(intensity, direction='up')
+    def __init__(self, intensity: float = 1.0, subpixel: bool = False):
+        super().__init__(intensity, direction='up', subpixel=subpixel)
 
 
 class PanDownEffect(PanEffect):
-    def __init__(self, intensity: float = 1.0):
-        super().__init__(intensity, direction='down')
+    def __init__(self, intensity: float = 1.0, subpixel: bool = False):
+        super().__init__(intensity, direction='down', subpixel=subpixel)
 
 
 class PanDiagonalTREffect(PanEffect):
-    def __init__(self, intensity: float = 1.0):
-        super().__init__(intensity, direction='diagonal_tr')
+    def __init__(self, intensity: float = 1.0, subpixel: bool = False):
+        super().__init__(intensity, direction='diagonal_tr', subpixel=subpixel)
 
 
 class PanDiagonalTLEffect(PanEffect):
-    def __init__(self, intensity: float = 1.0):
-        super().__init__(intensity, direction='diagonal_tl')
+    def __init__(self, intensity: float = 1.0, subpixel: bool = False):
+        super().__init__(intensity, direction='diagonal_tl', subpixel=subpixel)
 
 
 class PanDiagonalBREffect(PanEffect):
-    def __init__(self, intensity: float = 1.0):
-        super().__init__(intensity, direction='diagonal_br')
+    def __init__(self, intensity: float = 1.0, subpixel: bool = False):
+        super().__init__(intensity, direction='diagonal_br', subpixel=subpixel)
 
 
 class PanDiagonalBLEffect(PanEffect):
-    def __init__(self, intensity: float = 1.0):
-        super().__init__(intensity, direction='diagonal_bl')
+    def __init__(self, intensity: float = 1.0, subpixel: bool = False):
+        super().__init__(intensity, direction='diagonal_bl', subpixel=subpixel)
 
 
 # Register all pan effects
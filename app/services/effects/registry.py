@@ -24,12 +24,13 @@ class EffectRegistry:
         cls._effects[name] = effect_class
     
     @classmethod
-    def get(cls, name: str, intensity: float = 1.0) -> EffectBase:
+    def get(cls, name: str, intensity: float = 1.0, subpixel: bool = False) -> EffectBase:
         """Get an effect instance by name.
         
         Args:
             name: Name of the effect
             intensity: Intensity for the effect
+            subpixel: Render movements at fractional pixel positions
             
         Returns:
             Instance of the effect
@@ -41,7 +42,7 @@ class EffectRegistry:
             raise ValueError(
                 f"Unknown effect '{name}'. Available: {list(cls._effects.keys())}"
             )
-        return cls._effects[name](intensity=intensity)
+        return cls._effects[name](intensity=intensity, subpixel=subpixel)
     
     @classmethod
     def list_available(cls) -> list[str]:
@@ -2,11 +2,62 @@
 
 import numpy as np
 import cv2
-from typing import Tuple
+from typing import Optional, Tuple
 from app.services.effects.base import EffectBase
 from app.services.effects.registry import EffectRegistry
 
 
+def _rotate_crop(frame: np.ndarray,
+                 scaled_size: Tuple[int, int],
+                 angle: float,
+                 frame_size: Tuple[int, int],
+                 out: Optional[np.ndarray] = None) -> np.ndarray:
+    """Resize, rotate around the center and center-crop in a single warp.
+    
+    Equivalent to resizing the frame to ``scaled_size``, rotating it with
+    ``cv2.getRotationMatrix2D(center, angle, 1.0)`` and cropping the center
+    to ``frame_size``, without allocating the resized and rotated images.
+    
+    Args:
+        frame: Source frame
+        scaled_size: Size (width, height) the frame is resized to
+        angle: Rotation angle in degrees (OpenCV convention, positive = CCW)
+        frame_size: Output size (width, height)
+        out: Optional preallocated buffer for the result
+        
+    Returns:
+        Rotated and cropped frame with size = frame_size
+    """
+    h, w = frame.shape[:2]
+    new_w, new_h = scaled_size
+    target_w, target_h = frame_size
+    
+    # Output pixel -> rotated image (crop offset)
+    x_start = (new_w - target_w) // 2
+    y_start = (new_h - target_h) // 2
+    crop = np.array([[1.0, 0.0, x_start], [0.0, 1.0, y_start], [0.0, 0.0, 1.0]])
+    
+    # Rotated image -> resized image (inverse rotation)
+    center = (new_w // 2, new_h // 2)
+    rotation = cv2.getRotationMatrix2D(center, angle, 1.0)
+    inverse_rotation = np.vstack([cv2.invertAffineTransform(rotation), [0.0, 0.0, 1.0]])
+    
+    # Resized image -> source frame (cv2.resize pixel-center convention)
+    sx = w / new_w
+    sy = h / new_h
+    scale = np.array([[sx, 0.0, 0.5 * sx - 0.5], [0.0, sy, 0.5 * sy - 0.5], [0.0, 0.0, 1.0]])
+    
+    matrix = (scale @ inverse_rotation @ crop)[:2]
+    return cv2.warpAffine(
+        frame,
+        matrix,
+        frame_size,
+        dst=out,
+        flags=cv2.INTER_LINEAR | cv2.WARP_INVERSE_MAP,
+        borderMode=cv2.BORDER_REPLICATE
+    )
+
+
 class RotateClockwiseEffect(EffectBase):
     """Continuous clockwise rotation effect.
     
@@ -14,16 +65,22 @@ class RotateClockwiseEffect(EffectBase):
     the entire display duration.
     """
     
+    def max_source_scale(self) -> float:
+        """Source is enlarged 1.5x to avoid corners after rotation."""
+        return 1.5
+    
     def apply(self, 
               frame: np.ndarray, 
               progress: float,
-              frame_size: Tuple[int, int]) -> np.ndarray:
+              frame_size: Tuple[int, int],
+              out: Optional[np.ndarray] = None) -> np.ndarray:
         """Apply clockwise rotation effect.
         
         Args:
             frame: Original frame
             progress: Effect progress from 0.0 to 1.0
             frame_size: Target frame size (width, height)
+            out: Optional preallocated buffer for the result
             
         Returns:
             Rotated and cropped frame
@@ -54,28 +111,8 @@ class RotateClockwiseEffect(EffectBase):
             new_w = int(target_w * scale_factor)
             new_h = int(new_w / frame_ratio)
         
-        # Resize frame
-        resized = cv2.resize(frame, (new_w, new_h))
-        
-        # Get rotation matrix
-        center = (new_w // 2, new_h // 2)
-        rotation_matrix = cv2.getRotationMatrix2D(center, -angle, 1.0)
-        
-        # Apply rotation
-        rotated = cv2.warpAffine(
-            resized, 
-            rotation_matrix, 
-            (new_w, new_h),
-            borderMode=cv2.BORDER_REPLICATE
-        )
-        
-        # Crop to target size from center
-        x_start = (new_w - target_w) // 2
-        y_start = (new_h - target_h) // 2
-        
-        cropped = rotated[y_start:y_start+target_h, x_start:x_start+target_w]
-        
-        return cropped
+        # Resize, rotate and crop from center in one pass
+        return _rotate_crop(frame, (new_w, new_h), -angle, frame_size, out)
 
 
 class RotateCounterClockwiseEffect(EffectBase):
@@ -85,16 +122,22 @@ class RotateCounterClockwiseEffect(EffectBase):
     the entire display duration.
     """
     
+    def max_source_scale(self) -> float:
+        """Source is enlarged 1.5x to avoid corners after rotation."""
+        return 1.5
+    
     def apply(self, 
               frame: np.ndarray, 
               progress: float,
-              frame_size: Tuple[int, int]) -> np.ndarray:
+              frame_size: Tuple[int, int],
+              out: Optional[np.ndarray] = None) -> np.ndarray:
         """Apply counter-clockwise rotation effect.
         
         Args:
             frame: Original frame
             progress: Effect progress from 0.0 to 1.0
             frame_size: Target frame size (width, height)
+            out: Optional preallocated buffer for the result
             
         Returns:
             Rotated and cropped frame
@@ -123,28 +166,8 @@ class RotateCounterClockwiseEffect(EffectBase):
             new_w = int(target_w * scale_factor)
             new_h = int(new_w / frame_ratio)
         
-        # Resize frame
-        resized = cv2.resize(frame, (new_w, new_h))
-        
-        # Get rotation matrix (positive angle for counter-clockwise)
-        center = (new_w // 2, new_h // 2)
-        rotation_matrix = cv2.getRotationMatrix2D(center, angle, 1.0)
-        
-        # Apply rotation
-        rotated = cv2.warpAffine(
-            resized, 
-            rotation_matrix, 
-            (new_w, new_h),
-            borderMode=cv2.BORDER_REPLICATE
-        )
-        
-        # Crop to target size from center
-        x_start = (new_w - target_w) // 2
-        y_start = (new_h - target_h) // 2
-        
-        cropped = rotated[y_start:y_start+target_h, x_start:x_start+target_w]
-        
-        return cropped
+        # Resize, rotate and crop from center in one pass
+        return _rotate_crop(frame, (new_w, new_h), angle, frame_size, out)
 
 
 class RotateSlowEffect(EffectBase):
@@ -154,16 +177,22 @@ class RotateSlowEffect(EffectBase):
     without being too distracting. Good for professional videos.
     """
     
+    def max_source_scale(self) -> float:
+        """Source is enlarged 1.3x to avoid corners after rotation."""
+        return 1.3
+    
     def apply(self, 
               frame: np.ndarray, 
               progress: float,
-              frame_size: Tuple[int, int]) -> np.ndarray:
+              frame_size: Tuple[int, int],
+              out: Optional[np.ndarray] = None) -> np.ndarray:
         """Apply slow rotation effect.
         
         Args:
             frame: Original frame
             progress: Effect progress from 0.0 to 1.0
             frame_size: Target frame size (width, height)
+            out: Optional preallocated buffer for the result
             
         Returns:
             Rotated and cropped frame
@@ -192,28 +221,8 @@ class RotateSlowEffect(EffectBase):
             new_w = int(target_w * scale_factor)
             new_h = int(new_w / frame_ratio)
         
-        # Resize frame
-        resized = cv2.resize(frame, (new_w, new_h))
-        
-        # Get rotation matrix
-        center = (new_w // 2, new_h // 2)
-        rotation_matrix = cv2.getRotationMatrix2D(center, -angle, 1.0)
-        
-        # Apply rotation
-        rotated = cv2.warpAffine(
-            resized, 
-            rotation_matrix, 
-            (new_w, new_h),
-            borderMode=cv2.BORDER_REPLICATE
-        )
-        
-        # Crop to target size from center
-        x_start = (new_w - target_w) // 2
-        y_start = (new_h - target_h) // 2
-        
-        cropped = rotated[y_start:y_start+target_h, x_start:x_start+target_w]
-        
-        return cropped
+        # Resize, rotate and crop from center in one pass
+        return _rotate_crop(frame, (new_w, new_h), -angle, frame_size, out)
 
 
 # Register rotation effects
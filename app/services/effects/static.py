@@ -1,8 +1,7 @@
 """Static effect (no movement)."""
 
 import numpy as np
-import cv2
-from typing import Tuple
+from typing import Optional, Tuple
 from app.services.effects.base import EffectBase
 from app.services.effects.registry import EffectRegistry
 
@@ -13,16 +12,22 @@ class StaticEffect(EffectBase):
     This is the default effect when no effect is specified.
     """
     
+    def is_progress_invariant(self) -> bool:
+        """Static output never changes with progress."""
+        return True
+    
     def apply(self, 
               frame: np.ndarray, 
               progress: float,
-              frame_size: Tuple[int, int]) -> np.ndarray:
+              frame_size: Tuple[int, int],
+              out: Optional[np.ndarray] = None) -> np.ndarray:
         """Apply static effect (no movement).
         
         Args:
             frame: Original frame
             progress: Effect progress (unused for static)
             frame_size: Target frame size (width, height)
+            out: Optional preallocated buffer for the result
             
         Returns:
             Frame resized to frame_size
@@ -32,7 +37,7 @@ class StaticEffect(EffectBase):
         
         # If frame is already the right size, return as is
         if w == target_w and h == target_h:
-            return frame
+            return self.write_out(frame, out)
         
         # Calculate aspect ratios
         frame_ratio = w / h
@@ -47,16 +52,12 @@ class StaticEffect(EffectBase):
             new_w = target_w
             new_h = int(new_w / frame_ratio)
         
-        # Resize frame
-        resized = cv2.resize(frame, (new_w, new_h))
-        
         # Crop to center
         y_start = (new_h - target_h) // 2
         x_start = (new_w - target_w) // 2
         
-        cropped = resized[y_start:y_start+target_h, x_start:x_start+target_w]
-        
-        return cropped
+        # Resize and crop in one pass
+        return self.resize_crop(frame, (new_w, new_h), (x_start, y_start), frame_size, out)
 
 
 # Register effect
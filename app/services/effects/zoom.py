@@ -1,8 +1,7 @@
 """Continuous zoom effects."""
 
 import numpy as np
-import cv2
-from typing import Tuple
+from typing import Optional, Tuple
 from app.services.effects.base import EffectBase
 from app.services.effects.registry import EffectRegistry
 
@@ -14,16 +13,22 @@ class ZoomInContinuousEffect(EffectBase):
     The image gradually zooms in from normal size to a larger view.
     """
     
+    def max_source_scale(self) -> float:
+        """Zoom peaks at 1.0 + 0.3 * intensity."""
+        return 1.0 + (0.3 * self.intensity)
+    
     def apply(self, 
               frame: np.ndarray, 
               progress: float,
-              frame_size: Tuple[int, int]) -> np.ndarray:
+              frame_size: Tuple[int, int],
+              out: Optional[np.ndarray] = None) -> np.ndarray:
         """Apply continuous zoom in effect.
         
         Args:
             frame: Original frame
             progress: Effect progress from 0.0 to 1.0
             frame_size: Target frame size (width, height)
+            out: Optional preallocated buffer for the result
             
         Returns:
             Zoomed and cropped frame
@@ -55,16 +60,12 @@ class ZoomInContinuousEffect(EffectBase):
         zoom_w = int(new_w * zoom)
         zoom_h = int(new_h * zoom)
         
-        # Resize with zoom
-        resized = cv2.resize(frame, (zoom_w, zoom_h))
-        
         # Crop from center
         x_start = (zoom_w - target_w) // 2
         y_start = (zoom_h - target_h) // 2
         
-        cropped = resized[y_start:y_start+target_h, x_start:x_start+target_w]
-        
-        return cropped
+        # Resize with zoom and crop in one pass
+        return self.resize_crop(frame, (zoom_w, zoom_h), (x_start, y_start), frame_size, out)
 
 
 class ZoomOutContinuousEffect(EffectBase):
@@ -74,16 +75,22 @@ class ZoomOutContinuousEffect(EffectBase):
     and gradually zooms out to normal size.
     """
     
+    def max_source_scale(self) -> float:
+        """Zoom starts at 1.0 + 0.3 * intensity."""
+        return 1.0 + (0.3 * self.intensity)
+    
     def apply(self, 
               frame: np.ndarray, 
               progress: float,
-              frame_size: Tuple[int, int]) -> np.ndarray:
+              frame_size: Tuple[int, int],
+              out: Optional[np.ndarray] = None) -> np.ndarray:
         """Apply continuous zoom out effect.
         
         Args:
             frame: Original frame
             progress: Effect progress from 0.0 to 1.0
             frame_size: Target frame size (width, height)
+            out: Optional preallocated buffer for the result
             
         Returns:
             Zoomed and cropped frame
@@ -114,16 +121,12 @@ class ZoomOutContinuousEffect(EffectBase):
         zoom_w = int(new_w * zoom)
         zoom_h = int(new_h * zoom)
         
-        # Resize with zoom
-        resized = cv2.resize(frame, (zoom_w, zoom_h))
-        
         # Crop from center
         x_start = (zoom_w - target_w) // 2
         y_start = (zoom_h - target_h) // 2
         
-        cropped = resized[y_start:y_start+target_h, x_start:x_start+target_w]
-        
-        return cropped
+        # Resize with zoom and crop in one pass
+        return self.resize_crop(frame, (zoom_w, zoom_h), (x_start, y_start), frame_size, out)
 
 
 class ZoomInOutEffect(EffectBase):
@@ -133,16 +136,22 @@ class ZoomInOutEffect(EffectBase):
     the second half, creating a dynamic "breathing" motion.
     """
     
+    def max_source_scale(self) -> float:
+        """Zoom peaks at 1.0 + 0.2 * intensity mid-way."""
+        return 1.0 + (0.2 * self.intensity)
+    
     def apply(self, 
               frame: np.ndarray, 
               progress: float,
-              frame_size: Tuple[int, int]) -> np.ndarray:
+              frame_size: Tuple[int, int],
+              out: Optional[np.ndarray] = None) -> np.ndarray:
         """Apply zoom in/out effect.
         
         Args:
             frame: Original frame
             progress: Effect progress from 0.0 to 1.0
             frame_size: Target frame size (width, height)
+            out: Optional preallocated buffer for the result
             
         Returns:
             Zoomed and cropped frame
@@ -178,16 +187,12 @@ class ZoomInOutEffect(EffectBase):
         zoom_w = int(new_w * zoom)
         zoom_h = int(new_h * zoom)
         
-        # Resize with zoom
-        resized = cv2.resize(frame, (zoom_w, zoom_h))
-        
         # Crop from center
         x_start = (zoom_w - target_w) // 2
         y_start = (zoom_h - target_h) // 2
         
-        cropped = resized[y_start:y_start+target_h, x_start:x_start+target_w]
-        
-        return cropped
+        # Resize with zoom and crop in one pass
+        return self.resize_crop(frame, (zoom_w, zoom_h), (x_start, y_start), frame_size, out)
 
 
 # Register zoom effects
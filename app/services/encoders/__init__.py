@@ -0,0 +1,16 @@
+"""Encoder backends for video generation."""
+
+from app.services.encoders.ffmpeg_pipe import FFmpegPipeWriter
+from app.services.encoders.pipeline import FramePipeline
+from app.services.encoders.profiles import ENCODER_PROFILES, EncoderProfile, get_encoder_profile
+
+ENCODER_BACKENDS = ('moviepy', 'ffmpeg_pipe', 'ffmpeg_parallel')
+
+__all__ = [
+    'FFmpegPipeWriter',
+    'FramePipeline',
+    'ENCODER_BACKENDS',
+    'ENCODER_PROFILES',
+    'EncoderProfile',
+    'get_encoder_profile',
+]
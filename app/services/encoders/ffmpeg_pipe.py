@@ -0,0 +1,198 @@
+"""Direct ffmpeg encoder fed with raw RGB frames over stdin.
+
+Bypasses moviepy's clip machinery: frames produced by the effect and
+transition ``apply()`` calls are written as-is to a long-lived ffmpeg
+subprocess.
+"""
+
+import os
+import subprocess
+from typing import Any, List, Optional, Tuple
+
+import cv2
+import numpy as np
+from moviepy.config import FFMPEG_BINARY
+
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+class FFmpegPipeWriter:
+    """Stream raw RGB24 frames into an ffmpeg process.
+
+    Usage:
+        with FFmpegPipeWriter(path, fps=30, resolution=(1280, 720)) as writer:
+            writer.write_frame(frame)
+    """
+
+    def __init__(self,
+                 output_path: str,
+                 fps: int,
+                 resolution: Tuple[int, int],
+                 codec: str = 'libx264',
+                 preset: str = 'medium',
+                 ffmpeg_params: Optional[List[str]] = None):
+        """Initialize the writer (the ffmpeg process is started by open()).
+
+        Args:
+            output_path: Path of the encoded video file
+            fps: Frames per second of the output video
+            resolution: Frame size (width, height)
+            codec: ffmpeg video codec
+            preset: Encoder preset
+            ffmpeg_params: Extra ffmpeg output arguments
+        """
+        self.output_path = output_path
+        self.fps = fps
+        self.resolution = resolution
+        self.codec = codec
+        self.preset = preset
+        self.ffmpeg_params = ffmpeg_params or []
+        self.frames_written = 0
+        # CPU seconds (user + system) used by ffmpeg, known once closed
+        self.cpu_seconds: Optional[float] = None
+        self._proc: Optional[subprocess.Popen] = None
+
+    def _build_command(self) -> List[str]:
+        """Build the ffmpeg command line.
+
+        Returns:
+            ffmpeg arguments
+        """
+        width, height = self.resolution
+        cmd = [
+            FFMPEG_BINARY,
+            '-y',
+            '-loglevel', 'error',
+            '-f', 'rawvideo',
+            '-vcodec', 'rawvideo',
+            '-s', f'{width}x{height}',
+            '-pix_fmt', 'rgb24',
+            '-r', str(self.fps),
+            '-an',
+            '-i', '-',
+            '-vcodec', self.codec,
+            '-preset', self.preset,
+        ]
+        cmd.extend(self.ffmpeg_params)
+        if self.codec == 'libx264' and width % 2 == 0 and height % 2 == 0:
+            cmd.extend(['-pix_fmt', 'yuv420p'])
+        cmd.append(self.output_path)
+        return cmd
+
+    def open(self) -> 'FFmpegPipeWriter':
+        """Start the ffmpeg process.
+
+        Returns:
+            The writer itself
+        """
+        cmd = self._build_command()
+        logger.debug(f"Starting ffmpeg: {' '.join(cmd)}")
+        self._proc = subprocess.Popen(
+            cmd,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE
+        )
+        return self
+
+    def write_frame(self, frame: np.ndarray) -> None:
+        """Write one RGB frame to the encoder.
+
+        Args:
+            frame: RGB frame (height, width, 3) uint8; resized if needed
+
+        Raises:
+            RuntimeError: If the writer is not open or ffmpeg exited
+        """
+        self.write_repeated(frame, 1)
+
+    def write_repeated(self, frame: np.ndarray, count: int) -> None:
+        """Write the same RGB frame several times (e.g. a static hold).
+
+        The frame is converted to contiguous raw bytes only once.
+
+        Args:
+            frame: RGB frame (height, width, 3) uint8; resized if needed
+            count: Number of times the frame is written
+
+        Raises:
+            RuntimeError: If the writer is not open or ffmpeg exited
+        """
+        if self._proc is None or self._proc.stdin is None:
+            raise RuntimeError("FFmpegPipeWriter is not open")
+
+        width, height = self.resolution
+        if frame.shape[0] != height or frame.shape[1] != width:
+            frame = cv2.resize(frame, (width, height))
+        if frame.dtype != np.uint8:
+            frame = frame.astype(np.uint8)
+
+        # Views (e.g. crops) are made contiguous only when needed
+        data = np.ascontiguousarray(frame).data
+        try:
+            for _ in range(count):
+                self._proc.stdin.write(data)
+        except BrokenPipeError:
+            raise RuntimeError(f"ffmpeg exited early: {self._read_stderr()}")
+        self.frames_written += count
+
+    def close(self) -> None:
+        """Flush stdin and wait for ffmpeg to finish.
+
+        Raises:
+            RuntimeError: If ffmpeg returned a non-zero exit code
+        """
+        if self._proc is None:
+            return
+        proc = self._proc
+        self._proc = None
+        if proc.stdin is not None:
+            try:
+                proc.stdin.close()
+            except BrokenPipeError:
+                pass
+        stderr = proc.stderr.read().decode(errors='replace') if proc.stderr else ''
+        returncode = self._wait(proc)
+        if returncode != 0:
+            raise RuntimeError(f"ffmpeg failed with code {returncode}: {stderr.strip()}")
+
+    def _wait(self, proc: subprocess.Popen) -> int:
+        """Reap ffmpeg, recording its CPU time where the platform reports it.
+
+        Args:
+            proc: ffmpeg process
+
+        Returns:
+            ffmpeg's exit code
+        """
+        if not hasattr(os, 'wait4'):
+            return proc.wait()
+        _, status, usage = os.wait4(proc.pid, 0)
+        proc.returncode = os.waitstatus_to_exitcode(status)
+        self.cpu_seconds = usage.ru_utime + usage.ru_stime
+        return proc.returncode
+
+    def abort(self) -> None:
+        """Kill the ffmpeg process without waiting for a clean finish."""
+        if self._proc is None:
+            return
+        proc = self._proc
+        self._proc = None
+        proc.kill()
+        proc.wait()
+
+    def _read_stderr(self) -> str:
+        if self._proc is None or self._proc.stderr is None:
+            return ''
+        return self._proc.stderr.read().decode(errors='replace').strip()
+
+    def __enter__(self) -> 'FFmpegPipeWriter':
+        return self.open()
+
+    def __exit__(self, exc_type: Any, exc: Any, tb: Any) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
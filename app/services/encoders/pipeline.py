@@ -0,0 +1,225 @@
+"""Render/encode pipeline: frames handed to the encoder on its own thread.
+
+Without it, the render loop blocks on every pipe write while ffmpeg
+drains its input, and ffmpeg waits while the next frame renders. The
+pipeline decouples the two with a bounded ring of frame buffers: the
+render thread fills free buffers (effects write into them directly, as
+with a FramePool) and queues them; an encode thread writes queued frames
+to the FFmpegPipeWriter and hands the buffers back. OpenCV, numpy copies
+and pipe writes release the GIL, so both sides progress concurrently on
+multi-core hosts.
+"""
+
+import queue
+import threading
+import time
+from types import TracebackType
+from typing import Callable, Optional, Tuple, Type
+
+import numpy as np
+
+from app.core.logging import get_logger
+from app.services.encoders.ffmpeg_pipe import FFmpegPipeWriter
+from app.services.stage_timings import (
+    ENCODE_STAGE,
+    ENCODE_WAITING_ON_RENDER,
+    RENDER_WAITING_ON_ENCODE,
+    StageTimings,
+)
+
+logger = get_logger(__name__)
+
+# Frame buffers in flight between the render and encode threads
+DEFAULT_PIPELINE_DEPTH = 4
+
+# Seconds between checks that the encode thread is alive while waiting for a buffer
+FREE_BUFFER_POLL_SECONDS = 0.1
+
+
+class FramePipeline:
+    """Bounded frame queue between the render loop and an ffmpeg writer.
+
+    Exposes the writer interface used by ``write_segment`` (write_frame,
+    write_repeated, frames_written) and the FramePool interface (acquire).
+    A buffer obtained from acquire() is queued without copying when it is
+    the frame passed to the next write; any other frame is copied into a
+    free buffer, so callers may reuse their own arrays right away.
+
+    Usage:
+        with writer, FramePipeline(writer, resolution) as pipeline:
+            write_segment(segment, pipeline, resolution, pipeline)
+    """
+
+    def __init__(self,
+                 writer: FFmpegPipeWriter,
+                 resolution: Tuple[int, int],
+                 depth: int = DEFAULT_PIPELINE_DEPTH,
+                 on_frames: Optional[Callable[[int], None]] = None):
+        """Initialize the pipeline (the encode thread is started by open()).
+
+        Args:
+            writer: Open ffmpeg writer, only used from the encode thread
+            resolution: Frame size (width, height)
+            depth: Number of frame buffers in flight
+            on_frames: Optional callable receiving the number of frames
+                encoded so far, called from the encode thread after each write
+        """
+        self.writer = writer
+        self.on_frames = on_frames
+        width, height = resolution
+        self._free: "queue.Queue[np.ndarray]" = queue.Queue()
+        for _ in range(max(1, depth)):
+            self._free.put(np.empty((height, width, 3), dtype=np.uint8))
+        # Queued (buffer, count) items, None to stop
+        self._queued: "queue.Queue[Optional[Tuple[np.ndarray, int]]]" = queue.Queue()
+        self._acquired: Optional[np.ndarray] = None
+        self._thread: Optional[threading.Thread] = None
+        self._error: Optional[BaseException] = None
+        self.frames_written = 0
+        self.frames_encoded = 0
+        # Render thread blocked waiting for a free buffer
+        self.render_wait_seconds = 0.0
+        # Encode thread: blocked waiting for a frame / busy writing
+        self.encode_wait_seconds = 0.0
+        self.encode_seconds = 0.0
+        self.encode_cpu_seconds = 0.0
+
+    def open(self) -> 'FramePipeline':
+        """Start the encode thread.
+
+        Returns:
+            The pipeline itself
+        """
+        self._thread = threading.Thread(target=self._encode_loop, name='encode', daemon=True)
+        self._thread.start()
+        return self
+
+    def acquire(self) -> np.ndarray:
+        """Free buffer to render the next frame into.
+
+        Returns:
+            (height, width, 3) uint8 buffer with undefined content, owned by
+            the caller until the next write
+
+        Raises:
+            RuntimeError: If the encode thread stopped before freeing a buffer
+        """
+        if self._acquired is None:
+            self._acquired = self._take_free()
+        return self._acquired
+
+    def write_frame(self, frame: np.ndarray) -> None:
+        """Queue one RGB frame.
+
+        Args:
+            frame: RGB frame at the output resolution
+
+        Raises:
+            RuntimeError: If the encoder has failed
+        """
+        self.write_repeated(frame, 1)
+
+    def write_repeated(self, frame: np.ndarray, count: int) -> None:
+        """Queue the same RGB frame to be encoded several times.
+
+        Args:
+            frame: RGB frame at the output resolution
+            count: Number of times the frame is encoded
+
+        Raises:
+            RuntimeError: If the encoder has failed
+        """
+        self._raise_error()
+        buffer = self.acquire()
+        self._acquired = None
+        if frame is not buffer:
+            np.copyto(buffer, frame)
+        self._queued.put((buffer, count))
+        self.frames_written += count
+
+    def close(self) -> None:
+        """Wait until every queued frame is encoded and stop the encode thread.
+
+        Raises:
+            RuntimeError: If the encoder failed
+        """
+        if self._thread is None:
+            return
+        self._queued.put(None)
+        self._thread.join()
+        self._thread = None
+        self._raise_error()
+
+    def add_timings(self, timings: StageTimings) -> None:
+        """Charge the encode thread's work and the stalls to render timings.
+
+        Args:
+            timings: Stage timings of the render (call once closed)
+        """
+        timings.add(ENCODE_STAGE, self.encode_seconds, self.encode_cpu_seconds)
+        timings.stall(RENDER_WAITING_ON_ENCODE, self.render_wait_seconds)
+        timings.stall(ENCODE_WAITING_ON_RENDER, self.encode_wait_seconds)
+
+    def _take_free(self) -> np.ndarray:
+        """Wait for a free buffer, counting the time as a render stall.
+
+        Raises:
+            RuntimeError: If the encode thread stopped (or was never started)
+                while every buffer is queued, so none will be freed
+        """
+        started = time.perf_counter()
+        try:
+            while True:
+                try:
+                    return self._free.get(timeout=FREE_BUFFER_POLL_SECONDS)
+                except queue.Empty:
+                    if self._thread is None or not self._thread.is_alive():
+                        self._raise_error()
+                        raise RuntimeError("Encoding thread stopped")
+        finally:
+            self.render_wait_seconds += time.perf_counter() - started
+
+    def _encode_loop(self) -> None:
+        """Encode thread: write queued frames until the stop marker."""
+        cpu_started = time.thread_time()
+        while True:
+            started = time.perf_counter()
+            item = self._queued.get()
+            written = time.perf_counter()
+            self.encode_wait_seconds += written - started
+            if item is None:
+                break
+            buffer, count = item
+            # After a failure, keep draining so the render thread never blocks
+            if self._error is None:
+                try:
+                    self.writer.write_repeated(buffer, count)
+                    self.frames_encoded += count
+                    if self.on_frames:
+                        self.on_frames(self.frames_encoded)
+                except BaseException as e:
+                    logger.error(f"Encoder failed: {e}")
+                    self._error = e
+            self._free.put(buffer)
+            self.encode_seconds += time.perf_counter() - written
+        self.encode_cpu_seconds = time.thread_time() - cpu_started
+
+    def _raise_error(self) -> None:
+        if self._error is not None:
+            raise RuntimeError(f"Encoding failed: {self._error}") from self._error
+
+    def __enter__(self) -> 'FramePipeline':
+        return self.open()
+
+    def __exit__(self,
+                 exc_type: Optional[Type[BaseException]],
+                 exc_val: Optional[BaseException],
+                 exc_tb: Optional[TracebackType]) -> None:
+        if exc_type is None:
+            self.close()
+            return
+        # Render failed: stop the encode thread, leaving the error to propagate
+        try:
+            self.close()
+        except RuntimeError:
+            pass
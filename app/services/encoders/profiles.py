@@ -0,0 +1,104 @@
+"""Named x264 encoder profiles.
+
+Run ``python benchmark_encoder_profiles.py`` for the measured speed and
+size of each profile.
+"""
+
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+
+@dataclass(frozen=True)
+class EncoderProfile:
+    """x264 settings applied by every encoder backend."""
+
+    name: str
+    preset: str
+    crf: int
+    keyint_seconds: Optional[float] = None  # GOP length (None = x264 default)
+    resolution_scale: float = 1.0  # Internal render resolution relative to the requested one
+    description: str = ""
+
+    def ffmpeg_params(self, fps: int) -> List[str]:
+        """ffmpeg output arguments of the profile (besides codec and preset).
+
+        Args:
+            fps: Frames per second of the output video
+
+        Returns:
+            ffmpeg arguments
+        """
+        params = ['-crf', str(self.crf)]
+        if self.keyint_seconds:
+            params.extend(['-g', str(max(1, round(self.keyint_seconds * fps)))])
+        return params
+
+    def scaled_resolution(self, resolution: Tuple[int, int]) -> Tuple[int, int]:
+        """Internal render resolution for a requested output resolution.
+
+        Args:
+            resolution: Requested resolution (width, height)
+
+        Returns:
+            Scaled resolution, rounded down to even dimensions for yuv420p
+        """
+        if self.resolution_scale == 1.0:
+            return resolution
+        width, height = resolution
+        return (
+            max(2, int(width * self.resolution_scale) // 2 * 2),
+            max(2, int(height * self.resolution_scale) // 2 * 2),
+        )
+
+
+ENCODER_PROFILES: Dict[str, EncoderProfile] = {
+    profile.name: profile
+    for profile in (
+        EncoderProfile(
+            name='draft',
+            preset='ultrafast',
+            crf=28,
+            keyint_seconds=2.0,
+            resolution_scale=0.5,
+            description="Preview turnaround: half resolution, ultrafast preset",
+        ),
+        EncoderProfile(
+            name='standard',
+            preset='medium',
+            crf=23,
+            description="x264 defaults (medium preset, CRF 23)",
+        ),
+        EncoderProfile(
+            name='archival',
+            preset='slow',
+            crf=18,
+            description="Visually lossless master, slow preset",
+        ),
+        EncoderProfile(
+            name='still_heavy',
+            preset='fast',
+            crf=23,
+            keyint_seconds=10.0,
+            description="Slideshows dominated by static holds: fast preset, 10 s GOP",
+        ),
+    )
+}
+
+
+def get_encoder_profile(name: str) -> EncoderProfile:
+    """Get an encoder profile by name.
+
+    Args:
+        name: Profile name
+
+    Returns:
+        The encoder profile
+
+    Raises:
+        ValueError: If the profile is unknown
+    """
+    if name not in ENCODER_PROFILES:
+        raise ValueError(
+            f"Unknown encoder profile '{name}'. Available: {list(ENCODER_PROFILES)}"
+        )
+    return ENCODER_PROFILES[name]
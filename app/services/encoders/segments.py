@@ -0,0 +1,284 @@
+"""Per-segment frame generation, encoding and stream-copy concatenation.
+
+Segments are the effect and transition pieces of the timeline plan (see
+``app.services.timeline``) with their source frames attached by
+``VideoGeneratorService._prepare_segment``. Each one can be encoded on its
+own (closed GOP, so every piece starts with an IDR frame) and the pieces
+joined afterwards with ffmpeg's concat demuxer without re-encoding.
+"""
+
+import os
+import subprocess
+import tempfile
+from typing import Callable, Iterator, List, Optional, Tuple, Union
+
+import numpy as np
+from moviepy.config import FFMPEG_BINARY
+
+from app.services.encoders.ffmpeg_pipe import FFmpegPipeWriter
+from app.services.encoders.pipeline import FramePipeline
+from app.services.encoders.profiles import ENCODER_PROFILES, EncoderProfile
+from app.services.frame_pool import FramePool
+from app.services.frame_workers import FrameWorkers
+from app.services.stage_timings import ENCODE_STAGE, StageTimings, stage_name
+from app.services.timeline import frame_progresses
+
+# Every segment must start on a keyframe and never reference frames of
+# its neighbours, otherwise the concat demuxer cannot stream-copy it.
+CLOSED_GOP_PARAMS = ['-flags', '+cgop']
+
+
+def segment_encoding(profile: EncoderProfile, fps: int) -> dict:
+    """Encoder settings shared by every segment of a render.
+
+    Pieces joined by stream copy (including ones reused from the segment
+    cache) must be encoded identically, so these settings are also part of
+    the segment cache keys.
+
+    Args:
+        profile: Encoder profile of the render
+        fps: Frames per second
+
+    Returns:
+        Dictionary with 'codec', 'preset' and 'ffmpeg_params'
+    """
+    return {
+        'codec': 'libx264',
+        'preset': profile.preset,
+        'ffmpeg_params': CLOSED_GOP_PARAMS + profile.ffmpeg_params(fps),
+    }
+
+
+def is_static_segment(segment: dict) -> bool:
+    """Whether every frame of a segment is identical.
+
+    Args:
+        segment: Effect or transition segment dictionary
+
+    Returns:
+        True for effect segments whose effect ignores progress
+    """
+    return segment['kind'] == 'effect' and segment['effect'].is_progress_invariant()
+
+
+def static_segment_frame(segment: dict, resolution: Tuple[int, int]) -> np.ndarray:
+    """Render the single frame held during a static segment.
+
+    Args:
+        segment: Static effect segment dictionary
+        resolution: Output resolution (width, height)
+
+    Returns:
+        RGB frame at the output resolution
+    """
+    effect = segment['effect']
+    return effect.apply(effect.prepare(segment['frame'], resolution), 0.0, resolution)
+
+
+def write_segment(segment: dict,
+                  writer: Union[FFmpegPipeWriter, FramePipeline],
+                  resolution: Tuple[int, int],
+                  pool: Optional[Union[FramePool, FramePipeline]] = None,
+                  on_frames: Optional[Callable[[int], None]] = None,
+                  timings: Optional[StageTimings] = None,
+                  write_stage: str = ENCODE_STAGE,
+                  workers: Optional[FrameWorkers] = None) -> None:
+    """Stream one segment into an open writer.
+
+    Static holds are rendered once and the same bytes written repeatedly.
+
+    Args:
+        segment: Effect or transition segment dictionary
+        writer: Open ffmpeg writer, or a FramePipeline feeding one
+        resolution: Output resolution (width, height)
+        pool: Optional frame pool providing the output buffers
+        on_frames: Optional callable receiving the writer's total frame
+            count after each write
+        timings: Optional stage timings charged with the rendering (effect
+            or transition stage) and the writes
+        write_stage: Stage charged with the writes (QUEUE_STAGE when the
+            writer is a FramePipeline, whose encode thread is timed apart)
+        workers: Optional thread pool rendering effect frames ahead (their
+            CPU time is charged to the segment's stage)
+    """
+    stage = segment_stage(segment)
+
+    if is_static_segment(segment):
+        started = StageTimings.start()
+        frame = static_segment_frame(segment, resolution)
+        if timings is not None:
+            started = timings.lap(stage, started, segment['frame_count'])
+        writer.write_repeated(frame, segment['frame_count'])
+        if on_frames:
+            on_frames(writer.frames_written)
+        if timings is not None:
+            timings.lap(write_stage, started)
+        return
+
+    frames = iter_segment_frames(segment, resolution, pool, workers)
+    if timings is None:
+        for frame in frames:
+            writer.write_frame(frame)
+            if on_frames:
+                on_frames(writer.frames_written)
+        return
+
+    started = timings.start()
+    for frame in frames:
+        started = timings.lap(stage, started, 1)
+        writer.write_frame(frame)
+        if on_frames:
+            on_frames(writer.frames_written)
+        started = timings.lap(write_stage, started)
+    if workers is not None:
+        timings.add(stage, cpu=workers.take_cpu_seconds())
+
+
+def segment_stage(segment: dict) -> str:
+    """Timing stage of a segment's rendering.
+
+    Args:
+        segment: Effect or transition segment dictionary
+
+    Returns:
+        Stage name, e.g. 'effect.PanEffect' or 'transition.BlurZoomTransition'
+    """
+    return stage_name(segment['kind'], segment[segment['kind']])
+
+
+def iter_segment_frames(segment: dict,
+                        resolution: Tuple[int, int],
+                        pool: Optional[Union[FramePool, FramePipeline]] = None,
+                        workers: Optional[FrameWorkers] = None) -> Iterator[np.ndarray]:
+    """Yield the frames of one timeline segment.
+
+    Effect frames are rendered ahead by ``workers`` when given. Other
+    frames are written into buffers of ``pool`` when given: a yielded frame
+    may be a reused buffer and is only valid until the next frame is
+    requested.
+
+    Args:
+        segment: Effect or transition segment dictionary
+        resolution: Output resolution (width, height)
+        pool: Optional frame pool providing the output buffers
+        workers: Optional thread pool rendering effect frames concurrently
+
+    Yields:
+        RGB frames at the output resolution
+    """
+    progresses = frame_progresses(segment['frame_count'])
+
+    if segment['kind'] == 'effect':
+        effect = segment['effect']
+        # Progress-independent work (e.g. a pan's cover-fit), once per segment
+        source = effect.prepare(segment['frame'], resolution)
+        if workers is not None:
+            yield from workers.iter_effect_frames(effect, source, progresses, resolution)
+            return
+        for progress in progresses:
+            out = pool.acquire() if pool is not None else None
+            yield effect.apply(source, float(progress), resolution, out=out)
+        return
+
+    transition = segment['transition']
+    for progress in progresses:
+        out = pool.acquire() if pool is not None else None
+        yield transition.apply(segment['frame1'], segment['frame2'], float(progress), out=out)
+
+
+def encode_segment(segment: dict,
+                   output_path: str,
+                   fps: int,
+                   resolution: Tuple[int, int],
+                   threads: Optional[int] = None,
+                   encoding: Optional[dict] = None,
+                   collect_timings: bool = False) -> Optional[dict]:
+    """Encode a single segment to its own closed-GOP video file.
+
+    Runs inside process pool workers, so it only takes picklable arguments.
+
+    Args:
+        segment: Effect or transition segment dictionary
+        output_path: Path of the segment file
+        fps: Frames per second
+        resolution: Output resolution (width, height)
+        threads: Encoder threads for this segment (None = ffmpeg default)
+        encoding: Settings from segment_encoding() (default: 'standard' profile)
+        collect_timings: Whether to measure the rendering and encoding stages
+
+    Returns:
+        StageTimings.summary() of the segment when collect_timings is set,
+        else None
+    """
+    if encoding is None:
+        encoding = segment_encoding(ENCODER_PROFILES['standard'], fps)
+    params = list(encoding['ffmpeg_params'])
+    if threads is not None:
+        params.extend(['-threads', str(threads)])
+    timings = StageTimings() if collect_timings else None
+
+    if is_static_segment(segment):
+        # Pipe the hold frame once and let ffmpeg repeat it
+        params.extend(['-vf', f"loop=loop={segment['frame_count'] - 1}:size=1:start=0"])
+        writer = FFmpegPipeWriter(output_path, fps=fps, resolution=resolution,
+                                  codec=encoding['codec'], preset=encoding['preset'],
+                                  ffmpeg_params=params)
+        with writer:
+            started = StageTimings.start()
+            frame = static_segment_frame(segment, resolution)
+            if timings is not None:
+                started = timings.lap(segment_stage(segment), started, segment['frame_count'])
+            writer.write_frame(frame)
+    else:
+        writer = FFmpegPipeWriter(output_path, fps=fps, resolution=resolution,
+                                  codec=encoding['codec'], preset=encoding['preset'],
+                                  ffmpeg_params=params)
+        with writer:
+            write_segment(segment, writer, resolution, FramePool(resolution), timings=timings)
+            started = StageTimings.start()
+
+    if timings is None:
+        return None
+    # Flush and wait for ffmpeg (on exiting the writer), plus ffmpeg's own CPU
+    timings.lap(ENCODE_STAGE, started)
+    timings.add(ENCODE_STAGE, cpu=writer.cpu_seconds or 0.0, frames=segment['frame_count'])
+    return timings.summary()
+
+
+def concat_segment_files(segment_paths: List[str], output_path: str) -> None:
+    """Join encoded segments with the concat demuxer (stream copy).
+
+    Args:
+        segment_paths: Segment files, in playback order
+        output_path: Path of the final video
+
+    Raises:
+        RuntimeError: If ffmpeg fails
+    """
+    fd, list_path = tempfile.mkstemp(suffix='.txt', prefix='segments_')
+    with os.fdopen(fd, 'w') as list_file:
+        for path in segment_paths:
+            escaped = os.path.abspath(path).replace("'", "'\\''")
+            list_file.write(f"file '{escaped}'\n")
+
+    cmd = [
+        FFMPEG_BINARY,
+        '-y',
+        '-loglevel', 'error',
+        '-f', 'concat',
+        '-safe', '0',
+        '-i', list_path,
+        '-c', 'copy',
+        '-movflags', '+faststart',
+        output_path,
+    ]
+    try:
+        result = subprocess.run(cmd, capture_output=True)
+    finally:
+        os.remove(list_path)
+
+    if result.returncode != 0:
+        raise RuntimeError(
+            f"ffmpeg concat failed with code {result.returncode}: "
+            f"{result.stderr.decode(errors='replace').strip()}"
+        )
@@ -0,0 +1,44 @@
+"""Preallocated output frame buffers for the render loop."""
+
+from typing import List, Tuple
+
+import numpy as np
+
+
+class FramePool:
+    """Ring of preallocated RGB frames sized to the output resolution.
+
+    Effects and transitions write into buffers taken from the pool through
+    their ``out`` parameter, so the hot loop runs without allocating a new
+    frame per tick. A buffer returned by acquire() is recycled after
+    ``size`` further acquisitions: consumers must be done with it by then
+    (the encoders write each frame before the next one is rendered).
+    """
+
+    def __init__(self, resolution: Tuple[int, int], size: int = 2):
+        """Allocate the pool.
+
+        Args:
+            resolution: Frame size (width, height)
+            size: Number of buffers in the ring
+        """
+        width, height = resolution
+        self._buffers: List[np.ndarray] = [
+            np.empty((height, width, 3), dtype=np.uint8) for _ in range(size)
+        ]
+        self._next = 0
+
+    def acquire(self) -> np.ndarray:
+        """Return the next buffer of the ring.
+
+        Returns:
+            (height, width, 3) uint8 buffer with undefined content
+        """
+        buffer = self._buffers[self._next]
+        self._next = (self._next + 1) % len(self._buffers)
+        return buffer
+
+    @property
+    def nbytes(self) -> int:
+        """Total memory held by the pool, in bytes."""
+        return sum(buffer.nbytes for buffer in self._buffers)
@@ -0,0 +1,135 @@
+"""Ordered multi-threaded rendering of the frames of an effect segment."""
+
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from types import TracebackType
+from typing import Deque, Iterator, Optional, Tuple, Type
+
+import cv2
+import numpy as np
+
+from app.services.effects.base import EffectBase
+
+
+def limit_opencv_threads() -> None:
+    """Keep OpenCV calls single-threaded on the calling worker.
+
+    Renders are already parallel (render slots, frame threads, segment
+    processes) and sized to the CPUs: OpenCV's own thread pool would only
+    oversubscribe them. Used as the initializer of every render pool.
+    """
+    cv2.setNumThreads(1)
+
+
+class FrameWorkers:
+    """Thread pool rendering frames k..k+window of a segment concurrently.
+
+    Each effect frame only depends on the source and its progress value,
+    and the OpenCV calls doing the work (resize, warpAffine) release the
+    GIL, so consecutive frames render in parallel. Frames are yielded in
+    order, into a private ring of ``window + 1`` buffers: a yielded frame
+    is valid until the next one is requested, as with a FramePool.
+
+    Worker CPU time is accumulated so it can be charged to the render
+    stage timings (see take_cpu_seconds).
+    """
+
+    def __init__(self, threads: int, window: Optional[int] = None):
+        """Start the pool.
+
+        Args:
+            threads: Number of render threads
+            window: Frames rendered ahead of the consumer (default: 2 per thread)
+        """
+        self.threads = threads
+        self.window = window or 2 * threads
+        self._executor = ThreadPoolExecutor(max_workers=threads, thread_name_prefix='frames',
+                                            initializer=limit_opencv_threads)
+        self._cpu_lock = threading.Lock()
+        self._cpu_seconds = 0.0
+
+    def iter_effect_frames(self,
+                           effect: EffectBase,
+                           source: np.ndarray,
+                           progresses: np.ndarray,
+                           resolution: Tuple[int, int]) -> Iterator[np.ndarray]:
+        """Yield the frames of an effect segment, rendered ahead in the pool.
+
+        Args:
+            effect: Effect of the segment
+            source: Source frame of the image, already passed through
+                effect.prepare()
+            progresses: Progress value of every frame (see frame_progresses)
+            resolution: Output resolution (width, height)
+
+        Yields:
+            RGB frames at the output resolution, in order
+        """
+        width, height = resolution
+        buffers = [
+            np.empty((height, width, 3), dtype=np.uint8)
+            for _ in range(min(self.window, len(progresses)) + 1)
+        ]
+
+        def submit(index: int) -> Future:
+            return self._executor.submit(
+                self._render, effect, source, float(progresses[index]), resolution,
+                buffers[index % len(buffers)]
+            )
+
+        in_flight: Deque[Future] = deque(submit(index) for index in range(len(buffers) - 1))
+        next_index = len(in_flight)
+        try:
+            while in_flight:
+                frame = in_flight.popleft().result()
+                yield frame
+                # The consumer is done with the previous frame: its buffer is free
+                if next_index < len(progresses):
+                    in_flight.append(submit(next_index))
+                    next_index += 1
+        finally:
+            # Abandoned midway (seek, error): never leave writers on the buffers
+            for future in in_flight:
+                future.cancel()
+            for future in in_flight:
+                if not future.cancelled():
+                    future.exception()
+
+    def take_cpu_seconds(self) -> float:
+        """CPU time used by the workers since the previous call.
+
+        Returns:
+            CPU seconds summed over the worker threads
+        """
+        with self._cpu_lock:
+            seconds, self._cpu_seconds = self._cpu_seconds, 0.0
+        return seconds
+
+    def close(self) -> None:
+        """Stop the worker threads."""
+        self._executor.shutdown(wait=True, cancel_futures=True)
+
+    def __enter__(self) -> 'FrameWorkers':
+        return self
+
+    def __exit__(self,
+                 exc_type: Optional[Type[BaseException]],
+                 exc_val: Optional[BaseException],
+                 exc_tb: Optional[TracebackType]) -> None:
+        self.close()
+
+    def _render(self,
+                effect: EffectBase,
+                source: np.ndarray,
+                progress: float,
+                resolution: Tuple[int, int],
+                out: np.ndarray) -> np.ndarray:
+        """Render one frame in a worker thread, counting its CPU time."""
+        started = time.thread_time()
+        frame = effect.apply(source, progress, resolution, out=out)
+        elapsed = time.thread_time() - started
+        with self._cpu_lock:
+            self._cpu_seconds += elapsed
+        return frame
@@ -0,0 +1,103 @@
+"""Periodic persistence of render job state to MongoDB."""
+
+import asyncio
+import time
+from typing import Optional
+
+from app.core.logging import get_logger
+from app.repositories.render_job_repository import RenderJobRepository
+from app.services.render_jobs import RenderJobManager
+
+logger = get_logger(__name__)
+
+
+class RenderJobPersister:
+    """Flush changed render jobs to the repository at a fixed interval.
+
+    Render threads only flag jobs as changed; this task, running on the
+    event loop, writes every changed job in one bulk write per interval.
+    A job's request is written once, when the job is first stored.
+    Progress therefore costs at most one write per running job per
+    interval, whatever the frame rate.
+
+    Every third of the lease, the task also renews the lease of this
+    instance's unfinished jobs and fails the jobs of instances whose lease
+    has lapsed.
+    """
+
+    def __init__(self,
+                 manager: RenderJobManager,
+                 repository: RenderJobRepository,
+                 interval: float = 1.0,
+                 lease_seconds: float = 60.0):
+        """Initialize the persister.
+
+        Args:
+            manager: Render job manager to drain
+            repository: Render job repository
+            interval: Seconds between two flushes
+            lease_seconds: Job lease duration (see RenderJobRepository.mark_interrupted)
+        """
+        self.manager = manager
+        self.repository = repository
+        self.interval = interval
+        self.lease_seconds = lease_seconds
+        self._last_heartbeat = time.monotonic()
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        """Start tracking job changes and flushing them in the background."""
+        self.manager.track_changes = True
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the background task and write the pending changes."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
+        self.manager.track_changes = False
+
+    async def flush(self) -> None:
+        """Write the jobs changed since the previous flush.
+
+        Only the first write of a job carries its request; later writes
+        update its state and progress. Jobs are flagged again when the
+        write fails, so the next flush retries them.
+        """
+        jobs = self.manager.drain_dirty()
+        if not jobs:
+            return
+        try:
+            await self.repository.save_many(
+                [job.to_document(include_request=not job.persisted) for job in jobs]
+            )
+        except Exception:
+            self.manager.mark_dirty(jobs)
+            raise
+        for job in jobs:
+            job.persisted = True
+
+    async def heartbeat(self) -> None:
+        """Renew this instance's job leases and fail the stale jobs of others."""
+        await self.repository.heartbeat(self.manager.instance_id)
+        await self.repository.mark_interrupted(self.lease_seconds)
+
+    async def _run(self) -> None:
+        """Flush and heartbeat loop."""
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.flush()
+            except Exception as e:
+                logger.error(f"Failed to persist render jobs: {e}")
+            if time.monotonic() - self._last_heartbeat >= self.lease_seconds / 3:
+                self._last_heartbeat = time.monotonic()
+                try:
+                    await self.heartbeat()
+                except Exception as e:
+                    logger.error(f"Failed to renew render job leases: {e}")
@@ -0,0 +1,465 @@
+"""Render jobs executed in a bounded worker pool, off the event loop."""
+
+import math
+import os
+import socket
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime
+from functools import lru_cache
+from typing import Iterable, List, Optional, Tuple
+
+from app.core import metrics
+from app.core.config import settings
+from app.core.logging import get_logger
+from app.helpers.datetime_utils import now_utc
+from app.models.video_models import RenderJobState, VideoRequest
+from app.services.frame_workers import limit_opencv_threads
+from app.services.video_generator_service import RenderProgress, VideoGeneratorService
+
+logger = get_logger(__name__)
+
+# Minimum interval between two render speed samples, in seconds
+FPS_SAMPLE_INTERVAL = 0.5
+
+
+@dataclass
+class RenderJob:
+    """A video generation request and its execution state."""
+
+    job_id: str
+    request: VideoRequest
+    owner: Optional[str] = None
+    state: RenderJobState = "queued"
+    frames_done: int = 0
+    total_frames: Optional[int] = None
+    segment_index: Optional[int] = None
+    segment_count: Optional[int] = None
+    segment_kind: Optional[str] = None
+    segment_name: Optional[str] = None
+    fps: Optional[float] = None
+    eta_seconds: Optional[float] = None
+    created_at: datetime = field(default_factory=now_utc)
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    result: Optional[dict] = None
+    error: Optional[str] = None
+    queue_position: int = 0
+    future: Optional[Future] = field(default=None, repr=False)
+    # Whether the job (and its request) has been written to the job store
+    persisted: bool = field(default=False, repr=False)
+    _fps_sample: Optional[Tuple[float, int]] = field(default=None, repr=False)
+
+    def update_progress(self, progress: RenderProgress) -> None:
+        """Record a progress event from the render loop.
+
+        The render speed is measured over the last FPS_SAMPLE_INTERVAL
+        seconds and the ETA extrapolated from it.
+
+        Args:
+            progress: Progress reported by VideoGeneratorService
+        """
+        now = time.monotonic()
+        if self._fps_sample is None:
+            self._fps_sample = (now, 0)
+        sample_time, sample_frames = self._fps_sample
+        elapsed = now - sample_time
+        if elapsed >= FPS_SAMPLE_INTERVAL:
+            self.fps = (progress.frames_done - sample_frames) / elapsed
+            self._fps_sample = (now, progress.frames_done)
+            remaining = progress.total_frames - progress.frames_done
+            self.eta_seconds = remaining / self.fps if self.fps > 0 else None
+
+        self.frames_done = progress.frames_done
+        self.total_frames = progress.total_frames
+        self.segment_index = progress.segment_index
+        self.segment_count = progress.segment_count
+        self.segment_kind = progress.segment_kind
+        self.segment_name = progress.segment_name
+
+    @property
+    def progress(self) -> float:
+        """Fraction of frames encoded (1.0 once the job has succeeded)."""
+        if self.state == "succeeded":
+            return 1.0
+        if not self.total_frames:
+            return 0.0
+        return min(1.0, self.frames_done / self.total_frames)
+
+    @property
+    def is_finished(self) -> bool:
+        """Whether the job has succeeded or failed."""
+        return self.state in ("succeeded", "failed")
+
+    def to_document(self, include_request: bool = True) -> dict:
+        """Serialize the job state (MongoDB document layout, ``_id`` = job ID).
+
+        Args:
+            include_request: Whether to include the full request spec
+
+        Returns:
+            Job document
+        """
+        now = now_utc()
+        document = {
+            "_id": self.job_id,
+            "owner": self.owner,
+            "state": self.state,
+            "progress": self.progress,
+            "frames_done": self.frames_done,
+            "total_frames": self.total_frames,
+            "segment_index": self.segment_index,
+            "segment_count": self.segment_count,
+            "segment_kind": self.segment_kind,
+            "segment_name": self.segment_name,
+            "fps": self.fps,
+            "eta_seconds": self.eta_seconds,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "updated_at": now,
+            "heartbeat_at": now,
+            "error": self.error,
+            "result": self.result,
+        }
+        if include_request:
+            document["request"] = self.request.model_dump(mode="json")
+        return document
+
+
+class RenderQueueFullError(Exception):
+    """Raised when every render slot is busy and the wait queue is full."""
+
+    def __init__(self, retry_after: int, queue: dict):
+        """Initialize the error.
+
+        Args:
+            retry_after: Suggested delay before retrying, in seconds
+            queue: Queue snapshot (see RenderJobManager.queue_stats)
+        """
+        self.retry_after = retry_after
+        self.queue = queue
+        super().__init__(
+            f"Render queue is full ({queue['running']} running, {queue['queued']} queued)"
+        )
+
+
+class RenderJobManager:
+    """Run render jobs in a fixed-size thread pool and track their state.
+
+    Rendering is CPU-bound work that blocks (OpenCV, numpy, ffmpeg
+    subprocesses), so it must never run on the event loop. At most
+    ``max_workers`` renders run at once and at most ``max_queued`` wait for
+    a slot; beyond that, submissions are rejected with RenderQueueFullError
+    so callers can shed load. Each render gets an equal share of the CPUs,
+    split between its frame render threads and its encoder threads, and
+    OpenCV runs single-threaded in every worker. Finished jobs are kept for
+    polling up to ``history_size``, oldest first out. Jobs are stamped with
+    the manager's ``instance_id`` so that instances sharing a job store only
+    renew (and, after a restart, fail) their own jobs.
+    """
+
+    def __init__(self,
+                 max_workers: int,
+                 max_queued: int = 8,
+                 history_size: int = 1000,
+                 default_retry_after: int = 10,
+                 frame_threads: int = 0,
+                 instance_id: Optional[str] = None):
+        """Initialize the manager.
+
+        Args:
+            max_workers: Number of renders running concurrently
+            max_queued: Number of jobs allowed to wait for a worker
+            history_size: Number of finished jobs kept in memory
+            default_retry_after: Retry-After hint (seconds) before any job has finished
+            frame_threads: Frame render threads per job, taken out of its CPU
+                share (0 = half of the share)
+            instance_id: Owner stamped on the jobs, unique per process
+                (default: host name, process ID and a random suffix)
+        """
+        self.max_workers = max_workers
+        self.max_queued = max_queued
+        self.history_size = history_size
+        self.default_retry_after = default_retry_after
+        self.instance_id = instance_id or f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        self.threads_per_job = max(1, (os.cpu_count() or 1) // max_workers)
+        # Half of the share renders frames, the rest encodes (see VideoGeneratorService)
+        self.frame_threads_per_job = frame_threads or max(1, self.threads_per_job // 2)
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="render",
+                                            initializer=limit_opencv_threads)
+        self._jobs: "OrderedDict[str, RenderJob]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._queued = 0
+        self._running = 0
+        self._average_duration: Optional[float] = None
+        # Changed job IDs, collected only while a persister drains them
+        self.track_changes = False
+        self._dirty: set = set()
+
+    def submit(self, request: VideoRequest) -> RenderJob:
+        """Queue a render job.
+
+        Args:
+            request: Video generation request
+
+        Returns:
+            The queued job; ``job.future`` completes with the generation result
+            or the exception raised by the render
+
+        Raises:
+            RenderQueueFullError: If all slots are busy and the queue is full
+        """
+        job = RenderJob(job_id=uuid.uuid4().hex, request=request, owner=self.instance_id)
+        with self._lock:
+            if self._running + self._queued >= self.max_workers + self.max_queued:
+                raise RenderQueueFullError(self._retry_after(), self._queue_stats())
+            self._queued += 1
+            # Jobs waiting ahead of this one, itself included (0 = a slot is free)
+            job.queue_position = max(0, self._running + self._queued - self.max_workers)
+            self._jobs[job.job_id] = job
+            self._touch(job.job_id)
+            self._prune()
+        job.future = self._executor.submit(self._run, job)
+        logger.info(f"Render job {job.job_id} queued ({len(request.images)} images)")
+        return job
+
+    def get(self, job_id: str) -> Optional[RenderJob]:
+        """Look up a job.
+
+        Args:
+            job_id: Job identifier
+
+        Returns:
+            The job, or None if unknown (or evicted from the history)
+        """
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def list(self,
+             state: Optional[str] = None,
+             limit: int = 50,
+             before: Optional[datetime] = None,
+             before_id: Optional[str] = None) -> List[RenderJob]:
+        """List the jobs held in memory, newest first.
+
+        Jobs are ordered by ``(created_at, job_id)``, the paging cursor of
+        RenderJobRepository.list.
+
+        Args:
+            state: Optional state filter
+            limit: Maximum number of jobs returned
+            before: Only return jobs created before this date
+            before_id: Job ID of the previous page's last job (see
+                RenderJobRepository.list)
+
+        Returns:
+            Render jobs
+        """
+        with self._lock:
+            jobs = [job for job in self._jobs.values() if state is None or job.state == state]
+        if before is not None:
+            jobs = [
+                job for job in jobs
+                if job.created_at < before
+                or (before_id is not None and job.created_at == before and job.job_id < before_id)
+            ]
+        jobs.sort(key=lambda job: (job.created_at, job.job_id), reverse=True)
+        return jobs[:limit]
+
+    def drain_dirty(self) -> List[RenderJob]:
+        """Take the jobs changed since the previous call.
+
+        Progress updates only flag a job, so a persister draining every
+        second writes each running job at most once per second.
+
+        Returns:
+            Changed jobs still held in memory
+        """
+        with self._lock:
+            dirty, self._dirty = self._dirty, set()
+            return [self._jobs[job_id] for job_id in dirty if job_id in self._jobs]
+
+    def mark_dirty(self, jobs: Iterable[RenderJob]) -> None:
+        """Flag jobs as changed (e.g. to retry a failed write).
+
+        Args:
+            jobs: Changed jobs
+        """
+        with self._lock:
+            self._dirty.update(job.job_id for job in jobs)
+
+    def queue_stats(self) -> dict:
+        """Snapshot of the render slots and wait queue.
+
+        Returns:
+            Dictionary with running/queued counts and their limits
+        """
+        with self._lock:
+            return self._queue_stats()
+
+    def shutdown(self) -> None:
+        """Stop accepting jobs and fail the queued ones.
+
+        Jobs still waiting for a slot will never run: they are marked failed
+        and flagged as changed, so the persister's last flush records them.
+        Running renders are left to finish.
+        """
+        with self._lock:
+            for job in self._jobs.values():
+                if job.state != "queued" or job.future is None or not job.future.cancel():
+                    continue
+                self._queued -= 1
+                job.error = "Canceled by a service shutdown"
+                job.finished_at = now_utc()
+                job.state = "failed"
+                self._touch(job.job_id)
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _run(self, job: RenderJob) -> dict:
+        """Execute a job in a worker thread.
+
+        Args:
+            job: Job to execute
+
+        Returns:
+            Generation result dictionary
+
+        Raises:
+            Exception: Whatever the render raised, after marking the job failed
+        """
+        with self._lock:
+            self._queued -= 1
+            self._running += 1
+            self._touch(job.job_id)
+        job.state = "running"
+        job.started_at = now_utc()
+        metrics.RENDER_QUEUE_WAIT_SECONDS.observe((job.started_at - job.created_at).total_seconds())
+        request = job.request
+
+        def on_progress(progress: RenderProgress) -> None:
+            job.update_progress(progress)
+            with self._lock:
+                self._touch(job.job_id)
+
+        try:
+            service = VideoGeneratorService(
+                fps=request.fps,
+                resolution=request.resolution,
+                transition_duration=0.5,  # Default transition duration
+                encoder=request.encoder,
+                threads=self.threads_per_job,
+                encoder_profile=request.encoder_profile,
+                collect_timings=settings.render_stage_timings,
+                source_lookahead=settings.render_source_lookahead,
+                pipeline_depth=settings.render_pipeline_depth,
+                frame_threads=self.frame_threads_per_job
+            )
+            job.result = service.generate_video(
+                images=request.images,
+                output_path=request.output_path,
+                transition_type=request.transition_type,
+                progress_callback=on_progress
+            )
+            job.eta_seconds = 0.0
+            job.finished_at = now_utc()
+            job.state = "succeeded"
+            metrics.observe_render(
+                (job.finished_at - job.started_at).total_seconds(),
+                len(request.images),
+                request.resolution,
+                request.encoder,
+                job.result.get('from_cache', False)
+            )
+            logger.info(f"Render job {job.job_id} succeeded")
+            return job.result
+        except Exception as e:
+            job.error = str(e)
+            job.finished_at = now_utc()
+            job.state = "failed"
+            metrics.observe_failed_render()
+            logger.error(f"Render job {job.job_id} failed: {e}")
+            raise
+        finally:
+            self._job_done(job)
+
+    def _job_done(self, job: RenderJob) -> None:
+        """Release the slot of a finished job and update the duration estimate.
+
+        Args:
+            job: Finished job
+        """
+        with self._lock:
+            self._running -= 1
+            self._touch(job.job_id)
+            if job.started_at is not None and job.finished_at is not None:
+                duration = (job.finished_at - job.started_at).total_seconds()
+                if self._average_duration is None:
+                    self._average_duration = duration
+                else:
+                    # Exponential moving average over recent jobs
+                    self._average_duration = 0.8 * self._average_duration + 0.2 * duration
+
+    def _touch(self, job_id: str) -> None:
+        """Flag a job as changed (lock held).
+
+        Args:
+            job_id: Job identifier
+        """
+        if self.track_changes:
+            self._dirty.add(job_id)
+
+    def _queue_stats(self) -> dict:
+        """Queue snapshot (lock held).
+
+        Returns:
+            Dictionary with running/queued counts and their limits
+        """
+        return {
+            "running": self._running,
+            "queued": self._queued,
+            "max_workers": self.max_workers,
+            "max_queued": self.max_queued,
+            "average_job_seconds": self._average_duration,
+        }
+
+    def _retry_after(self) -> int:
+        """Estimate when a slot frees up (lock held).
+
+        Returns:
+            Seconds until the waiting jobs have roughly drained
+        """
+        if self._average_duration is None:
+            return self.default_retry_after
+        waves = (self._queued + 1) / self.max_workers
+        return max(1, math.ceil(self._average_duration * waves))
+
+    def _prune(self) -> None:
+        """Drop the oldest finished jobs beyond the history size (lock held)."""
+        excess = len(self._jobs) - self.history_size
+        if excess <= 0:
+            return
+        for job_id in [job_id for job_id, job in self._jobs.items() if job.is_finished][:excess]:
+            if job_id not in self._dirty:
+                del self._jobs[job_id]
+
+
+@lru_cache
+def get_render_job_manager() -> RenderJobManager:
+    """Get the process-wide render job manager (singleton pattern).
+
+    Returns:
+        RenderJobManager sized by settings.render_max_workers
+    """
+    return RenderJobManager(
+        max_workers=settings.render_max_workers,
+        max_queued=settings.render_max_queued_jobs,
+        history_size=settings.render_job_history_size,
+        default_retry_after=settings.render_retry_after_seconds,
+        frame_threads=settings.render_frame_threads,
+        instance_id=settings.render_instance_id or None
+    )
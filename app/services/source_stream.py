@@ -0,0 +1,206 @@
+"""Source images of a render, decoded just ahead of the segments using them.
+
+Renderers walk the timeline plan in order, and each segment only reads the
+sources of one or two consecutive images. ``SourceStream`` decodes the next
+images on a background thread while the current segment renders, and drops
+its reference to an image once the last segment reading it has been
+prepared, so the frames it keeps alive stay bounded by the look-ahead
+rather than the number of images.
+"""
+
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from types import TracebackType
+from typing import Callable, Dict, Hashable, List, Optional, Set, Tuple, Type
+
+import numpy as np
+
+from app.models.video_models import ImageTimestamp
+from app.services.effects.base import EffectBase
+from app.services.stage_timings import RENDER_WAITING_ON_DECODE, StageTimings
+from app.services.timeline import TimelinePlan, TimelineSegment
+
+# Images decoded ahead of the one being rendered
+DEFAULT_LOOKAHEAD = 2
+
+# (image_path, effect, cache key, timings) -> (frame, from_cache)
+SourceLoader = Callable[[str, EffectBase, Hashable, Optional[StageTimings]], Tuple[np.ndarray, bool]]
+
+
+class SourceStream:
+    """Lazily loaded source frames of a timeline, one per image.
+
+    Images sharing a cache key (the same file used twice with effects
+    needing the same source) are loaded once. Frames of released images
+    are loaded again if asked for (e.g. when a renderer seeks backwards),
+    normally from the decoded image cache.
+
+    Background loads are timed on their own StageTimings, merged into the
+    render's timings by close(), along with the time spent waiting for
+    them (the RENDER_WAITING_ON_DECODE stall).
+    """
+
+    def __init__(self,
+                 plan: TimelinePlan,
+                 images: List[ImageTimestamp],
+                 make_key: Callable[[ImageTimestamp, EffectBase], Hashable],
+                 load_source: SourceLoader,
+                 lookahead: int = DEFAULT_LOOKAHEAD,
+                 timings: Optional[StageTimings] = None):
+        """Initialize the stream (nothing is loaded yet).
+
+        Args:
+            plan: Compiled timeline plan
+            images: List of ImageTimestamp objects, in plan order
+            make_key: Decoded image cache key of an image and its effect
+            load_source: Loads one source (see VideoGeneratorService._load_source)
+            lookahead: Number of images decoded ahead in the background
+                (0 loads every image synchronously, on first use)
+            timings: Optional stage timings charged with the loads
+        """
+        self.plan = plan
+        self.images = images
+        self.lookahead = lookahead
+        self.timings = timings
+        self._load_source = load_source
+        self._keys = [make_key(image, effect) for image, effect in zip(images, plan.effects)]
+
+        # Segments still to be prepared, per key
+        self._readers: Dict[Hashable, int] = {}
+        for segment in plan.segments:
+            for key in {self._keys[i] for i in segment.sources}:
+                self._readers[key] = self._readers.get(key, 0) + 1
+
+        self._frames: Dict[Hashable, Future] = {}
+        self._lock = threading.Lock()
+        self._executor = (
+            ThreadPoolExecutor(max_workers=1, thread_name_prefix='decode')
+            if lookahead > 0 else None
+        )
+        self._background_timings = StageTimings() if timings is not None else None
+        self._loaded: Set[Hashable] = set()
+        self.hits = 0
+        self.misses = 0
+        # Time frame() spent waiting for background loads
+        self.wait_seconds = 0.0
+
+    def frame(self, index: int) -> np.ndarray:
+        """Source frame of an image, waiting for its decode if needed.
+
+        Also schedules the background decode of the following images.
+
+        Args:
+            index: Image index
+
+        Returns:
+            Read-only source frame
+
+        Raises:
+            Exception: Whatever loading the image raised
+        """
+        key = self._keys[index]
+        with self._lock:
+            future = self._frames.get(key)
+        if future is None:
+            # Not scheduled ahead: load in the calling thread
+            future = Future()
+            try:
+                future.set_result(self._load(index, self.timings))
+            except Exception as e:
+                future.set_exception(e)
+            with self._lock:
+                future = self._frames.setdefault(key, future)
+
+        for ahead in range(index + 1, min(index + 1 + self.lookahead, len(self.images))):
+            self._schedule(ahead)
+        if future.done():
+            return future.result()
+        started = time.perf_counter()
+        try:
+            return future.result()
+        finally:
+            self.wait_seconds += time.perf_counter() - started
+
+    def release(self, segment: TimelineSegment) -> None:
+        """Mark a segment as prepared, dropping the images no other segment reads.
+
+        Call it once per segment of the plan, including segments that are
+        not rendered (e.g. reused from a cache), so that their images are
+        neither kept nor decoded ahead.
+
+        Args:
+            segment: Segment of the plan that no longer needs its sources
+        """
+        with self._lock:
+            for key in {self._keys[i] for i in segment.sources}:
+                self._readers[key] = self._readers.get(key, 0) - 1
+                if self._readers[key] <= 0:
+                    self._frames.pop(key, None)
+
+    def close(self) -> None:
+        """Stop background loads and release every frame."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+        with self._lock:
+            self._frames.clear()
+        if self.timings is not None and self._background_timings is not None:
+            self.timings.merge(self._background_timings.summary()['stages'])
+            self.timings.stall(RENDER_WAITING_ON_DECODE, self.wait_seconds)
+            self._background_timings = StageTimings()
+            self.wait_seconds = 0.0
+
+    def stats(self) -> dict:
+        """Decoded image cache statistics of the loads done so far.
+
+        Returns:
+            Dictionary with the cache 'hits' and 'misses' and the number of
+            'unique_images' loaded
+        """
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "unique_images": len(self._loaded)}
+
+    def __enter__(self) -> 'SourceStream':
+        return self
+
+    def __exit__(self,
+                 exc_type: Optional[Type[BaseException]],
+                 exc_val: Optional[BaseException],
+                 exc_tb: Optional[TracebackType]) -> None:
+        self.close()
+
+    def _schedule(self, index: int) -> None:
+        """Queue the background load of an image unless already loaded or unused.
+
+        Args:
+            index: Image index
+        """
+        if self._executor is None:
+            return
+        key = self._keys[index]
+        with self._lock:
+            if key in self._frames or self._readers.get(key, 0) <= 0:
+                return
+            self._frames[key] = self._executor.submit(self._load, index, self._background_timings)
+
+    def _load(self, index: int, timings: Optional[StageTimings]) -> np.ndarray:
+        """Load one image and count the cache hit or miss.
+
+        Args:
+            index: Image index
+            timings: Stage timings of the calling thread
+
+        Returns:
+            Source frame
+        """
+        key = self._keys[index]
+        image = self.images[index]
+        frame, cached = self._load_source(image.image_path, self.plan.effects[index], key, timings)
+        with self._lock:
+            if key not in self._loaded:
+                self._loaded.add(key)
+                if cached:
+                    self.hits += 1
+                else:
+                    self.misses += 1
+        return frame
@@ -0,0 +1,138 @@
+"""Per-stage wall and CPU time accounting for renders."""
+
+import time
+from typing import Dict, List, Optional, Tuple
+
+# (wall clock, thread CPU time) at the start of a measured interval
+Timestamp = Tuple[float, float]
+
+DECODE_STAGE = 'decode'
+ENCODE_STAGE = 'encode'
+CONCAT_STAGE = 'concat'
+# Handing frames to a pipelined encoder (copies, waits for a free buffer)
+QUEUE_STAGE = 'queue'
+
+# Pipeline stalls: time a stage spent blocked on a neighbouring stage
+RENDER_WAITING_ON_DECODE = 'render_waiting_on_decode'
+RENDER_WAITING_ON_ENCODE = 'render_waiting_on_encode'
+ENCODE_WAITING_ON_RENDER = 'encode_waiting_on_render'
+
+
+def stage_name(kind: str, instance: object) -> str:
+    """Stage name of an effect or transition (e.g. 'effect.PanEffect').
+
+    Args:
+        kind: 'effect' or 'transition'
+        instance: EffectBase or TransitionBase instance
+
+    Returns:
+        Stage name
+    """
+    return f"{kind}.{type(instance).__name__}"
+
+
+class StageTimings:
+    """Wall and CPU time accumulated per render stage.
+
+    Hot loops chain laps: ``lap()`` charges the time since the previous
+    timestamp to a stage and returns the new timestamp, so consecutive
+    stages are measured with one pair of clock reads (about a microsecond)
+    per switch. Code paths receive ``Optional[StageTimings]`` and skip all
+    per-frame measurement when it is None; ``start()`` is static, so once
+    per segment or render they may take a timestamp either way.
+
+    CPU time is the calling thread's, so concurrent renders in other
+    threads do not pollute it; work done by child processes (ffmpeg,
+    segment workers) is added explicitly with ``add()`` and ``merge()``.
+    """
+
+    def __init__(self) -> None:
+        # stage -> [wall seconds, cpu seconds, frames]
+        self._stages: Dict[str, List[float]] = {}
+        # stall -> wall seconds
+        self._stalls: Dict[str, float] = {}
+        self._started = time.perf_counter()
+
+    @staticmethod
+    def start() -> Timestamp:
+        """Current timestamp, to start a measured interval."""
+        return time.perf_counter(), time.thread_time()
+
+    def lap(self, stage: str, started: Timestamp, frames: int = 0) -> Timestamp:
+        """Charge the time elapsed since ``started`` to a stage.
+
+        Args:
+            stage: Stage name
+            started: Timestamp from start() or the previous lap()
+            frames: Frames produced by the stage during the interval
+
+        Returns:
+            Current timestamp, to chain the next interval
+        """
+        now = time.perf_counter(), time.thread_time()
+        totals = self._stages.get(stage)
+        if totals is None:
+            totals = self._stages[stage] = [0.0, 0.0, 0]
+        totals[0] += now[0] - started[0]
+        totals[1] += now[1] - started[1]
+        totals[2] += frames
+        return now
+
+    def add(self, stage: str, wall: float = 0.0, cpu: float = 0.0, frames: int = 0) -> None:
+        """Add time measured elsewhere (e.g. a child process) to a stage.
+
+        Args:
+            stage: Stage name
+            wall: Wall clock seconds
+            cpu: CPU seconds
+            frames: Frames produced by the stage
+        """
+        totals = self._stages.setdefault(stage, [0.0, 0.0, 0])
+        totals[0] += wall
+        totals[1] += cpu
+        totals[2] += frames
+
+    def stall(self, name: str, seconds: float) -> None:
+        """Add time a pipeline stage spent blocked on another one.
+
+        Stalls overlap the stage times (a render stage waiting for the
+        encoder is still charged for that wait): they tell which stage
+        holds the pipeline back.
+
+        Args:
+            name: Stall name (e.g. RENDER_WAITING_ON_ENCODE)
+            seconds: Wall clock seconds
+        """
+        self._stalls[name] = self._stalls.get(name, 0.0) + seconds
+
+    def merge(self, stages: Dict[str, dict]) -> None:
+        """Add the stages of another render (e.g. a segment worker's summary()).
+
+        Args:
+            stages: 'stages' mapping of a summary()
+        """
+        for stage, totals in stages.items():
+            self.add(stage, totals['wall_seconds'], totals['cpu_seconds'], totals['frames'])
+
+    def summary(self) -> dict:
+        """Timings report, as returned in the generation result.
+
+        Returns:
+            Dictionary with 'total_seconds' (wall time since creation),
+            'stages' mapping each stage to its 'wall_seconds', 'cpu_seconds',
+            'frames' and 'fps' (frames per wall second, None without frames),
+            and 'stalls' mapping each pipeline stall to its wall seconds
+        """
+        stages = {}
+        for stage, (wall, cpu, frames) in sorted(self._stages.items()):
+            stages[stage] = {
+                'wall_seconds': round(wall, 4),
+                'cpu_seconds': round(cpu, 4),
+                'frames': int(frames),
+                'fps': round(frames / wall, 1) if frames and wall > 0 else None,
+            }
+        return {
+            'total_seconds': round(time.perf_counter() - self._started, 4),
+            'stages': stages,
+            'stalls': {name: round(seconds, 4) for name, seconds in sorted(self._stalls.items())},
+        }
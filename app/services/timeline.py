@@ -0,0 +1,237 @@
+"""Compiled timeline plan: frame-exact segment layout of a video.
+
+A ``TimelinePlan`` is built once per request from the ``ImageTimestamp``
+list. It resolves every effect and transition instance and places each
+segment on whole frames at the output fps. Renderers, previews and the
+progress reporting all read the same plan.
+"""
+
+import bisect
+import itertools
+import math
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from app.core.logging import get_logger
+from app.models.video_models import ImageTimestamp
+from app.services.effects.base import EffectBase
+from app.services.effects.registry import EffectRegistry
+from app.services.transitions.base import TransitionBase
+from app.services.transitions.registry import TransitionRegistry
+
+logger = get_logger(__name__)
+
+# Display time of a single image with no following timestamp, in seconds
+DEFAULT_IMAGE_DURATION = 3.0
+
+
+def frame_progresses(frame_count: int) -> np.ndarray:
+    """Progress value of every frame of a segment.
+
+    Frame k of an n-frame segment is sampled at progress k / n, which is
+    t / duration at t = k / fps.
+
+    Args:
+        frame_count: Number of frames of the segment
+
+    Returns:
+        1-D array of progress values in [0, 1)
+    """
+    return np.arange(frame_count) / frame_count
+
+
+@dataclass(frozen=True)
+class TimelineSegment:
+    """One effect or transition segment of a timeline, on whole frames."""
+
+    index: int
+    kind: str  # 'effect' or 'transition'
+    name: str  # Effect or transition type
+    sources: Tuple[int, ...]  # Indexes of the images the segment is rendered from
+    start_frame: int
+    frame_count: int
+    fps: int
+    effect: Optional[EffectBase] = None  # Effect segments
+    transition: Optional[TransitionBase] = None  # Transition segments
+
+    @property
+    def end_frame(self) -> int:
+        """Index of the first frame after the segment."""
+        return self.start_frame + self.frame_count
+
+    @property
+    def duration(self) -> float:
+        """Exact duration of the segment's frames, in seconds."""
+        return self.frame_count / self.fps
+
+    def progress_at(self, offset: int) -> float:
+        """Progress of a frame of the segment (see frame_progresses).
+
+        Args:
+            offset: Frame index relative to the segment start
+
+        Returns:
+            Progress value in [0, 1)
+        """
+        return offset / self.frame_count
+
+
+@dataclass(frozen=True)
+class TimelinePlan:
+    """Immutable, frame-exact layout of a video timeline.
+
+    Each image is shown for the gap until the next timestamp (the last
+    image reuses the previous gap): an effect segment of that gap minus the
+    transition duration, then a transition into the next image. Segment
+    boundaries are the cumulative times rounded to whole frames, so frame
+    counts never drift away from the timestamps, and segments left without
+    any frame are dropped.
+    """
+
+    fps: int
+    segments: Tuple[TimelineSegment, ...]
+    effects: Tuple[EffectBase, ...]  # One per image
+    segment_starts: Tuple[int, ...]  # First frame of every segment (sorted)
+    total_frames: int
+
+    @classmethod
+    def compile(cls,
+                images: List[ImageTimestamp],
+                fps: int,
+                transition_duration: float,
+                transition_type: str) -> 'TimelinePlan':
+        """Build the plan of a timeline.
+
+        Args:
+            images: List of ImageTimestamp objects (sorted by timestamp)
+            fps: Frames per second of the video
+            transition_duration: Duration of transitions in seconds
+            transition_type: Default transition type
+
+        Returns:
+            The compiled plan
+
+        Raises:
+            ValueError: If an effect or transition type is unknown
+        """
+        effects = tuple(
+            EffectRegistry.get(image.effect, intensity=image.effect_intensity,
+                               subpixel=image.effect_subpixel)
+            for image in images
+        )
+
+        # Nominal layout in seconds: (kind, name, sources, duration, transition)
+        pieces: List[Tuple[str, str, Tuple[int, ...], float, Optional[TransitionBase]]] = []
+        for i, image in enumerate(images):
+            if i < len(images) - 1:
+                duration = images[i + 1].timestamp - image.timestamp
+            elif i > 0:
+                duration = image.timestamp - images[i - 1].timestamp
+            else:
+                duration = DEFAULT_IMAGE_DURATION
+
+            if duration > transition_duration:
+                pieces.append(('effect', image.effect, (i,), duration - transition_duration, None))
+
+            if i < len(images) - 1:
+                name = image.transition_type or transition_type
+                pieces.append((
+                    'transition', name, (i, i + 1), transition_duration,
+                    TransitionRegistry.get(name, transition_duration)
+                ))
+
+        segments: List[TimelineSegment] = []
+        start_frame = 0
+        for (kind, name, sources, _, transition), end_time in zip(
+            pieces, itertools.accumulate(piece[3] for piece in pieces)
+        ):
+            end_frame = int(math.floor(end_time * fps + 0.5))
+            if end_frame <= start_frame:
+                continue
+            segments.append(TimelineSegment(
+                index=len(segments),
+                kind=kind,
+                name=name,
+                sources=sources,
+                start_frame=start_frame,
+                frame_count=end_frame - start_frame,
+                fps=fps,
+                effect=effects[sources[0]] if kind == 'effect' else None,
+                transition=transition
+            ))
+            start_frame = end_frame
+
+        logger.debug(
+            f"Timeline compiled: {len(images)} images, {len(segments)} segments, "
+            f"{start_frame} frames"
+        )
+        return cls(
+            fps=fps,
+            segments=tuple(segments),
+            effects=effects,
+            segment_starts=tuple(segment.start_frame for segment in segments),
+            total_frames=start_frame
+        )
+
+    @property
+    def duration(self) -> float:
+        """Duration of the video, in seconds."""
+        return self.total_frames / self.fps
+
+    def frame_at_time(self, time: float) -> int:
+        """Index of the frame shown at a given time.
+
+        Args:
+            time: Time in the video, in seconds
+
+        Returns:
+            floor(time * fps), the last frame for time == duration
+
+        Raises:
+            ValueError: If time is outside the video
+        """
+        if time < 0 or time > self.duration:
+            raise ValueError(
+                f"Time {time}s is outside the video (duration: {self.duration:.3f}s)"
+            )
+        # Tolerance so that times given as k / fps land on frame k
+        return min(int(math.floor(time * self.fps + 1e-6)), self.total_frames - 1)
+
+    def segment_index_at_frame(self, frame: int) -> int:
+        """Index of the segment containing a frame (O(log n) lookup).
+
+        Args:
+            frame: Frame index; frames past the end map to the last segment
+
+        Returns:
+            Segment index
+        """
+        return max(0, bisect.bisect_right(self.segment_starts, frame) - 1)
+
+    def segment_at_frame(self, frame: int) -> Tuple[TimelineSegment, int]:
+        """Segment containing a frame.
+
+        Args:
+            frame: Frame index
+
+        Returns:
+            Tuple of (segment, offset of the frame within the segment)
+        """
+        segment = self.segments[self.segment_index_at_frame(frame)]
+        return segment, frame - segment.start_frame
+
+    def segment_at_time(self, time: float) -> Tuple[TimelineSegment, int]:
+        """Segment shown at a given time.
+
+        Args:
+            time: Time in the video, in seconds
+
+        Returns:
+            Tuple of (segment, offset of the frame within the segment)
+
+        Raises:
+            ValueError: If time is outside the video
+        """
+        return self.segment_at_frame(self.frame_at_time(time))
@@ -2,7 +2,9 @@
 
 from abc import ABC, abstractmethod
 import numpy as np
-from typing import Tuple
+from typing import Optional, Tuple
+
+from app.services.transitions.blending import blend
 
 
 class TransitionBase(ABC):
@@ -24,19 +26,39 @@ class TransitionBase(ABC):
     def apply(self, 
               frame1: np.ndarray, 
               frame2: np.ndarray, 
-              progress: float) -> np.ndarray:
+              progress: float,
+              out: Optional[np.ndarray] = None) -> np.ndarray:
         """Apply transition effect between two frames.
         
         Args:
             frame1: First frame (numpy array)
             frame2: Second frame (numpy array)
             progress: Transition progress from 0.0 to 1.0
+            out: Optional preallocated uint8 buffer (same shape as frame1)
+                that receives the result instead of a newly allocated array
             
         Returns:
-            Blended frame as numpy array
+            Blended frame as numpy array (``out`` when provided)
         """
         pass
     
+    @staticmethod
+    def write_out(result: np.ndarray, out: Optional[np.ndarray]) -> np.ndarray:
+        """Copy a result into ``out`` when a buffer was provided.
+        
+        Args:
+            result: Computed frame
+            out: Optional preallocated buffer
+            
+        Returns:
+            ``out`` filled with the result, or ``result`` itself
+        """
+        if out is None:
+            return result
+        if result is not out:
+            np.copyto(out, result)
+        return out
+    
     @staticmethod
     def ensure_same_size(frame1: np.ndarray, 
                          frame2: np.ndarray,
@@ -63,15 +85,17 @@ class TransitionBase(ABC):
     @staticmethod
     def blend_frames(frame1: np.ndarray, 
                      frame2: np.ndarray, 
-                     alpha: float) -> np.ndarray:
+                     alpha: float,
+                     out: Optional[np.ndarray] = None) -> np.ndarray:
         """Simple alpha blending between two frames.
         
         Args:
             frame1: First frame
             frame2: Second frame
             alpha: Blend factor (0.0 = frame1, 1.0 = frame2)
+            out: Optional preallocated uint8 buffer for the result
             
         Returns:
             Blended frame
         """
-        return (frame1 * (1 - alpha) + frame2 * alpha).astype(np.uint8)
+        return blend(frame1, frame2, alpha, out)
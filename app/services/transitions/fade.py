@@ -1,7 +1,9 @@
 """Fade transitions (Cross Dissolve, Flash, etc.)."""
 
 import numpy as np
+from typing import Optional
 from app.services.transitions.base import TransitionBase
+from app.services.transitions.blending import blend_constant
 from app.services.transitions.registry import TransitionRegistry
 
 
@@ -11,9 +13,10 @@ class CrossDissolveTransition(TransitionBase):
     Smoothly fades from one image to another using alpha blending.
     """
     
-    def apply(self, frame1: np.ndarray, frame2: np.ndarray, progress: float) -> np.ndarray:
+    def apply(self, frame1: np.ndarray, frame2: np.ndarray, progress: float,
+              out: Optional[np.ndarray] = None) -> np.ndarray:
         # Simple linear alpha blend
-        return self.blend_frames(frame1, frame2, progress)
+        return self.blend_frames(frame1, frame2, progress, out)
 
 
 class FlashWhiteTransition(TransitionBase):
@@ -22,18 +25,17 @@ class FlashWhiteTransition(TransitionBase):
     Quickly flashes to white before showing the next image.
     """
     
-    def apply(self, frame1: np.ndarray, frame2: np.ndarray, progress: float) -> np.ndarray:
-        # Create white frame
-        white_frame = np.ones_like(frame1) * 255
-        
+    def apply(self, frame1: np.ndarray, frame2: np.ndarray, progress: float,
+              out: Optional[np.ndarray] = None) -> np.ndarray:
+        # White is blended as a constant, no white frame is allocated
         if progress < 0.5:
             # First half: fade to white
             alpha = progress * 2  # 0 to 1
-            return self.blend_frames(frame1, white_frame, alpha)
+            return blend_constant(frame1, 255.0, alpha, out)
         else:
             # Second half: fade from white to frame2
             alpha = (progress - 0.5) * 2  # 0 to 1
-            return self.blend_frames(white_frame, frame2, alpha)
+            return blend_constant(frame2, 255.0, 1 - alpha, out)
 
 
 class FadeToBlackTransition(TransitionBase):
@@ -42,18 +44,17 @@ class FadeToBlackTransition(TransitionBase):
     Fades to black then fades in the next image.
     """
     
-    def apply(self, frame1: np.ndarray, frame2: np.ndarray, progress: float) -> np.ndarray:
-        # Create black frame
-        black_frame = np.zeros_like(frame1)
-        
+    def apply(self, frame1: np.ndarray, frame2: np.ndarray, progress: float,
+              out: Optional[np.ndarray] = None) -> np.ndarray:
+        # Black is blended as a constant, no black frame is allocated
         if progress < 0.5:
             # First half: fade to black
             alpha = progress * 2
-            return self.blend_frames(frame1, black_frame, alpha)
+            return blend_constant(frame1, 0.0, alpha, out)
         else:
             # Second half: fade from black
             alpha = (progress - 0.5) * 2
-            return self.blend_frames(black_frame, frame2, alpha)
+            return blend_constant(frame2, 0.0, 1 - alpha, out)
 
 
 # Register transitions
@@ -2,6 +2,7 @@
 
 import numpy as np
 import cv2
+from typing import Optional
 from app.services.transitions.base import TransitionBase
 from app.services.transitions.registry import TransitionRegistry
 
@@ -13,7 +14,8 @@ class SmoothSlideTransition(TransitionBase):
         super().__init__(duration)
         self.direction = direction
     
-    def apply(self, frame1: np.ndarray, frame2: np.ndarray, progress: float) -> np.ndarray:
+    def apply(self, frame1: np.ndarray, frame2: np.ndarray, progress: float,
+              out: Optional[np.ndarray] = None) -> np.ndarray:
         h, w = frame1.shape[:2]
         
         # Ease-in-out function for smooth movement
@@ -21,7 +23,8 @@ class SmoothSlideTransition(TransitionBase):
         
         if self.direction == 'left':
             offset = int(w * eased)
-            result = np.zeros_like(frame1)
+            # Both frames together always cover the full width
+            result = np.empty_like(frame1) if out is None else out
             
             # Slide frame1 to the left
             if offset < w:
@@ -32,7 +35,7 @@ class SmoothSlideTransition(TransitionBase):
             
         elif self.direction == 'right':
             offset = int(w * eased)
-            result = np.zeros_like(frame1)
+            result = np.empty_like(frame1) if out is None else out
             
             # Slide frame1 to the right
             if offset < w:
@@ -42,7 +45,7 @@ class SmoothSlideTransition(TransitionBase):
             result[:, :offset] = frame2[:, w-offset:]
             
         else:
-            result = frame1
+            result = self.write_out(frame1, out)
         
         return result
     
@@ -58,12 +61,18 @@ class SmoothSlideTransition(TransitionBase):
 class SmoothFlipTransition(TransitionBase):
     """Smooth flip/rotation transition."""
     
-    def apply(self, frame1: np.ndarray, frame2: np.ndarray, progress: float) -> np.ndarray:
+    def apply(self, frame1: np.ndarray, frame2: np.ndarray, progress: float,
+              out: Optional[np.ndarray] = None) -> np.ndarray:
         h, w = frame1.shape[:2]
         
         # Ease the progress
         eased = self._ease_in_out(progress)
         
+        # Blend edges for smooth transition
+        if 0.4 < eased < 0.6:
+            alpha = abs(eased - 0.5) * 2
+            return self.blend_frames(frame1, frame2, alpha, out)
+        
         # Calculate scale factor for flip effect
         if eased < 0.5:
             # First half: scale down frame1
@@ -78,17 +87,12 @@ class SmoothFlipTransition(TransitionBase):
         new_w = max(1, int(w * scale))
         resized = cv2.resize(current_frame, (new_w, h))
         
-        # Center the resized frame
-        result = np.zeros_like(frame1)
+        # Center the resized frame on a black background
+        result = np.empty_like(frame1) if out is None else out
         x_offset = (w - new_w) // 2
-        
-        if new_w > 0:
-            result[:, x_offset:x_offset+new_w] = resized
-        
-        # Blend edges for smooth transition
-        if 0.4 < eased < 0.6:
-            alpha = abs(eased - 0.5) * 2
-            result = self.blend_frames(frame1, frame2, alpha)
+        result[:, :x_offset] = 0
+        result[:, x_offset+new_w:] = 0
+        result[:, x_offset:x_offset+new_w] = resized
         
         return result
     
@@ -104,7 +108,8 @@ class SmoothFlipTransition(TransitionBase):
 class SmoothStretchTransition(TransitionBase):
     """Smooth stretch transition (scale effect)."""
     
-    def apply(self, frame1: np.ndarray, frame2: np.ndarray, progress: float) -> np.ndarray:
+    def apply(self, frame1: np.ndarray, frame2: np.ndarray, progress: float,
+              out: Optional[np.ndarray] = None) -> np.ndarray:
         h, w = frame1.shape[:2]
         
         # Ease progress
@@ -122,7 +127,11 @@ class SmoothStretchTransition(TransitionBase):
         resized2 = cv2.resize(frame2, (new_w2, new_h2))
         
         # Create result and center frames
-        result = np.zeros_like(frame1)
+        if out is None:
+            result = np.zeros_like(frame1)
+        else:
+            result = out
+            result.fill(0)
         
         # Place frame1
         y1, x1 = (h - new_h1) // 2, (w - new_w1) // 2
@@ -130,9 +139,14 @@ class SmoothStretchTransition(TransitionBase):
         
         # Blend frame2 on top
         y2, x2 = (h - new_h2) // 2, (w - new_w2) // 2
+        if y2 < 0 or x2 < 0:
+            # Overshoot (eased > 1): frame2 is larger than the frame, keep its center
+            resized2 = resized2[max(0, -y2):max(0, -y2) + h, max(0, -x2):max(0, -x2) + w]
+            y2, x2 = max(0, y2), max(0, x2)
+            new_h2, new_w2 = resized2.shape[:2]
         if new_h2 > 0 and new_w2 > 0:
-            # Alpha blend the overlapping region
-            alpha = eased
+            # Alpha blend the overlapping region (opaque during the overshoot)
+            alpha = min(eased, 1.0)
             result[y2:y2+new_h2, x2:x2+new_w2] = self.blend_frames(
                 result[y2:y2+new_h2, x2:x2+new_w2],
                 resized2,
@@ -166,7 +180,8 @@ class SmoothSpinTransition(TransitionBase):
     Very popular on TikTok and Instagram Reels.
     """
     
-    def apply(self, frame1: np.ndarray, frame2: np.ndarray, progress: float) -> np.ndarray:
+    def apply(self, frame1: np.ndarray, frame2: np.ndarray, progress: float,
+              out: Optional[np.ndarray] = None) -> np.ndarray:
         h, w = frame1.shape[:2]
         
         # Smooth easing
@@ -184,11 +199,12 @@ class SmoothSpinTransition(TransitionBase):
         
         # Apply rotation and zoom to frame1
         rotated_frame1 = cv2.warpAffine(frame1, rotation_matrix, (w, h), 
+                                        dst=out,
                                         borderMode=cv2.BORDER_CONSTANT,
                                         borderValue=(0, 0, 0))
         
         # Blend with frame2 using eased alpha
-        return self.blend_frames(rotated_frame1, frame2, eased)
+        return self.blend_frames(rotated_frame1, frame2, eased, out)
     
     @staticmethod
     def _ease_in_out_quad(t: float) -> float:
@@ -206,7 +222,8 @@ class GlitchTransition(TransitionBase):
     Very trendy for tech, gaming, and modern content.
     """
     
-    def apply(self, frame1: np.ndarray, frame2: np.ndarray, progress: float) -> np.ndarray:
+    def apply(self, frame1: np.ndarray, frame2: np.ndarray, progress: float,
+              out: Optional[np.ndarray] = None) -> np.ndarray:
         h, w = frame1.shape[:2]
         
         # Use ease-in-out for smooth glitch intensity
@@ -215,39 +232,38 @@ class GlitchTransition(TransitionBase):
         # Glitch is strongest in the middle of the transition
         glitch_intensity = 1.0 - abs(eased - 0.5) * 2  # 0 -> 1 -> 0
         
-        # Base blend between frames
-        blended = self.blend_frames(frame1, frame2, eased)
-        
         # Apply glitch effect if intensity is significant
-        if glitch_intensity > 0.1:
-            # Separate RGB channels
-            b, g, r = cv2.split(blended)
-            
-            # Calculate shift amounts based on intensity
-            shift = int(w * 0.02 * glitch_intensity)  # Max 2% of width
-            
-            # Shift red channel right
-            r_shifted = np.zeros_like(r)
-            if shift < w:
-                r_shifted[:, shift:] = r[:, :w-shift]
-            
-            # Shift blue channel left
-            b_shifted = np.zeros_like(b)
-            if shift < w:
-                b_shifted[:, :w-shift] = b[:, shift:]
-            
-            # Keep green channel as is
-            g_shifted = g
-            
-            # Merge channels back
-            glitched = cv2.merge([b_shifted, g_shifted, r_shifted])
-            
-            # Blend glitched effect with original based on intensity
-            result = self.blend_frames(blended, glitched, glitch_intensity * 0.6)
-            
-            return result
-        else:
-            return blended
+        if glitch_intensity <= 0.1:
+            return self.blend_frames(frame1, frame2, eased, out)
+        
+        # Calculate shift amounts based on intensity
+        shift = int(w * 0.02 * glitch_intensity)  # Max 2% of width
+        k = float(glitch_intensity * 0.6)
+        
+        # Separate RGB channels and blend them between frames, kept in
+        # float: the glitch is blended on top and the result truncated once
+        # (like the former float64 blends), so the output stays within +/-1
+        # of them
+        b, g, r = [
+            cv2.addWeighted(channel1, 1.0 - eased, channel2, eased, 0.0, dtype=cv2.CV_32F)
+            for channel1, channel2 in zip(cv2.split(frame1), cv2.split(frame2))
+        ]
+        
+        # Blend the glitched channels with the original based on intensity:
+        # channel * (1 - k) + shifted channel * k, with black shifted in.
+        # Green is not shifted, so it is the base blend.
+        r_glitched = np.empty_like(r)
+        b_glitched = np.empty_like(b)
+        # Shift red channel right
+        r_glitched[:, :shift] = r[:, :shift] * (1.0 - k)
+        r_glitched[:, shift:] = cv2.addWeighted(r[:, shift:], 1.0 - k, r[:, :w-shift], k, 0.0)
+        # Shift blue channel left
+        b_glitched[:, w-shift:] = b[:, w-shift:] * (1.0 - k)
+        b_glitched[:, :w-shift] = cv2.addWeighted(b[:, :w-shift], 1.0 - k, b[:, shift:], k, 0.0)
+        
+        # Merge channels back
+        channels = [channel.astype(np.uint8) for channel in (b_glitched, g, r_glitched)]
+        return cv2.merge(channels, dst=out)
     
     @staticmethod
     def _ease_in_out_sine(t: float) -> float:
@@ -262,7 +278,8 @@ class BlurZoomTransition(TransitionBase):
     Creates smooth, cinematic transitions.
     """
     
-    def apply(self, frame1: np.ndarray, frame2: np.ndarray, progress: float) -> np.ndarray:
+    def apply(self, frame1: np.ndarray, frame2: np.ndarray, progress: float,
+              out: Optional[np.ndarray] = None) -> np.ndarray:
         h, w = frame1.shape[:2]
         
         # Smooth easing
@@ -278,7 +295,7 @@ class BlurZoomTransition(TransitionBase):
         
         # Crop and resize frame1
         cropped = frame1[y1:y1+new_h, x1:x1+new_w]
-        zoomed_frame1 = cv2.resize(cropped, (w, h))
+        zoomed_frame1 = cv2.resize(cropped, (w, h), dst=out)
         
         # Apply radial blur effect based on progress
         # Blur is strongest in the middle of transition
@@ -292,10 +309,11 @@ class BlurZoomTransition(TransitionBase):
             kernel_size = max(3, kernel_size)
             
             # Apply motion blur
-            zoomed_frame1 = cv2.GaussianBlur(zoomed_frame1, (kernel_size, kernel_size), 0)
+            zoomed_frame1 = cv2.GaussianBlur(zoomed_frame1, (kernel_size, kernel_size), 0,
+                                             dst=zoomed_frame1)
         
         # Blend with frame2
-        return self.blend_frames(zoomed_frame1, frame2, eased)
+        return self.blend_frames(zoomed_frame1, frame2, eased, out)
     
     @staticmethod
     def _ease_in_out_cubic(t: float) -> float:
@@ -1,6 +1,7 @@
 """Wipe transitions (directional wipes)."""
 
 import numpy as np
+from typing import Optional
 from app.services.transitions.base import TransitionBase
 from app.services.transitions.registry import TransitionRegistry
 
@@ -8,14 +9,15 @@ from app.services.transitions.registry import TransitionRegistry
 class WipeLeftTransition(TransitionBase):
     """Wipe from right to left."""
     
-    def apply(self, frame1: np.ndarray, frame2: np.ndarray, progress: float) -> np.ndarray:
+    def apply(self, frame1: np.ndarray, frame2: np.ndarray, progress: float,
+              out: Optional[np.ndarray] = None) -> np.ndarray:
         h, w = frame1.shape[:2]
         
         # Calculate wipe position
         wipe_pos = int(w * progress)
         
         # Create result frame
-        result = frame1.copy()
+        result = frame1.copy() if out is None else self.write_out(frame1, out)
         
         # Replace left portion with frame2
         if wipe_pos > 0:
@@ -27,14 +29,15 @@ class WipeLeftTransition(TransitionBase):
 class WipeRightTransition(TransitionBase):
     """Wipe from left to right."""
     
-    def apply(self, frame1: np.ndarray, frame2: np.ndarray, progress: float) -> np.ndarray:
+    def apply(self, frame1: np.ndarray, frame2: np.ndarray, progress: float,
+              out: Optional[np.ndarray] = None) -> np.ndarray:
         h, w = frame1.shape[:2]
         
         # Calculate wipe position
         wipe_pos = int(w * (1 - progress))
         
         # Create result frame
-        result = frame1.copy()
+        result = frame1.copy() if out is None else self.write_out(frame1, out)
         
         # Replace right portion with frame2
         if wipe_pos < w:
@@ -46,14 +49,15 @@ class WipeRightTransition(TransitionBase):
 class WipeUpTransition(TransitionBase):
     """Wipe from bottom to top."""
     
-    def apply(self, frame1: np.ndarray, frame2: np.ndarray, progress: float) -> np.ndarray:
+    def apply(self, frame1: np.ndarray, frame2: np.ndarray, progress: float,
+              out: Optional[np.ndarray] = None) -> np.ndarray:
         h, w = frame1.shape[:2]
         
         # Calculate wipe position
         wipe_pos = int(h * progress)
         
         # Create result frame
-        result = frame1.copy()
+        result = frame1.copy() if out is None else self.write_out(frame1, out)
         
         # Replace top portion with frame2
         if wipe_pos > 0:
@@ -65,14 +69,15 @@ class WipeUpTransition(TransitionBase):
 class WipeDownTransition(TransitionBase):
     """Wipe from top to bottom."""
     
-    def apply(self, frame1: np.ndarray, frame2: np.ndarray, progress: float) -> np.ndarray:
+    def apply(self, frame1: np.ndarray, frame2: np.ndarray, progress: float,
+              out: Optional[np.ndarray] = None) -> np.ndarray:
         h, w = frame1.shape[:2]
         
         # Calculate wipe position
         wipe_pos = int(h * (1 - progress))
         
         # Create result frame
-        result = frame1.copy()
+        result = frame1.copy() if out is None else self.write_out(frame1, out)
         
         # Replace bottom portion with frame2
         if wipe_pos < h:
@@ -2,6 +2,7 @@
 
 import numpy as np
 import cv2
+from typing import Optional
 from app.services.transitions.base import TransitionBase
 from app.services.transitions.registry import TransitionRegistry
 
@@ -13,7 +14,8 @@ class ZoomInTransition(TransitionBase):
     second image fades in.
     """
     
-    def apply(self, frame1: np.ndarray, frame2: np.ndarray, progress: float) -> np.ndarray:
+    def apply(self, frame1: np.ndarray, frame2: np.ndarray, progress: float,
+              out: Optional[np.ndarray] = None) -> np.ndarray:
         h, w = frame1.shape[:2]
         
         # Zoom factor (1.0 to 1.5)
@@ -26,16 +28,17 @@ class ZoomInTransition(TransitionBase):
         
         # Crop and resize frame1 to create zoom effect
         cropped = frame1[y1:y1+new_h, x1:x1+new_w]
-        zoomed_frame1 = cv2.resize(cropped, (w, h))
+        zoomed_frame1 = cv2.resize(cropped, (w, h), dst=out)
         
         # Blend with frame2
-        return self.blend_frames(zoomed_frame1, frame2, progress)
+        return self.blend_frames(zoomed_frame1, frame2, progress, out)
 
 
 class ZoomOutTransition(TransitionBase):
     """Zoom out transition - zooms out from first image while fading to second."""
     
-    def apply(self, frame1: np.ndarray, frame2: np.ndarray, progress: float) -> np.ndarray:
+    def apply(self, frame1: np.ndarray, frame2: np.ndarray, progress: float,
+              out: Optional[np.ndarray] = None) -> np.ndarray:
         h, w = frame1.shape[:2]
         
         # Zoom factor (1.5 to 1.0)
@@ -48,10 +51,10 @@ class ZoomOutTransition(TransitionBase):
         
         # Crop and resize
         cropped = frame1[y1:y1+new_h, x1:x1+new_w]
-        zoomed_frame1 = cv2.resize(cropped, (w, h))
+        zoomed_frame1 = cv2.resize(cropped, (w, h), dst=out)
         
         # Blend
-        return self.blend_frames(zoomed_frame1, frame2, progress)
+        return self.blend_frames(zoomed_frame1, frame2, progress, out)
 
 
 class SmoothZoomTransition(TransitionBase):
@@ -60,7 +63,8 @@ class SmoothZoomTransition(TransitionBase):
     Combines zoom with smooth easing for a more natural feel.
     """
     
-    def apply(self, frame1: np.ndarray, frame2: np.ndarray, progress: float) -> np.ndarray:
+    def apply(self, frame1: np.ndarray, frame2: np.ndarray, progress: float,
+              out: Optional[np.ndarray] = None) -> np.ndarray:
         # Smooth easing function (ease-in-out)
         eased_progress = self._ease_in_out(progress)
         
@@ -74,10 +78,10 @@ class SmoothZoomTransition(TransitionBase):
         y1 = (h - new_h) // 2
         x1 = (w - new_w) // 2
         cropped = frame1[y1:y1+new_h, x1:x1+new_w]
-        zoomed_frame1 = cv2.resize(cropped, (w, h))
+        zoomed_frame1 = cv2.resize(cropped, (w, h), dst=out)
         
         # Blend with smooth alpha
-        return self.blend_frames(zoomed_frame1, frame2, eased_progress)
+        return self.blend_frames(zoomed_frame1, frame2, eased_progress, out)
     
     @staticmethod
     def _ease_in_out(t: float) -> float:
@@ -3,21 +3,206 @@
 This service is designed to be testable independently without launching the API.
 """
 
+import contextlib
+import hashlib
+import itertools
+import json
+import math
+import multiprocessing
 import os
+import shutil
+import tempfile
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+from multiprocessing.context import BaseContext
 from pathlib import Path
-from typing import List, Tuple
+from typing import Any, Callable, ContextManager, Hashable, Iterator, List, Optional, Tuple
 import cv2
 import numpy as np
-from moviepy import VideoClip, concatenate_videoclips
+from moviepy import VideoClip
 from PIL import Image
+from proglog import ProgressBarLogger
 
+from app.services.cache import (
+    DecodedImageCache,
+    FileCache,
+    VideoOutputCache,
+    file_content_hash,
+    get_image_cache,
+    get_output_cache,
+    get_segment_cache,
+)
 from app.services.transitions.registry import TransitionRegistry
+from app.services.effects.base import EffectBase
 from app.services.effects.registry import EffectRegistry
+from app.services.timeline import TimelinePlan, TimelineSegment
+from app.services.encoders import ENCODER_BACKENDS, FFmpegPipeWriter, get_encoder_profile
+from app.services.encoders.pipeline import DEFAULT_PIPELINE_DEPTH, FramePipeline
+from app.services.frame_pool import FramePool
+from app.services.frame_workers import FrameWorkers, limit_opencv_threads
+from app.services.encoders.segments import (
+    concat_segment_files,
+    encode_segment,
+    is_static_segment,
+    iter_segment_frames,
+    segment_encoding,
+    segment_stage,
+    static_segment_frame,
+    write_segment,
+)
+from app.services.source_stream import DEFAULT_LOOKAHEAD, SourceStream
+from app.services.stage_timings import (
+    CONCAT_STAGE,
+    DECODE_STAGE,
+    ENCODE_STAGE,
+    QUEUE_STAGE,
+    StageTimings,
+)
 from app.models.video_models import ImageTimestamp
+from app.core import metrics
 from app.core.logging import get_logger
 
 logger = get_logger(__name__)
 
+# Bump when a rendering change alters the output of identical requests,
+# so that cached videos are not reused
+RENDER_VERSION = 4
+
+# Segment workers never fork this process: a child forked from it, while
+# render, decode and encode threads run, could inherit a lock held by one
+# of them (logging, OpenCV) and deadlock on it. They fork from a
+# single-threaded fork server instead, which imports the encoder once.
+SEGMENT_WORKER_CONTEXT: BaseContext
+if 'forkserver' in multiprocessing.get_all_start_methods():
+    SEGMENT_WORKER_CONTEXT = multiprocessing.get_context('forkserver')
+    SEGMENT_WORKER_CONTEXT.set_forkserver_preload(['app.services.encoders.segments'])
+else:
+    SEGMENT_WORKER_CONTEXT = multiprocessing.get_context('spawn')
+
+# Called by the encoder backends with (frames_done, total_frames)
+FrameProgressCallback = Callable[[int, int], None]
+
+
+@dataclass(frozen=True)
+class RenderProgress:
+    """Progress of a render, reported while the video is being encoded."""
+    
+    frames_done: int
+    total_frames: int
+    segment_index: int
+    segment_count: int
+    segment_kind: str  # 'effect' or 'transition'
+    segment_name: str  # Effect or transition type
+
+
+ProgressCallback = Callable[[RenderProgress], None]
+
+
+class _SegmentProgressReporter:
+    """Turn backend frame counts into RenderProgress events.
+    
+    The current segment is looked up in the timeline plan, so backends
+    only have to report how many frames are done.
+    """
+    
+    def __init__(self, plan: TimelinePlan, progress_callback: ProgressCallback):
+        self.plan = plan
+        self.progress_callback = progress_callback
+    
+    def __call__(self, frames_done: int, total_frames: int) -> None:
+        # Segment of the next frame to render (the last one once done)
+        segment, _ = self.plan.segment_at_frame(frames_done)
+        self.progress_callback(RenderProgress(
+            frames_done=frames_done,
+            total_frames=total_frames,
+            segment_index=segment.index,
+            segment_count=len(self.plan.segments),
+            segment_kind=segment.kind,
+            segment_name=segment.name
+        ))
+
+
+class _TimelineDriver:
+    """Serve the frames of a timeline by index, for moviepy's frame function.
+    
+    Frames are requested in order while encoding: the driver keeps a cursor
+    in the current segment and moves on to the next segment once it is
+    exhausted, so each frame costs O(1) work whatever the number of
+    segments, and only the current segment is prepared at any time. An
+    out-of-order request (moviepy probes frame 0 when the clip is created)
+    seeks by bisecting the plan.
+    
+    Returned frames may be reused buffers, valid until the next request.
+    """
+    
+    def __init__(self,
+                 plan: TimelinePlan,
+                 prepare_segment: Callable[[TimelineSegment], dict],
+                 resolution: Tuple[int, int],
+                 timings: Optional[StageTimings] = None,
+                 workers: Optional[FrameWorkers] = None):
+        self.plan = plan
+        self.prepare_segment = prepare_segment
+        self.resolution = resolution
+        self.pool = FramePool(resolution)
+        self.timings = timings
+        self.workers = workers
+        # No frame served yet: the first request always starts an iterator
+        self._frames: Iterator[np.ndarray] = iter(())
+        self._next_index = -1
+        self._last_frame = np.zeros((resolution[1], resolution[0], 3), dtype=np.uint8)
+        self._stage = ''
+        # End of the last measured interval (the time since then is moviepy's)
+        self.last_lap = StageTimings.start()
+    
+    def frame(self, index: int) -> np.ndarray:
+        index = min(max(index, 0), self.plan.total_frames - 1)
+        if index == self._next_index - 1:
+            return self._last_frame
+        if index != self._next_index:
+            self._frames = self._iter_frames(index)
+        if self.timings is None:
+            self._last_frame = next(self._frames)
+        else:
+            # Between two frame requests, moviepy was encoding the previous frame
+            started = self.timings.lap(ENCODE_STAGE, self.last_lap)
+            self._last_frame = next(self._frames)
+            self.last_lap = self.timings.lap(self._stage, started, 1)
+        self._next_index = index + 1
+        return self._last_frame
+    
+    def _iter_frames(self, start: int) -> Iterator[np.ndarray]:
+        first, offset = self.plan.segment_at_frame(start)
+        for index in range(first.index, len(self.plan.segments)):
+            segment = self.prepare_segment(self.plan.segments[index])
+            if self.timings is not None:
+                self._stage = segment_stage(segment)
+            frames: Iterator[np.ndarray]
+            if is_static_segment(segment):
+                frames = itertools.repeat(
+                    static_segment_frame(segment, self.resolution), segment['frame_count']
+                )
+            else:
+                frames = iter_segment_frames(segment, self.resolution, self.pool, self.workers)
+            yield from itertools.islice(frames, offset, None)
+            offset = 0
+            if self.timings is not None and self.workers is not None:
+                self.timings.add(self._stage, cpu=self.workers.take_cpu_seconds())
+
+
+class _MoviepyProgressLogger(ProgressBarLogger):
+    """Forward moviepy's frame progress bar to a progress callback."""
+    
+    def __init__(self, progress_callback: FrameProgressCallback):
+        super().__init__()
+        self.progress_callback = progress_callback
+    
+    def bars_callback(self, bar: str, attr: str, value: Any, old_value: Any = None) -> None:
+        if bar == 'frame_index' and attr == 'index':
+            total = self.bars[bar]['total']
+            self.progress_callback(min(value + 1, total), total)
+
 
 class VideoGeneratorService:
     """Service to generate videos from images with transitions."""
@@ -25,31 +210,95 @@ class VideoGeneratorService:
     def __init__(self, 
                  fps: int = 30,
                  resolution: Tuple[int, int] = (1280, 720),
-                 transition_duration: float = 0.5):
+                 transition_duration: float = 0.5,
+                 encoder: str = "moviepy",
+                 max_workers: Optional[int] = None,
+                 image_cache: Optional[DecodedImageCache] = None,
+                 threads: Optional[int] = None,
+                 output_cache: Optional[VideoOutputCache] = None,
+                 segment_cache: Optional[FileCache] = None,
+                 encoder_profile: str = "standard",
+                 collect_timings: bool = False,
+                 source_lookahead: int = DEFAULT_LOOKAHEAD,
+                 pipeline_depth: int = DEFAULT_PIPELINE_DEPTH,
+                 frame_threads: int = 1):
         """Initialize the video generator service.
         
         Args:
             fps: Frames per second for output video
             resolution: Output resolution (width, height)
             transition_duration: Duration of transitions in seconds
+            encoder: Encoder backend ('moviepy', 'ffmpeg_pipe' or 'ffmpeg_parallel')
+            max_workers: Worker processes for 'ffmpeg_parallel' (default: ``threads`` or the CPU count)
+            image_cache: Decoded image cache (default: the process-wide cache)
+            threads: CPU threads this render may use (default: all CPUs); with
+                'moviepy' and 'ffmpeg_pipe' the frame threads are taken out
+                of it and the encoder gets the rest
+            output_cache: Finished video cache (default: the process-wide cache)
+            segment_cache: Encoded segment cache used by 'ffmpeg_parallel'
+                (default: the process-wide cache)
+            encoder_profile: x264 profile ('draft', 'standard', 'archival' or
+                'still_heavy'); 'draft' also renders at a reduced resolution
+            collect_timings: Measure the wall and CPU time of every render
+                stage (decode, each effect and transition class, encode,
+                concat) and return them in the result
+            source_lookahead: Images decoded in the background ahead of the
+                segment being rendered (0 = decode on first use)
+            pipeline_depth: Frames queued between rendering and the encode
+                thread of 'ffmpeg_pipe' (0 = write from the render thread,
+                as with a single CPU thread)
+            frame_threads: Threads rendering consecutive frames of an effect
+                segment concurrently, for 'moviepy' and 'ffmpeg_pipe'
+                (1 = render on the calling thread)
+            
+        Raises:
+            ValueError: If the encoder backend or profile is unknown
         """
+        if encoder not in ENCODER_BACKENDS:
+            raise ValueError(
+                f"Unknown encoder '{encoder}'. Available: {list(ENCODER_BACKENDS)}"
+            )
+        self.encoder_profile = get_encoder_profile(encoder_profile)
         self.fps = fps
-        self.resolution = resolution
+        # Render resolution (lower than requested for the draft profile)
+        self.requested_resolution = resolution
+        self.resolution = self.encoder_profile.scaled_resolution(resolution)
         self.transition_duration = transition_duration
+        self.encoder = encoder
+        self.max_workers = max_workers
+        self.image_cache = image_cache if image_cache is not None else get_image_cache()
+        self.threads = threads
+        # Frames render on this process's threads except with 'ffmpeg_parallel'
+        # (its workers render and encode): they share the budget with the encoder
+        encode_budget = threads
+        if threads and encoder != 'ffmpeg_parallel':
+            encode_budget = max(1, threads - frame_threads)
+        self.encoder_threads = encode_budget
+        self.output_cache = output_cache if output_cache is not None else get_output_cache()
+        self.segment_cache = segment_cache if segment_cache is not None else get_segment_cache()
+        self.collect_timings = collect_timings
+        self.source_lookahead = source_lookahead
+        self.pipeline_depth = pipeline_depth
+        self.frame_threads = frame_threads
         
     def generate_video(self,
                       images: List[ImageTimestamp],
                       output_path: str,
-                      transition_type: str = "cross_dissolve") -> dict:
+                      transition_type: str = "cross_dissolve",
+                      progress_callback: Optional[ProgressCallback] = None) -> dict:
         """Generate a video from a list of images with transitions.
         
         Args:
             images: List of ImageTimestamp objects (must be sorted by timestamp)
             output_path: Path where the video will be saved
             transition_type: Type of transition to use
+            progress_callback: Optional callable receiving RenderProgress events
+                during encoding
             
         Returns:
-            Dictionary with generation details
+            Dictionary with generation details ('from_cache' is True when an
+            identical earlier request's video was reused; 'timings' holds the
+            stage timings when collect_timings is set)
             
         Raises:
             ValueError: If images list is invalid or paths don't exist
@@ -61,263 +310,707 @@ class VideoGeneratorService:
         self._validate_inputs(images, output_path)
         
         try:
-            # Load and prepare images (without resizing - preserve original size)
-            frames_data = self._load_images_without_resize(images)
+            # Replay of an identical request: reuse the finished video
+            extension = os.path.splitext(output_path)[1]
+            cache_key = None
+            if self.output_cache.enabled:
+                cache_key = self._request_key(images, transition_type, extension)
+                cached = self.output_cache.fetch(cache_key, extension, output_path)
+                if cached is not None:
+                    logger.info(f"Video served from cache ({cache_key[:12]}): {output_path}")
+                    return {
+                        **cached,
+                        "output_path": output_path,
+                        "requested_resolution": self.requested_resolution,
+                        "image_cache": {"hits": 0, "misses": 0, "unique_images": 0},
+                        "segment_cache": None,
+                        "timings": None,
+                        "from_cache": True
+                    }
+                # Never write through a hard link shared with a cache entry
+                if os.path.lexists(output_path):
+                    os.remove(output_path)
             
-            # Create video clips
-            clips = []
-            total_duration = 0
+            timings = StageTimings() if self.collect_timings else None
             
-            for i in range(len(frames_data)):
-                image_config = images[i]
-                frame_data = frames_data[i]
-                
-                # Calculate duration for this image
-                if i < len(images) - 1:
-                    # Duration until next timestamp
-                    duration = images[i + 1].timestamp - images[i].timestamp
-                else:
-                    # Last image: use same duration as previous or default 3 seconds
-                    if i > 0:
-                        duration = images[i].timestamp - images[i - 1].timestamp
-                    else:
-                        duration = 3.0
-                
-                # Get effect for this image
-                effect_name = image_config.effect
-                effect_intensity = image_config.effect_intensity
-                effect = EffectRegistry.get(effect_name, intensity=effect_intensity)
-                logger.info(f"Image {i}: effect='{effect_name}', intensity={effect_intensity}")
-                
-                # Create clip with effect applied
-                if duration > self.transition_duration:
-                    effect_duration = duration - self.transition_duration
-                    effect_clip = self._create_effect_clip(
-                        frame_data['frame'],
-                        effect,
-                        effect_duration
-                    )
-                    clips.append(effect_clip)
-                    total_duration += effect_duration
-                
-                # Create transition clip (except for last image)
-                if i < len(frames_data) - 1:
-                    # Determine transition type for this image
-                    current_transition_type = image_config.transition_type if image_config.transition_type else transition_type
-                    transition = TransitionRegistry.get(current_transition_type, self.transition_duration)
-                    logger.info(f"Transition {i}->{i+1}: '{current_transition_type}'")
-                    
-                    # For transitions, we need to prepare both frames at the target resolution
-                    # Apply the effect at progress=1.0 (end state) for first frame
-                    frame1_end = effect.apply(frame_data['frame'], 1.0, self.resolution)
-                    
-                    # Apply the next image's effect at progress=0.0 (start state) for second frame
-                    next_effect_name = images[i + 1].effect
-                    next_effect_intensity = images[i + 1].effect_intensity
-                    next_effect = EffectRegistry.get(next_effect_name, intensity=next_effect_intensity)
-                    frame2_start = next_effect.apply(frames_data[i + 1]['frame'], 0.0, self.resolution)
-                    
-                    transition_clip = self._create_transition_clip(
-                        frame1_end,
-                        frame2_start,
-                        transition
-                    )
-                    clips.append(transition_clip)
-                    total_duration += self.transition_duration
-            
-            # Concatenate all clips
-            logger.info(f"Concatenating {len(clips)} clips")
-            final_video = concatenate_videoclips(clips, method="compose")
+            # Compile the timeline: frame-exact segments, effects and transitions
+            plan = TimelinePlan.compile(images, self.fps, self.transition_duration, transition_type)
             
             # Ensure output directory exists
             os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
             
-            # Write video file
-            logger.info(f"Writing video to {output_path}")
-            final_video.write_videofile(
-                output_path,
-                fps=self.fps,
-                codec='libx264',
-                audio=False,
-                logger=None
+            # Encode the timeline with the selected backend. Images (no
+            # distortion; decoded at reduced scale when much larger than the
+            # output) are fitted to the source each effect needs, through the
+            # cross-request decoded image cache, just ahead of their segments
+            logger.info(f"Writing video to {output_path} (encoder='{self.encoder}')")
+            frame_callback = (
+                _SegmentProgressReporter(plan, progress_callback)
+                if progress_callback else None
             )
+            segment_cache_stats = None
+            with self._open_sources(images, plan, timings) as sources:
+                if self.encoder == 'ffmpeg_pipe':
+                    self._render_with_ffmpeg_pipe(plan, sources, output_path, frame_callback, timings)
+                elif self.encoder == 'ffmpeg_parallel':
+                    segment_keys = (
+                        self._segment_keys(images, plan)
+                        if self.segment_cache.enabled else None
+                    )
+                    segment_cache_stats = self._render_with_ffmpeg_parallel(
+                        plan, sources, output_path, frame_callback, segment_keys, timings
+                    )
+                else:
+                    self._render_with_moviepy(plan, sources, output_path, frame_callback, timings)
+            cache_stats = sources.stats()
+            if self.encoder != 'ffmpeg_parallel':
+                # The parallel backend counts the segments it did not reuse
+                metrics.observe_rendered_frames(plan.segments)
             
             logger.info(f"Video generated successfully: {output_path}")
             
-            return {
+            timings_summary = timings.summary() if timings is not None else None
+            if timings_summary is not None:
+                logger.info(
+                    f"Render stage timings: {json.dumps(timings_summary)}",
+                    extra={"props": {"render_timings": timings_summary}}
+                )
+            
+            result = {
                 "success": True,
                 "output_path": output_path,
-                "duration": total_duration,
+                "duration": plan.duration,
                 "num_images": len(images),
                 "transition_type": transition_type,
                 "resolution": self.resolution,
-                "fps": self.fps
+                "requested_resolution": self.requested_resolution,
+                "fps": self.fps,
+                "encoder": self.encoder,
+                "encoder_profile": self.encoder_profile.name,
+                "image_cache": cache_stats,
+                "segment_cache": segment_cache_stats,
+                "timings": timings_summary,
+                "from_cache": False
             }
+            if cache_key is not None:
+                self.output_cache.store(cache_key, extension, output_path, result)
+            return result
             
         except Exception as e:
             logger.error(f"Error generating video: {str(e)}")
             raise RuntimeError(f"Failed to generate video: {str(e)}")
     
-    def _validate_inputs(self, images: List[ImageTimestamp], output_path: str) -> None:
-        """Validate input parameters.
+    def render_frame(self,
+                     images: List[ImageTimestamp],
+                     time: float,
+                     transition_type: str = "cross_dissolve") -> np.ndarray:
+        """Render the single video frame shown at a given time, without encoding.
+        
+        Only the segment covering ``time`` is looked up in the timeline plan,
+        and only its source images are loaded (through the decoded image
+        cache), so previewing a frame costs one or two image loads and a few
+        apply() calls whatever the length of the timeline. The frame is the
+        one the encoders emit at that time: frame index floor(time * fps).
         
         Args:
-            images: List of images to validate
-            output_path: Output path to validate
+            images: List of ImageTimestamp objects (must be sorted by timestamp)
+            time: Time in the video, in seconds
+            transition_type: Default transition type
+            
+        Returns:
+            RGB frame at the render resolution
             
         Raises:
-            ValueError: If validation fails
+            ValueError: If images are invalid or time is outside the video
         """
-        if not images or len(images) < 2:
-            raise ValueError("At least 2 images are required")
+        self._validate_images(images)
         
-        # Check if all image files exist
-        for img in images:
-            if not os.path.exists(img.image_path):
-                raise ValueError(f"Image file not found: {img.image_path}")
+        plan = TimelinePlan.compile(images, self.fps, self.transition_duration, transition_type)
+        segment, offset = plan.segment_at_time(time)
+        progress = segment.progress_at(offset)
         
-        # Check output path
-        if not output_path:
-            raise ValueError("Output path cannot be empty")
+        sources = {
+            i: self._load_source(images[i].image_path, plan.effects[i])[0]
+            for i in segment.sources
+        }
         
-        # Check if output directory is writable
-        output_dir = os.path.dirname(os.path.abspath(output_path))
-        if output_dir and not os.path.exists(output_dir):
-            try:
-                os.makedirs(output_dir, exist_ok=True)
-            except Exception as e:
-                raise ValueError(f"Cannot create output directory: {e}")
+        transition = segment.transition
+        if transition is None:
+            # Effect segment, prepared per segment as the encoders do (see iter_segment_frames)
+            effect = plan.effects[segment.sources[0]]
+            source = effect.prepare(sources[segment.sources[0]], self.resolution)
+            return effect.apply(source, progress, self.resolution)
+        
+        i, j = segment.sources
+        frame1 = plan.effects[i].apply(sources[i], 1.0, self.resolution)
+        frame2 = plan.effects[j].apply(sources[j], 0.0, self.resolution)
+        return transition.apply(frame1, frame2, progress)
     
-    def _load_images(self, images: List[ImageTimestamp]) -> List[dict]:
-        """Load and prepare all images (DEPRECATED - kept for compatibility).
+    def _request_key(self,
+                     images: List[ImageTimestamp],
+                     transition_type: str,
+                     extension: str) -> str:
+        """Canonical hash of everything that determines the output video.
+        
+        Images are identified by their content hash, so a renamed or copied
+        file still hits and an edited one misses.
         
         Args:
-            images: List of ImageTimestamp objects
+            images: List of ImageTimestamp objects (sorted by timestamp)
+            transition_type: Default transition type
+            extension: Output file extension (selects the container)
             
         Returns:
-            List of dictionaries with loaded frames
+            Hex digest
         """
-        frames_data = []
+        spec = {
+            "render_version": RENDER_VERSION,
+            "images": [
+                {
+                    "content": file_content_hash(img.image_path),
+                    "timestamp": img.timestamp,
+                    "effect": img.effect,
+                    "effect_intensity": img.effect_intensity,
+                    "effect_subpixel": img.effect_subpixel,
+                    "transition_type": img.transition_type or transition_type,
+                }
+                for img in images
+            ],
+            "fps": self.fps,
+            "resolution": list(self.resolution),
+            "transition_duration": self.transition_duration,
+            "encoder": self.encoder,
+            "encoder_profile": asdict(self.encoder_profile),
+            "extension": extension.lower(),
+        }
+        canonical = json.dumps(spec, sort_keys=True, separators=(',', ':'))
+        return hashlib.sha256(canonical.encode()).hexdigest()
+    
+    def _segment_keys(self, images: List[ImageTimestamp], plan: TimelinePlan) -> List[str]:
+        """Segment cache key of every segment.
         
-        for img in images:
-            logger.info(f"Loading image: {img.image_path}")
-            
-            # Load image with PIL then convert to numpy array
-            pil_image = Image.open(img.image_path)
+        A key covers everything that determines the encoded segment: the
+        content and effect of its source images, its own effect or
+        transition and frame count, and the output and encoder settings.
+        
+        Args:
+            images: List of ImageTimestamp objects (sorted by timestamp)
+            plan: Compiled timeline plan
             
-            # Convert to RGB if necessary
-            if pil_image.mode != 'RGB':
-                pil_image = pil_image.convert('RGB')
+        Returns:
+            Hex digests, one per segment
+        """
+        keys = []
+        for segment in plan.segments:
+            spec = {
+                "render_version": RENDER_VERSION,
+                "kind": segment.kind,
+                "name": segment.name,
+                "frame_count": segment.frame_count,
+                "sources": [
+                    {
+                        "content": file_content_hash(images[index].image_path),
+                        "effect": images[index].effect,
+                        "effect_intensity": images[index].effect_intensity,
+                        "effect_subpixel": images[index].effect_subpixel,
+                    }
+                    for index in segment.sources
+                ],
+                "fps": self.fps,
+                "resolution": list(self.resolution),
+                "encoding": segment_encoding(self.encoder_profile, self.fps),
+            }
+            canonical = json.dumps(spec, sort_keys=True, separators=(',', ':'))
+            keys.append(hashlib.sha256(canonical.encode()).hexdigest())
+        return keys
+    
+    def _open_sources(self,
+                      images: List[ImageTimestamp],
+                      plan: TimelinePlan,
+                      timings: Optional[StageTimings] = None) -> SourceStream:
+        """Open the stream of source images of a render.
+        
+        Each image is loaded as the smallest source its effect needs:
+        effects resize their source on every frame, so feeding them the
+        full-resolution original makes per-frame cost depend on the input
+        size. Images are decoded (see _decode_image) and downscaled once to
+        the cover-fit size of the output resolution times the effect's
+        maximum scale factor (see _prepare_source).
+        
+        Prepared sources go through the process-wide decoded image cache,
+        keyed by file identity, output resolution and effect scale. They are
+        loaded ``source_lookahead`` images ahead of the segment being
+        rendered and released after their last segment (see SourceStream).
+        
+        Args:
+            images: List of ImageTimestamp objects
+            plan: Compiled timeline plan
+            timings: Optional stage timings charged with the decodes
             
-            # Convert to numpy array
-            frame = np.array(pil_image)
+        Returns:
+            SourceStream to close once the render is done
+        """
+        return SourceStream(
+            plan,
+            images,
+            lambda image, effect: self.image_cache.make_key(
+                image.image_path, self.resolution, effect.max_source_scale()
+            ),
+            self._load_source,
+            self.source_lookahead,
+            timings
+        )
+    
+    def _load_source(self,
+                     image_path: str,
+                     effect: EffectBase,
+                     key: Optional[Hashable] = None,
+                     timings: Optional[StageTimings] = None) -> Tuple[np.ndarray, bool]:
+        """Load one image as the source its effect needs, through the decoded image cache.
+        
+        Args:
+            image_path: Path of the image file
+            effect: Effect that will be applied to the image
+            key: Decoded image cache key, when already computed
+            timings: Optional stage timings charged with the decode
             
-            # Resize to target resolution
-            frame = cv2.resize(frame, self.resolution)
+        Returns:
+            Tuple of (frame, cached) where cached tells whether the frame
+            came from the cache
+        """
+        source_scale = effect.max_source_scale()
+        if key is None:
+            key = self.image_cache.make_key(image_path, self.resolution, source_scale)
+        
+        frame = self.image_cache.get(key)
+        if frame is not None:
+            return frame, True
+        
+        logger.info(f"Loading image: {image_path}")
+        started = StageTimings.start()
+        frame = self._prepare_source(self._decode_image(image_path, source_scale), effect)
+        if timings is not None:
+            timings.lap(DECODE_STAGE, started, 1)
+        return self.image_cache.put(key, frame), False
+    
+    def _prepare_source(self, frame: np.ndarray, effect: EffectBase) -> np.ndarray:
+        """Downscale one image to the minimal source needed by an effect.
+        
+        Args:
+            frame: Decoded image (any size)
+            effect: Effect that will be applied to the image
             
-            frames_data.append({
-                'frame': frame,
-                'timestamp': img.timestamp,
-                'path': img.image_path
-            })
+        Returns:
+            Downscaled image, or the original if it is already small enough
+        """
+        h, w = frame.shape[:2]
+        target_w, target_h = self.resolution
         
-        return frames_data
+        # Cover-fit scale, enlarged by the effect's maximum zoom/rotation scale
+        scale = max(target_w / w, target_h / h) * effect.max_source_scale()
+        if scale >= 1.0:
+            # Never upscale: effects already work from the original
+            return frame
+        
+        new_w = int(math.ceil(w * scale))
+        new_h = int(math.ceil(h * scale))
+        return cv2.resize(frame, (new_w, new_h), interpolation=cv2.INTER_AREA)
     
-    def _load_images_without_resize(self, images: List[ImageTimestamp]) -> List[dict]:
-        """Load all images without resizing (preserve original dimensions).
+    def _prepare_segment(self,
+                         plan: TimelinePlan,
+                         planned: TimelineSegment,
+                         sources: SourceStream) -> dict:
+        """Attach to a planned segment the frames it is rendered from.
         
-        Images will be resized/cropped by effects later to avoid distortion.
+        Segments are prepared one at a time, right before they are rendered,
+        so only the current segment's transition end frames are alive
+        whatever the length of the timeline. Sources whose last segment this
+        is are released from the stream: the segment holds what it needs.
         
         Args:
-            images: List of ImageTimestamp objects
+            plan: Compiled timeline plan
+            planned: Segment of the plan
+            sources: Source frames of the images
             
         Returns:
-            List of dictionaries with loaded frames
+            Segment dictionary with keys 'kind', 'name', 'sources',
+            'frame_count' and 'duration'. Effect segments also have keys
+            'frame' and 'effect'; transition segments have keys 'frame1' and
+            'frame2' (end state of the outgoing image, start state of the
+            incoming one, at the target resolution) and 'transition'.
         """
-        frames_data = []
+        segment = {
+            'kind': planned.kind,
+            'name': planned.name,
+            'sources': planned.sources,
+            'frame_count': planned.frame_count,
+            'duration': planned.duration
+        }
+        if planned.kind == 'effect':
+            segment['frame'] = sources.frame(planned.sources[0])
+            segment['effect'] = planned.effect
+        else:
+            i, j = planned.sources
+            # Apply the effect at progress=1.0 (end state) for first frame
+            segment['frame1'] = plan.effects[i].apply(sources.frame(i), 1.0, self.resolution)
+            # Apply the next image's effect at progress=0.0 (start state) for second frame
+            segment['frame2'] = plan.effects[j].apply(sources.frame(j), 0.0, self.resolution)
+            segment['transition'] = planned.transition
+        sources.release(planned)
+        return segment
+    
+    def _prepare_segment_timed(self,
+                               plan: TimelinePlan,
+                               planned: TimelineSegment,
+                               sources: SourceStream,
+                               timings: Optional[StageTimings] = None) -> dict:
+        """_prepare_segment(), charging the preparation to the segment's stage.
         
-        for img in images:
-            logger.info(f"Loading image: {img.image_path}")
-            
-            # Load image with PIL then convert to numpy array
-            pil_image = Image.open(img.image_path)
+        Args:
+            plan: Compiled timeline plan
+            planned: Segment of the plan
+            sources: Source frames of the images
+            timings: Optional stage timings
             
-            # Convert to RGB if necessary
-            if pil_image.mode != 'RGB':
-                pil_image = pil_image.convert('RGB')
+        Returns:
+            Segment dictionary
+        """
+        if timings is None:
+            return self._prepare_segment(plan, planned, sources)
+        started = timings.start()
+        segment = self._prepare_segment(plan, planned, sources)
+        timings.lap(segment_stage(segment), started)
+        return segment
+    
+    def _frame_workers(self) -> ContextManager[Optional[FrameWorkers]]:
+        """Thread pool rendering effect frames concurrently, for one render.
+        
+        Returns:
+            Context manager giving a FrameWorkers of ``frame_threads``
+            threads, or None when frames render on the calling thread
+        """
+        if self.frame_threads <= 1:
+            return contextlib.nullcontext()
+        return FrameWorkers(self.frame_threads)
+    
+    def _create_timeline_clip(self,
+                              plan: TimelinePlan,
+                              sources: SourceStream,
+                              timings: Optional[StageTimings] = None,
+                              workers: Optional[FrameWorkers] = None) -> Tuple[VideoClip, '_TimelineDriver']:
+        """Create a single moviepy clip playing the whole timeline.
+        
+        Args:
+            plan: Compiled timeline plan
+            sources: Source frames of the images
+            timings: Optional stage timings charged by the driver
+            workers: Optional thread pool rendering effect frames ahead
             
-            # Convert to numpy array (preserve original size)
-            frame = np.array(pil_image)
+        Returns:
+            Tuple of (VideoClip, the _TimelineDriver serving its frames)
+        """
+        driver = _TimelineDriver(
+            plan,
+            lambda planned: self._prepare_segment(plan, planned, sources),
+            self.resolution,
+            timings,
+            workers
+        )
+        # Half a frame of margin: moviepy writes int(duration * fps) frames,
+        # which float rounding could otherwise bring one frame short
+        duration = (plan.total_frames + 0.5) / self.fps
+        clip = VideoClip(lambda t: driver.frame(int(round(t * self.fps))), duration=duration)
+        return clip, driver
+    
+    def _render_with_moviepy(self,
+                             plan: TimelinePlan,
+                             sources: SourceStream,
+                             output_path: str,
+                             progress_callback: Optional[FrameProgressCallback] = None,
+                             timings: Optional[StageTimings] = None) -> None:
+        """Encode the timeline through moviepy.
+        
+        The timeline is a single clip walked sequentially (see
+        _TimelineDriver) rather than a composition of one clip per segment,
+        whose setup and per-frame cost grow with the number of segments.
+        
+        Args:
+            plan: Compiled timeline plan
+            sources: Source frames of the images
+            output_path: Path where the video will be saved
+            progress_callback: Optional callable receiving (frames_done, total_frames)
+            timings: Optional stage timings (the encode stage only covers
+                moviepy's side: its ffmpeg process is not measured)
+        """
+        with self._frame_workers() as workers:
+            final_video, driver = self._create_timeline_clip(plan, sources, timings, workers)
             
-            frames_data.append({
-                'frame': frame,
-                'timestamp': img.timestamp,
-                'path': img.image_path
-            })
+            final_video.write_videofile(
+                output_path,
+                fps=self.fps,
+                codec='libx264',
+                preset=self.encoder_profile.preset,
+                ffmpeg_params=self.encoder_profile.ffmpeg_params(self.fps),
+                audio=False,
+                threads=self.encoder_threads,
+                logger=_MoviepyProgressLogger(progress_callback) if progress_callback else None
+            )
+        if timings is not None:
+            timings.lap(ENCODE_STAGE, driver.last_lap)
+            timings.add(ENCODE_STAGE, frames=plan.total_frames)
+    
+    def _render_with_ffmpeg_pipe(self,
+                                 plan: TimelinePlan,
+                                 sources: SourceStream,
+                                 output_path: str,
+                                 progress_callback: Optional[FrameProgressCallback] = None,
+                                 timings: Optional[StageTimings] = None) -> None:
+        """Encode the timeline by streaming raw frames straight into ffmpeg.
+        
+        Frames are sampled at the same instants as the moviepy backend
+        (t = k / fps within each segment). With a pipeline depth, frames are
+        handed to ffmpeg by a separate encode thread (see FramePipeline)
+        while the next ones render; source images are already decoded
+        ahead by the SourceStream, so decode, render and encode overlap.
         
-        return frames_data
+        Args:
+            plan: Compiled timeline plan
+            sources: Source frames of the images
+            output_path: Path where the video will be saved
+            progress_callback: Optional callable receiving (frames_done, total_frames),
+                called after each frame
+            timings: Optional stage timings (the encode stage includes the
+                ffmpeg process's CPU time; pipeline stalls are reported)
+        """
+        ffmpeg_params = self.encoder_profile.ffmpeg_params(self.fps)
+        if self.encoder_threads:
+            ffmpeg_params.extend(['-threads', str(self.encoder_threads)])
+        
+        writer = FFmpegPipeWriter(output_path, fps=self.fps, resolution=self.resolution,
+                                  preset=self.encoder_profile.preset,
+                                  ffmpeg_params=ffmpeg_params)
+        on_frames = (
+            (lambda frames_done: progress_callback(frames_done, plan.total_frames))
+            if progress_callback else None
+        )
+        # A single CPU cannot overlap the stages: the encode thread would
+        # only add copies and context switches
+        cpu_count = self.threads or os.cpu_count() or 1
+        pipeline = (
+            FramePipeline(writer, self.resolution, self.pipeline_depth, on_frames)
+            if self.pipeline_depth > 0 and cpu_count > 1 else None
+        )
+        with writer, self._frame_workers() as workers:
+            if pipeline is None:
+                # Output buffers reused for every frame of the render
+                pool = FramePool(self.resolution)
+                for planned in plan.segments:
+                    segment = self._prepare_segment_timed(plan, planned, sources, timings)
+                    write_segment(segment, writer, self.resolution, pool, on_frames, timings,
+                                  workers=workers)
+            else:
+                with pipeline:
+                    for planned in plan.segments:
+                        segment = self._prepare_segment_timed(plan, planned, sources, timings)
+                        write_segment(segment, pipeline, self.resolution, pipeline,
+                                      timings=timings, write_stage=QUEUE_STAGE, workers=workers)
+            started = StageTimings.start()
+        
+        if timings is not None:
+            # Flush and wait for ffmpeg (on exiting the writer), plus ffmpeg's own CPU
+            timings.lap(ENCODE_STAGE, started)
+            timings.add(ENCODE_STAGE, cpu=writer.cpu_seconds or 0.0, frames=plan.total_frames)
+            if pipeline is not None:
+                pipeline.add_timings(timings)
     
-    def _create_static_clip(self, frame: np.ndarray, duration: float) -> VideoClip:
-        """Create a static video clip from a single frame (DEPRECATED).
+    def _render_with_ffmpeg_parallel(self,
+                                     plan: TimelinePlan,
+                                     sources: SourceStream,
+                                     output_path: str,
+                                     progress_callback: Optional[FrameProgressCallback] = None,
+                                     segment_keys: Optional[List[str]] = None,
+                                     timings: Optional[StageTimings] = None) -> dict:
+        """Encode each segment in its own worker process, then stream-copy concat.
+        
+        Every effect and transition segment is independent, so they are
+        encoded concurrently as closed-GOP pieces and joined with the
+        concat demuxer without re-encoding. Segments found in the segment
+        cache are not encoded again, so re-rendering an edited timeline only
+        encodes the segments the edit touched.
         
         Args:
-            frame: Frame as numpy array
-            duration: Duration in seconds
+            plan: Compiled timeline plan
+            sources: Source frames of the images
+            output_path: Path where the video will be saved
+            progress_callback: Optional callable receiving (frames_done, total_frames),
+                called as segments complete
+            segment_keys: Optional segment cache keys, one per segment
+            timings: Optional stage timings, merged with the workers' timings
+                (wall times of concurrent workers add up)
             
         Returns:
-            VideoClip instance
+            Segment cache statistics (hits and misses)
         """
-        def make_frame(t):
-            return frame
+        segments = plan.segments
+        work_dir = tempfile.mkdtemp(
+            prefix='segments_',
+            dir=os.path.dirname(os.path.abspath(output_path))
+        )
+        try:
+            segment_paths = [
+                os.path.join(work_dir, f"segment_{index:05d}.mp4")
+                for index in range(len(segments))
+            ]
+            total_frames = plan.total_frames
+            frames_done = 0
+            
+            # Reuse the segments encoded by earlier renders
+            pending = []
+            for index, segment in enumerate(segments):
+                key = segment_keys[index] if segment_keys else None
+                if key is not None and self.segment_cache.fetch_file(key, '.mp4', segment_paths[index]):
+                    frames_done += segment.frame_count
+                    sources.release(segment)
+                else:
+                    pending.append(index)
+            reused = len(segments) - len(pending)
+            if reused:
+                logger.info(f"Reusing {reused}/{len(segments)} segments from the segment cache")
+            if progress_callback and reused:
+                progress_callback(frames_done, total_frames)
+            
+            if pending:
+                encoding = segment_encoding(self.encoder_profile, self.fps)
+                cpu_count = self.encoder_threads or os.cpu_count() or 1
+                max_workers = min(self.max_workers or cpu_count, len(pending))
+                # Split encoder threads between workers to avoid oversubscription
+                threads_per_segment = max(1, cpu_count // max_workers)
+                logger.info(
+                    f"Rendering {len(pending)} segments with {max_workers} workers "
+                    f"({threads_per_segment} encoder threads each)"
+                )
+                with ProcessPoolExecutor(max_workers=max_workers,
+                                         mp_context=SEGMENT_WORKER_CONTEXT,
+                                         initializer=limit_opencv_threads) as executor:
+                    def submit(index: int) -> Future:
+                        return executor.submit(
+                            encode_segment,
+                            self._prepare_segment_timed(plan, segments[index], sources, timings),
+                            segment_paths[index],
+                            self.fps,
+                            self.resolution,
+                            threads_per_segment,
+                            encoding,
+                            timings is not None
+                        )
+                    
+                    # Prepared segments carry their frames until a worker has
+                    # received them: keep a bounded number in flight
+                    to_submit = iter(pending)
+                    in_flight = deque(
+                        (index, submit(index))
+                        for index in itertools.islice(to_submit, 2 * max_workers)
+                    )
+                    while in_flight:
+                        index, future = in_flight.popleft()
+                        segment_timings = future.result()
+                        next_index = next(to_submit, None)
+                        if next_index is not None:
+                            in_flight.append((next_index, submit(next_index)))
+                        if timings is not None:
+                            timings.merge(segment_timings['stages'])
+                        if segment_keys and segment_keys[index] is not None:
+                            self.segment_cache.store_file(segment_keys[index], '.mp4', segment_paths[index])
+                        frames_done += segments[index].frame_count
+                        metrics.observe_rendered_frames((segments[index],))
+                        if progress_callback:
+                            progress_callback(frames_done, total_frames)
+                if segment_keys:
+                    self.segment_cache.evict()
+            
+            logger.info(f"Concatenating {len(segment_paths)} encoded segments")
+            started = StageTimings.start()
+            concat_segment_files(segment_paths, output_path)
+            if timings is not None:
+                timings.lap(CONCAT_STAGE, started)
+        finally:
+            shutil.rmtree(work_dir, ignore_errors=True)
         
-        return VideoClip(make_frame, duration=duration)
+        return {"hits": reused, "misses": len(pending)}
     
-    def _create_effect_clip(self, 
-                           frame: np.ndarray, 
-                           effect: 'EffectBase',
-                           duration: float) -> VideoClip:
-        """Create a video clip with an effect applied.
+    def _validate_inputs(self, images: List[ImageTimestamp], output_path: str) -> None:
+        """Validate input parameters.
         
         Args:
-            frame: Original frame (can be any size)
-            effect: Effect instance to apply
-            duration: Duration in seconds
+            images: List of images to validate
+            output_path: Output path to validate
             
-        Returns:
-            VideoClip with effect applied
+        Raises:
+            ValueError: If validation fails
         """
-        def make_frame(t):
-            # Calculate progress (0.0 to 1.0)
-            progress = t / duration if duration > 0 else 0.0
-            progress = max(0.0, min(1.0, progress))  # Clamp to [0, 1]
+        self._validate_images(images)
+        
+        # Check output path
+        if not output_path:
+            raise ValueError("Output path cannot be empty")
+        
+        # Check if output directory is writable
+        output_dir = os.path.dirname(os.path.abspath(output_path))
+        if output_dir and not os.path.exists(output_dir):
+            try:
+                os.makedirs(output_dir, exist_ok=True)
+            except Exception as e:
+                raise ValueError(f"Cannot create output directory: {e}")
+    
+    def _validate_images(self, images: List[ImageTimestamp]) -> None:
+        """Validate the image list of a timeline.
+        
+        Args:
+            images: List of images to validate
             
-            # Apply effect at this progress point
-            return effect.apply(frame, progress, self.resolution)
+        Raises:
+            ValueError: If there are fewer than 2 images or a file is missing
+        """
+        if not images or len(images) < 2:
+            raise ValueError("At least 2 images are required")
         
-        return VideoClip(make_frame, duration=duration)
+        # Check if all image files exist
+        for img in images:
+            if not os.path.exists(img.image_path):
+                raise ValueError(f"Image file not found: {img.image_path}")
     
-    def _create_transition_clip(self,
-                               frame1: np.ndarray,
-                               frame2: np.ndarray,
-                               transition: 'TransitionBase') -> VideoClip:
-        """Create a transition clip between two frames.
+    def _decode_image(self, image_path: str, source_scale: Optional[float] = None) -> np.ndarray:
+        """Decode an image to an RGB array.
+        
+        With a source scale, JPEGs use DCT-domain scaling (PIL draft mode):
+        the decoder picks the smallest 1/2, 1/4 or 1/8 reduction whose size
+        still covers the output resolution times ``source_scale``. Decode
+        time and memory drop accordingly; other formats decode at full size.
         
         Args:
-            frame1: First frame
-            frame2: Second frame
-            transition: Transition instance to apply
+            image_path: Path of the image file
+            source_scale: Effect's maximum scale factor, or None for a
+                full-size decode
             
         Returns:
-            VideoClip with transition effect
+            RGB frame as numpy array
         """
-        duration = self.transition_duration
+        # Load image with PIL then convert to numpy array
+        pil_image: Image.Image = Image.open(image_path)
+        
+        if source_scale is not None:
+            w, h = pil_image.size
+            target_w, target_h = self.resolution
+            scale = max(target_w / w, target_h / h) * source_scale
+            if scale < 1.0:
+                pil_image.draft('RGB', (int(math.ceil(w * scale)), int(math.ceil(h * scale))))
         
-        def make_frame(t):
-            progress = t / duration
-            progress = max(0.0, min(1.0, progress))  # Clamp to [0, 1]
-            return transition.apply(frame1, frame2, progress)
+        # Convert to RGB if necessary
+        if pil_image.mode != 'RGB':
+            pil_image = pil_image.convert('RGB')
         
-        return VideoClip(make_frame, duration=duration)
+        # Convert to numpy array
+        return np.array(pil_image)
     
     @staticmethod
     def list_available_transitions() -> List[str]:
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Benchmark du moteur de blending des transitions.
+
+Ce script compare, pour plusieurs résolutions:
+1. L'ancien blending float64: (frame1 * (1 - alpha) + frame2 * alpha).astype(np.uint8)
+2. Le nouveau moteur uint8 (cv2.addWeighted), avec et sans buffer `out=`
+
+Il affiche le temps moyen par appel, le gain et l'écart maximal entre
+les deux implémentations (attendu: ±1).
+
+Il mesure aussi un cross dissolve vectorisé sur toute la plage de
+progression (un broadcast numpy par paquet de frames, dans un buffer
+(N, H, W, 3) réutilisé) contre un appel `blend` par frame dans le même
+buffer. Le broadcast est plus lent: les transitions restent donc rendues
+frame par frame via `apply()`.
+
+Usage:
+    python benchmark_blending.py
+"""
+
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+# Add app directory to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from app.services.transitions.blending import blend, blend_constant
+
+
+RESOLUTIONS = {
+    "720p": (1280, 720),
+    "1080p": (1920, 1080),
+    "4K": (3840, 2160),
+}
+ALPHAS = np.linspace(0.0, 1.0, 31)
+# Transition de 0.5 s à 60 fps, vectorisée par paquets de 8 frames
+RANGE_FRAMES = 30
+RANGE_CHUNK = 8
+
+
+def legacy_blend(frame1: np.ndarray, frame2: np.ndarray, alpha: float) -> np.ndarray:
+    """Ancienne implémentation de TransitionBase.blend_frames."""
+    return (frame1 * (1 - alpha) + frame2 * alpha).astype(np.uint8)
+
+
+def vectorized_range_blend(frame1: np.ndarray,
+                           frame2: np.ndarray,
+                           alphas: np.ndarray,
+                           out: np.ndarray) -> np.ndarray:
+    """Cross dissolve de toute la plage, un broadcast float32 par paquet."""
+    start = frame1.astype(np.float32) + 0.5
+    delta = frame2.astype(np.float32) - frame1
+    for first in range(0, len(alphas), RANGE_CHUNK):
+        chunk = alphas[first:first + RANGE_CHUNK].astype(np.float32)
+        weighted = delta * chunk[:, None, None, None]
+        weighted += start
+        np.copyto(out[:len(chunk)], weighted, casting="unsafe")
+    return out
+
+
+def time_once(func, repeat: int = 3) -> float:
+    """Meilleur temps (en ms) d'un appel unique."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def time_per_call(func, repeat: int = 3) -> float:
+    """Temps moyen par appel (en ms) sur toutes les valeurs d'alpha."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for alpha in ALPHAS:
+            func(float(alpha))
+        best = min(best, (time.perf_counter() - start) / len(ALPHAS))
+    return best * 1000
+
+
+def benchmark_resolution(name: str, resolution: tuple[int, int]) -> None:
+    """Benchmark du blending pour une résolution donnée."""
+    width, height = resolution
+    rng = np.random.default_rng(0)
+    frame1 = rng.integers(0, 256, (height, width, 3), dtype=np.uint8)
+    frame2 = rng.integers(0, 256, (height, width, 3), dtype=np.uint8)
+    out = np.empty_like(frame1)
+
+    legacy_ms = time_per_call(lambda a: legacy_blend(frame1, frame2, a))
+    new_ms = time_per_call(lambda a: blend(frame1, frame2, a))
+    new_out_ms = time_per_call(lambda a: blend(frame1, frame2, a, out))
+    white_legacy_ms = time_per_call(
+        lambda a: legacy_blend(frame1, np.ones_like(frame1) * 255, a)
+    )
+    white_new_ms = time_per_call(lambda a: blend_constant(frame1, 255.0, a, out))
+
+    max_diff = max(
+        int(np.abs(legacy_blend(frame1, frame2, float(a)).astype(np.int16)
+                   - blend(frame1, frame2, float(a))).max())
+        for a in ALPHAS
+    )
+
+    alphas = np.arange(RANGE_FRAMES) / RANGE_FRAMES
+    batch = np.empty((RANGE_CHUNK,) + frame1.shape, dtype=np.uint8)
+    range_ms = time_once(
+        lambda: vectorized_range_blend(frame1, frame2, alphas, batch)
+    ) / RANGE_FRAMES
+    per_frame_ms = time_once(
+        lambda: [blend(frame1, frame2, a, batch[i % RANGE_CHUNK]) for i, a in enumerate(alphas)]
+    ) / RANGE_FRAMES
+
+    print(f"\n📐 {name} ({width}x{height})")
+    print(f"   float64 (ancien)        : {legacy_ms:8.2f} ms/appel")
+    print(f"   uint8 addWeighted       : {new_ms:8.2f} ms/appel  (x{legacy_ms / new_ms:.1f})")
+    print(f"   uint8 addWeighted + out : {new_out_ms:8.2f} ms/appel  (x{legacy_ms / new_out_ms:.1f})")
+    print(f"   flash blanc (ancien)    : {white_legacy_ms:8.2f} ms/appel")
+    print(f"   flash blanc (constante) : {white_new_ms:8.2f} ms/appel  (x{white_legacy_ms / white_new_ms:.1f})")
+    print(f"   écart max vs ancien     : {max_diff}")
+    print(f"   plage vectorisée (N={RANGE_FRAMES}) : {range_ms:8.2f} ms/frame")
+    print(f"   blend frame par frame   : {per_frame_ms:8.2f} ms/frame  (x{range_ms / per_frame_ms:.1f})")
+
+
+def main() -> None:
+    print("=" * 60)
+    print("⏱️  BENCHMARK DU BLENDING DES TRANSITIONS")
+    print("=" * 60)
+    for name, resolution in RESOLUTIONS.items():
+        benchmark_resolution(name, resolution)
+
+
+if __name__ == "__main__":
+    main()
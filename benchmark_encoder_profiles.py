@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Benchmark des profils d'encodage (draft, standard, archival, still_heavy).
+
+Ce script rend deux timelines de test avec l'encodeur `ffmpeg_pipe`:
+1. "animée": effets pan/zoom/rotation et transitions variées
+2. "statique": images fixes (cas typique du diaporama)
+
+Pour chaque profil, il affiche le temps de rendu, la vitesse par rapport au
+temps réel, la taille du fichier, le débit et le PSNR par rapport à un rendu
+sans perte de la même timeline (le rendu draft est remis à l'échelle avant
+la comparaison).
+
+Usage:
+    python benchmark_encoder_profiles.py [largeur hauteur]
+"""
+
+import re
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from moviepy.config import FFMPEG_BINARY
+
+# Add app directory to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from app.models.video_models import ImageTimestamp
+from app.services.cache import FileCache, VideoOutputCache
+from app.services.encoders.profiles import ENCODER_PROFILES, EncoderProfile
+from app.services.video_generator_service import VideoGeneratorService
+
+
+IMAGES_DIR = Path(__file__).parent / "resources" / "test_images"
+FPS = 30
+SECONDS_PER_IMAGE = 2.5
+ANIMATED_EFFECTS = ["pan_right", "zoom_in_continuous", "rotate_slow", "pan_up", "zoom_out_continuous"]
+TRANSITIONS = ["cross_dissolve", "wipe_left", "zoom_in", "flash_white", "smooth_slide_left"]
+
+
+def build_timeline(animated: bool) -> list[ImageTimestamp]:
+    """Construit la timeline de test à partir des images de resources/test_images."""
+    paths = sorted(p for p in IMAGES_DIR.iterdir() if p.suffix.lower() in (".jpg", ".jpeg", ".png"))
+    return [
+        ImageTimestamp(
+            timestamp=i * SECONDS_PER_IMAGE,
+            image_path=str(path),
+            effect=ANIMATED_EFFECTS[i % len(ANIMATED_EFFECTS)] if animated else "static",
+            transition_type=TRANSITIONS[i % len(TRANSITIONS)] if animated else "cross_dissolve",
+        )
+        for i, path in enumerate(paths)
+    ]
+
+
+def render(images: list[ImageTimestamp], output_path: str, resolution: tuple[int, int],
+           profile: str, work_dir: str) -> tuple[float, dict]:
+    """Rend la timeline (caches de sortie désactivés) et retourne (durée, résultat)."""
+    service = VideoGeneratorService(
+        fps=FPS,
+        resolution=resolution,
+        encoder="ffmpeg_pipe",
+        encoder_profile=profile,
+        output_cache=VideoOutputCache(work_dir, 0, 0),
+        segment_cache=FileCache(work_dir, 0, 0),
+    )
+    start = time.perf_counter()
+    result = service.generate_video(images, output_path)
+    return time.perf_counter() - start, result
+
+
+def render_reference(images: list[ImageTimestamp], output_path: str,
+                     resolution: tuple[int, int], work_dir: str) -> None:
+    """Rendu sans perte (x264 CRF 0) servant de référence pour le PSNR."""
+    lossless = EncoderProfile(name="lossless", preset="ultrafast", crf=0)
+    ENCODER_PROFILES["lossless"] = lossless
+    try:
+        render(images, output_path, resolution, "lossless", work_dir)
+    finally:
+        del ENCODER_PROFILES["lossless"]
+
+
+def psnr(video_path: str, reference_path: str, resolution: tuple[int, int]) -> float:
+    """PSNR moyen (dB) d'une vidéo par rapport à la référence."""
+    width, height = resolution
+    cmd = [
+        FFMPEG_BINARY, "-i", video_path, "-i", reference_path,
+        "-lavfi", f"[0:v]scale={width}:{height}:flags=bicubic[v];[v][1:v]psnr",
+        "-f", "null", "-",
+    ]
+    output = subprocess.run(cmd, capture_output=True, text=True).stderr
+    match = re.search(r"average:([0-9.]+|inf)", output)
+    return float(match.group(1)) if match else float("nan")
+
+
+def benchmark_timeline(name: str, animated: bool, resolution: tuple[int, int]) -> None:
+    """Benchmark de tous les profils sur une timeline."""
+    images = build_timeline(animated)
+    with tempfile.TemporaryDirectory() as work_dir:
+        reference = str(Path(work_dir) / "reference.mp4")
+        render_reference(images, reference, resolution, work_dir)
+
+        # Préchauffe le cache d'images décodées pour ne mesurer que le rendu
+        render(images, str(Path(work_dir) / "warmup.mp4"), resolution, "draft", work_dir)
+
+        print(f"\n🎞️  Timeline {name} ({len(images)} images, {resolution[0]}x{resolution[1]} @ {FPS} fps)")
+        print(f"   {'profil':<12} {'temps':>8} {'vitesse':>9} {'taille':>10} {'débit':>11} {'PSNR':>9}")
+        for profile in ENCODER_PROFILES:
+            output = str(Path(work_dir) / f"{profile}.mp4")
+            elapsed, result = render(images, output, resolution, profile, work_dir)
+            size = Path(output).stat().st_size
+            kbps = size * 8 / result["duration"] / 1000
+            print(
+                f"   {profile:<12} {elapsed:7.2f}s {result['duration'] / elapsed:8.1f}x "
+                f"{size / 1024:8.0f}Ko {kbps:7.0f}kb/s {psnr(output, reference, resolution):7.2f}dB"
+            )
+
+
+def main() -> None:
+    resolution = (int(sys.argv[1]), int(sys.argv[2])) if len(sys.argv) == 3 else (1280, 720)
+
+    print("=" * 60)
+    print("⏱️  BENCHMARK DES PROFILS D'ENCODAGE")
+    print("=" * 60)
+    benchmark_timeline("animée", animated=True, resolution=resolution)
+    benchmark_timeline("statique", animated=False, resolution=resolution)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Benchmark du passage à l'échelle des longues timelines (10 à 5 000 images).
+
+Ce script compare, pour des timelines de 10, 100, 1 000 et 5 000 images:
+1. L'ancienne composition moviepy: un clip par segment, puis
+   concatenate_videoclips(clips, method="compose")
+2. Le nouveau driver de timeline: un seul clip dont les frames sont
+   servies en parcourant les segments dans l'ordre
+
+Seule la production des frames est mesurée (sans encodage, dont le coût
+par frame ne dépend pas de la longueur de la timeline). Les images sont
+statiques avec des fondus enchaînés pour que le coût de l'orchestration ne
+soit pas masqué par celui des effets. Un temps par frame constant indique
+un temps total linéaire en nombre d'images.
+
+Usage:
+    python benchmark_timeline_scaling.py [largeur hauteur]
+"""
+
+import sys
+import time
+from pathlib import Path
+
+from moviepy import VideoClip, concatenate_videoclips
+
+# Add app directory to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from app.models.video_models import ImageTimestamp
+from app.services.source_stream import SourceStream
+from app.services.timeline import TimelinePlan
+from app.services.video_generator_service import VideoGeneratorService
+
+
+IMAGES_DIR = Path(__file__).parent / "resources" / "test_images"
+FPS = 30
+SECONDS_PER_IMAGE = 0.6
+IMAGE_COUNTS = [10, 100, 1000, 5000]
+# Au-delà, la composition est trop lente pour être mesurée en un temps
+# raisonnable (déjà plusieurs minutes à 1 000 images)
+COMPOSE_MAX_IMAGES = 1000
+
+
+def build_timeline(num_images: int) -> list[ImageTimestamp]:
+    """Construit une timeline de num_images en réutilisant resources/test_images."""
+    paths = sorted(p for p in IMAGES_DIR.iterdir() if p.suffix.lower() in (".jpg", ".jpeg", ".png"))
+    return [
+        ImageTimestamp(timestamp=i * SECONDS_PER_IMAGE, image_path=str(paths[i % len(paths)]))
+        for i in range(num_images)
+    ]
+
+
+def time_clip(build_clip) -> tuple[float, float, int]:
+    """Construit un clip et lit toutes ses frames.
+
+    Returns:
+        (durée de construction en s, durée de lecture en s, nombre de frames)
+    """
+    start = time.perf_counter()
+    clip = build_clip()
+    setup = time.perf_counter() - start
+
+    start = time.perf_counter()
+    num_frames = sum(1 for _ in clip.iter_frames(fps=FPS))
+    return setup, time.perf_counter() - start, num_frames
+
+
+def effect_clip(segment: dict, resolution: tuple[int, int]) -> VideoClip:
+    """Ancien clip d'effet: l'effet est appliqué à chaque tick de moviepy."""
+    effect = segment['effect']
+    duration = segment['duration']
+    if effect.is_progress_invariant():
+        # Maintien statique: frame rendue une seule fois
+        held_frame = effect.apply(segment['frame'], 0.0, resolution)
+        return VideoClip(lambda t: held_frame, duration=duration)
+
+    def make_frame(t):
+        progress = max(0.0, min(1.0, t / duration if duration > 0 else 0.0))
+        return effect.apply(segment['frame'], progress, resolution)
+
+    return VideoClip(make_frame, duration=duration)
+
+
+def transition_clip(segment: dict) -> VideoClip:
+    """Ancien clip de transition: une frame calculée à chaque tick de moviepy."""
+    transition = segment['transition']
+    duration = segment['duration']
+
+    def make_frame(t):
+        progress = max(0.0, min(1.0, t / duration))
+        return transition.apply(segment['frame1'], segment['frame2'], progress)
+
+    return VideoClip(make_frame, duration=duration)
+
+
+def compose_clip(service: VideoGeneratorService, plan: TimelinePlan, sources: SourceStream):
+    """Ancienne construction: un clip moviepy par segment, concaténés en mode compose."""
+    clips = []
+    for planned in plan.segments:
+        segment = service._prepare_segment(plan, planned, sources)
+        if segment['kind'] == 'effect':
+            clips.append(effect_clip(segment, service.resolution))
+        else:
+            clips.append(transition_clip(segment))
+    return concatenate_videoclips(clips, method="compose")
+
+
+def benchmark_timeline(num_images: int, resolution: tuple[int, int]) -> None:
+    """Benchmark des deux approches pour une timeline de num_images."""
+    images = build_timeline(num_images)
+    service = VideoGeneratorService(fps=FPS, resolution=resolution)
+
+    start = time.perf_counter()
+    plan = TimelinePlan.compile(images, FPS, service.transition_duration, "cross_dissolve")
+    # Préchauffe le cache d'images décodées pour ne mesurer que l'orchestration
+    with service._open_sources(images, plan) as sources:
+        for i in range(len(images)):
+            sources.frame(i)
+    prepare = time.perf_counter() - start
+
+    with service._open_sources(images, plan) as sources:
+        setup, read, num_frames = time_clip(lambda: service._create_timeline_clip(plan, sources)[0])
+    line = (
+        f"   {num_images:>6} {num_frames:>8} {prepare:8.2f}s "
+        f"{setup * 1000:9.1f}ms {read:8.2f}s {read / num_frames * 1e6:7.0f}µs"
+    )
+
+    if num_images <= COMPOSE_MAX_IMAGES:
+        with service._open_sources(images, plan) as sources:
+            setup, read, _ = time_clip(lambda: compose_clip(service, plan, sources))
+        line += f" {setup * 1000:9.1f}ms {read:8.2f}s {read / num_frames * 1e6:7.0f}µs"
+    else:
+        line += f" {'—':>11} {'—':>9} {'—':>9}"
+    print(line, flush=True)
+
+
+def main() -> None:
+    resolution = (int(sys.argv[1]), int(sys.argv[2])) if len(sys.argv) == 3 else (320, 180)
+
+    print("=" * 100)
+    print(f"⏱️  BENCHMARK DES LONGUES TIMELINES ({resolution[0]}x{resolution[1]} @ {FPS} fps, sans encodage)")
+    print("=" * 100)
+    print(f"   {'':>6} {'':>8} {'':>9} {'--------- driver ----------':>29} {'---------- compose ----------':>31}")
+    print(
+        f"   {'images':>6} {'frames':>8} {'plan+img':>9} "
+        f"{'setup':>11} {'lecture':>9} {'/frame':>9} {'setup':>11} {'lecture':>9} {'/frame':>9}"
+    )
+    for num_images in IMAGE_COUNTS:
+        benchmark_timeline(num_images, resolution)
+
+
+if __name__ == "__main__":
+    main()
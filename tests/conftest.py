@@ -0,0 +1,62 @@
+"""Shared fixtures of the unit tests."""
+
+import os
+from typing import Callable, List, Tuple
+
+import cv2
+import numpy as np
+import pytest
+from PIL import Image
+
+from app.services.cache import DecodedImageCache, FileCache, VideoOutputCache
+from app.services.video_generator_service import VideoGeneratorService
+
+
+@pytest.fixture
+def write_image(tmp_path) -> Callable[..., str]:
+    """Factory writing a small solid-color JPEG and returning its path."""
+
+    def write(name: str, color=(128, 64, 32), size=(64, 48)) -> str:
+        path = os.path.join(tmp_path, name)
+        Image.fromarray(np.full((size[1], size[0], 3), color, dtype=np.uint8)).save(path)
+        return path
+
+    return write
+
+
+@pytest.fixture
+def image_files(write_image) -> List[str]:
+    """Five small JPEGs of distinct colors."""
+    return [write_image(f"{i}.jpg", color=(40 * i, 255 - 40 * i, 100)) for i in range(5)]
+
+
+@pytest.fixture
+def make_service(tmp_path) -> Callable[..., VideoGeneratorService]:
+    """Factory of 320x180 services with private caches (disabled by default)."""
+
+    def make(**kwargs) -> VideoGeneratorService:
+        kwargs.setdefault('fps', 30)
+        kwargs.setdefault('resolution', (320, 180))
+        kwargs.setdefault('image_cache', DecodedImageCache(0))
+        kwargs.setdefault('output_cache', VideoOutputCache(os.path.join(tmp_path, 'outputs'), 0, 0))
+        kwargs.setdefault('segment_cache', FileCache(os.path.join(tmp_path, 'segments'), 0, 0))
+        return VideoGeneratorService(**kwargs)
+
+    return make
+
+
+def read_video(path: str) -> Tuple[int, Tuple[int, int]]:
+    """Decode a video file.
+
+    Returns:
+        Tuple of (number of decoded frames, (width, height))
+    """
+    video = cv2.VideoCapture(path)
+    try:
+        size = (int(video.get(cv2.CAP_PROP_FRAME_WIDTH)), int(video.get(cv2.CAP_PROP_FRAME_HEIGHT)))
+        frames = 0
+        while video.grab():
+            frames += 1
+    finally:
+        video.release()
+    return frames, size
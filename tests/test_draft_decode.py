@@ -0,0 +1,46 @@
+"""Tests of the JPEG draft-mode decode."""
+
+import os
+
+import numpy as np
+import pytest
+from PIL import Image
+
+
+@pytest.fixture
+def photo(tmp_path) -> str:
+    """A 1280x960 noisy JPEG, four times the 320x180 cover size."""
+    path = os.path.join(tmp_path, 'photo.jpg')
+    pixels = np.random.default_rng(0).integers(0, 256, (960, 1280, 3), dtype=np.uint8)
+    Image.fromarray(pixels).save(path, quality=90)
+    return path
+
+
+@pytest.mark.parametrize('source_scale, size', [
+    # Cover scale 0.25: the 1/4 reduction is exactly the cover size
+    (1.0, (320, 240)),
+    # 0.375 needs 480x360, the 1/2 reduction is the smallest that covers it
+    (1.5, (640, 480)),
+    # 0.125: the decoder never goes below 1/8
+    (0.25, (160, 120)),
+    # No reduction would cover a scale of 1 or more
+    (4.0, (1280, 960)),
+])
+def test_draft_picks_the_smallest_covering_reduction(make_service, photo, source_scale, size):
+    frame = make_service(resolution=(320, 180))._decode_image(photo, source_scale)
+    assert (frame.shape[1], frame.shape[0]) == size
+    assert frame.dtype == np.uint8 and frame.shape[2] == 3
+
+
+def test_no_source_scale_decodes_at_full_size(make_service, photo):
+    frame = make_service(resolution=(320, 180))._decode_image(photo)
+    assert frame.shape == (960, 1280, 3)
+
+
+def test_other_formats_decode_at_full_size(make_service, tmp_path):
+    path = os.path.join(tmp_path, 'photo.png')
+    Image.new('L', (1280, 960), 90).save(path)
+    frame = make_service(resolution=(320, 180))._decode_image(path, 1.0)
+    # Converted to RGB, not reduced
+    assert frame.shape == (960, 1280, 3)
+    assert (frame == 90).all()
@@ -0,0 +1,54 @@
+"""Tests of the x264 encoder profiles."""
+
+import os
+from typing import get_args
+
+import cv2
+
+from app.models.video_models import ImageTimestamp, VideoRequest
+from app.services.encoders import ENCODER_BACKENDS
+from app.services.cache import DecodedImageCache, FileCache, VideoOutputCache
+from app.services.encoders.profiles import ENCODER_PROFILES
+from app.services.video_generator_service import VideoGeneratorService
+
+
+def test_request_literals_match_the_registries():
+    # The request model spells the choices out for the OpenAPI schema
+    fields = VideoRequest.model_fields
+    assert set(get_args(fields['encoder'].annotation)) == set(ENCODER_BACKENDS)
+    assert set(get_args(fields['encoder_profile'].annotation)) == set(ENCODER_PROFILES)
+    assert fields['encoder'].default in ENCODER_BACKENDS
+    assert fields['encoder_profile'].default in ENCODER_PROFILES
+
+
+def test_scaled_resolution_stays_even():
+    draft = ENCODER_PROFILES['draft']
+    assert draft.scaled_resolution((1280, 720)) == (640, 360)
+    assert draft.scaled_resolution((1278, 718)) == (638, 358)
+    assert draft.scaled_resolution((2, 2)) == (2, 2)
+    assert ENCODER_PROFILES['standard'].scaled_resolution((1281, 721)) == (1281, 721)
+
+
+def test_draft_reports_its_effective_resolution(image_files, tmp_path):
+    service = VideoGeneratorService(
+        fps=15,
+        resolution=(320, 180),
+        encoder='ffmpeg_pipe',
+        encoder_profile='draft',
+        image_cache=DecodedImageCache(0),
+        output_cache=VideoOutputCache(os.path.join(tmp_path, 'outputs'), 0, 0),
+        segment_cache=FileCache(os.path.join(tmp_path, 'segments'), 0, 0),
+    )
+    images = [ImageTimestamp(timestamp=i * 0.5, image_path=path) for i, path in enumerate(image_files[:2])]
+    output_path = os.path.join(tmp_path, 'draft.mp4')
+
+    result = service.generate_video(images, output_path)
+
+    assert result['requested_resolution'] == (320, 180)
+    assert result['resolution'] == (160, 90)
+    video = cv2.VideoCapture(output_path)
+    try:
+        size = (int(video.get(cv2.CAP_PROP_FRAME_WIDTH)), int(video.get(cv2.CAP_PROP_FRAME_HEIGHT)))
+    finally:
+        video.release()
+    assert size == (160, 90)
@@ -0,0 +1,51 @@
+"""Tests of the ffmpeg pipe encoder."""
+
+import os
+
+import numpy as np
+import pytest
+
+from app.models.video_models import ImageTimestamp
+from app.services.encoders import FFmpegPipeWriter
+from app.services.timeline import TimelinePlan
+from tests.conftest import read_video
+
+
+def test_writer_encodes_every_frame(tmp_path):
+    output_path = os.path.join(tmp_path, 'frames.mp4')
+    with FFmpegPipeWriter(output_path, fps=15, resolution=(64, 48), preset='ultrafast') as writer:
+        for value in range(0, 250, 50):
+            writer.write_frame(np.full((48, 64, 3), value, dtype=np.uint8))
+
+    assert writer.frames_written == 5
+    assert read_video(output_path) == (5, (64, 48))
+
+
+def test_writer_resizes_frames_to_its_resolution(tmp_path):
+    output_path = os.path.join(tmp_path, 'resized.mp4')
+    with FFmpegPipeWriter(output_path, fps=15, resolution=(64, 48), preset='ultrafast') as writer:
+        writer.write_frame(np.zeros((100, 200, 3), dtype=np.uint8))
+
+    assert read_video(output_path) == (1, (64, 48))
+
+
+def test_writer_requires_open(tmp_path):
+    writer = FFmpegPipeWriter(os.path.join(tmp_path, 'closed.mp4'), fps=15, resolution=(64, 48))
+    with pytest.raises(RuntimeError):
+        writer.write_frame(np.zeros((48, 64, 3), dtype=np.uint8))
+
+
+def test_pipe_render_writes_every_planned_frame(make_service, image_files, tmp_path):
+    service = make_service(fps=15, encoder='ffmpeg_pipe')
+    images = [
+        ImageTimestamp(timestamp=i * 0.7, image_path=path, effect=effect)
+        for i, (path, effect) in enumerate(zip(image_files, ['static', 'pan_right', 'zoom_in_continuous']))
+    ]
+    plan = TimelinePlan.compile(images, service.fps, service.transition_duration, 'cross_dissolve')
+    output_path = os.path.join(tmp_path, 'pipe.mp4')
+
+    result = service.generate_video(images, output_path)
+
+    assert result['encoder'] == 'ffmpeg_pipe'
+    assert result['duration'] == plan.duration
+    assert read_video(output_path) == (plan.total_frames, (320, 180))
@@ -0,0 +1,92 @@
+"""Tests of the render/encode frame pipeline."""
+
+import threading
+from typing import List, Optional, Tuple
+
+import numpy as np
+import pytest
+
+from app.services.encoders.pipeline import FramePipeline
+
+RESOLUTION = (4, 2)
+
+
+class RecordingWriter:
+    """FFmpegPipeWriter stand-in recording (value, count) per write."""
+
+    def __init__(self, fail_at: Optional[int] = None):
+        self.writes: List[Tuple[int, int]] = []
+        self.fail_at = fail_at
+        self.error = OSError("Broken pipe")
+
+    def write_repeated(self, frame: np.ndarray, count: int) -> None:
+        if len(self.writes) == self.fail_at:
+            raise self.error
+        self.writes.append((int(frame[0, 0, 0]), count))
+
+
+def frame(value: int) -> np.ndarray:
+    return np.full((RESOLUTION[1], RESOLUTION[0], 3), value, dtype=np.uint8)
+
+
+def test_frames_are_encoded_in_write_order():
+    writer = RecordingWriter()
+    with FramePipeline(writer, RESOLUTION, depth=2) as pipeline:
+        for value in range(20):
+            if value % 3:
+                pipeline.write_frame(frame(value))
+            else:
+                # Rendered in place into a pipeline buffer
+                buffer = pipeline.acquire()
+                buffer[:] = value
+                pipeline.write_repeated(buffer, 2)
+
+    assert writer.writes == [(value, 1 if value % 3 else 2) for value in range(20)]
+    assert pipeline.frames_written == pipeline.frames_encoded == 27
+
+
+def test_writer_errors_are_raised_to_the_render_thread():
+    writer = RecordingWriter(fail_at=1)
+    pipeline = FramePipeline(writer, RESOLUTION, depth=2).open()
+
+    with pytest.raises(RuntimeError) as raised:
+        for value in range(50):
+            pipeline.write_frame(frame(value))
+        pipeline.close()
+    assert raised.value.__cause__ is writer.error
+    assert writer.writes == [(0, 1)]
+
+    # Leaving the block on the render error still stops the encode thread
+    with pytest.raises(ValueError):
+        with FramePipeline(RecordingWriter(fail_at=0), RESOLUTION) as pipeline:
+            pipeline.write_frame(frame(0))
+            raise ValueError("render failed")
+    assert pipeline._thread is None
+
+
+def test_render_thread_does_not_block_on_a_dead_encoder():
+    pipeline = FramePipeline(RecordingWriter(), RESOLUTION, depth=2)
+    # An encode thread that exits without freeing any buffer
+    pipeline._encode_loop = lambda: None
+    pipeline.open()
+    pipeline._thread.join()
+
+    written: List[int] = []
+    errors: List[RuntimeError] = []
+
+    def render():
+        try:
+            for value in range(3):
+                pipeline.write_frame(frame(value))
+                written.append(value)
+        except RuntimeError as e:
+            errors.append(e)
+
+    thread = threading.Thread(target=render)
+    thread.start()
+    thread.join(timeout=10)
+
+    assert not thread.is_alive()
+    # Both buffers are queued; the third write finds no thread to free one
+    assert written == [0, 1]
+    assert [str(e) for e in errors] == ["Encoding thread stopped"]
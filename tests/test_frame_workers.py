@@ -0,0 +1,52 @@
+"""Tests of the multi-threaded effect frame rendering."""
+
+import threading
+import time
+from typing import List
+
+import numpy as np
+
+from app.services.frame_workers import FrameWorkers
+
+
+class SlowStartEffect:
+    """Effect stand-in whose early frames take the longest to render."""
+
+    def __init__(self, frame_count: int):
+        self.frame_count = frame_count
+        self.completed: List[int] = []
+        self._lock = threading.Lock()
+
+    def apply(self, source, progress, resolution, out=None):
+        index = round(progress * self.frame_count)
+        time.sleep(0.002 * (self.frame_count - index))
+        out[:] = index
+        with self._lock:
+            self.completed.append(index)
+        return out
+
+
+def test_frames_are_yielded_in_submission_order():
+    effect = SlowStartEffect(12)
+    progresses = np.arange(12) / 12
+
+    with FrameWorkers(threads=4) as workers:
+        frames = [int(frame[0, 0, 0])
+                  for frame in workers.iter_effect_frames(effect, None, progresses, (4, 2))]
+        cpu_seconds = workers.take_cpu_seconds()
+
+    assert frames == list(range(12))
+    # Later frames of a window finished first
+    assert effect.completed != sorted(effect.completed)
+    assert cpu_seconds >= 0.0 and workers.take_cpu_seconds() == 0.0
+
+
+def test_abandoned_iteration_cancels_the_frames_ahead():
+    effect = SlowStartEffect(40)
+    with FrameWorkers(threads=2, window=4) as workers:
+        frames = workers.iter_effect_frames(effect, None, np.arange(40) / 40, (4, 2))
+        assert int(next(frames)[0, 0, 0]) == 0
+        frames.close()
+
+    # The first frame, then at most the window rendered ahead of it
+    assert len(effect.completed) <= 1 + 4
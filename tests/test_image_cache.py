@@ -0,0 +1,78 @@
+"""Tests of the decoded image cache."""
+
+import os
+
+import numpy as np
+import pytest
+
+from app.services.cache import DecodedImageCache
+
+FRAME_BYTES = 10 * 10 * 3
+
+
+def frame(value: int = 0) -> np.ndarray:
+    return np.full((10, 10, 3), value, dtype=np.uint8)
+
+
+def test_hit_and_miss_counters():
+    cache = DecodedImageCache(max_bytes=10 * FRAME_BYTES)
+    assert cache.get('a') is None
+    cache.put('a', frame(1))
+    assert cache.get('a')[0, 0, 0] == 1
+    stats = cache.stats()
+    assert (stats['hits'], stats['misses'], stats['hit_ratio']) == (1, 1, 0.5)
+
+
+def test_evicts_least_recently_used_first():
+    cache = DecodedImageCache(max_bytes=3 * FRAME_BYTES)
+    for key in 'abc':
+        cache.put(key, frame())
+    cache.get('a')  # 'b' is now the least recently used
+    cache.put('d', frame())
+    assert cache.get('b') is None
+    assert all(cache.get(key) is not None for key in 'acd')
+    assert cache.stats()['evictions'] == 1
+
+
+def test_stays_within_budget():
+    cache = DecodedImageCache(max_bytes=int(2.5 * FRAME_BYTES))
+    for i in range(10):
+        cache.put(i, frame(i))
+        assert cache.stats()['bytes'] <= cache.max_bytes
+    assert cache.stats()['entries'] == 2
+
+
+def test_replacing_a_key_does_not_count_it_twice():
+    cache = DecodedImageCache(max_bytes=2 * FRAME_BYTES)
+    cache.put('a', frame(1))
+    cache.put('a', frame(2))
+    assert cache.stats()['bytes'] == FRAME_BYTES
+    assert cache.get('a')[0, 0, 0] == 2
+
+
+@pytest.mark.parametrize('max_bytes', [0, FRAME_BYTES - 1])
+def test_frames_over_budget_are_not_cached(max_bytes):
+    cache = DecodedImageCache(max_bytes=max_bytes)
+    cached = cache.put('a', frame())
+    assert cache.get('a') is None
+    assert not cached.flags.writeable
+
+
+def test_cached_frames_are_read_only():
+    cache = DecodedImageCache(max_bytes=FRAME_BYTES)
+    cache.put('a', frame())
+    with pytest.raises(ValueError):
+        cache.get('a')[0, 0, 0] = 1
+
+
+def test_key_changes_when_the_file_changes(write_image):
+    path = write_image('image.jpg', color=(10, 20, 30))
+    key = DecodedImageCache.make_key(path, (1280, 720), 1.0)
+    assert DecodedImageCache.make_key(path, (1280, 720), 1.0) == key
+    assert DecodedImageCache.make_key(path, (640, 360), 1.0) != key
+    assert DecodedImageCache.make_key(path, (1280, 720), 1.5) != key
+
+    stat = os.stat(path)
+    write_image('image.jpg', color=(200, 20, 30))
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    assert DecodedImageCache.make_key(path, (1280, 720), 1.0) != key
@@ -0,0 +1,116 @@
+"""Tests of the Server-Sent Events stream of render progress."""
+
+import json
+import threading
+from typing import List, Tuple
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.core.config import settings
+from app.core.exceptions import setup_exception_handlers
+from app.routes import video_routes
+from app.services import render_jobs
+from app.services.render_jobs import RenderJobManager
+from app.services.video_generator_service import RenderProgress
+
+REQUEST_BODY = {
+    "images": [
+        {"timestamp": 0.0, "image_path": "a.jpg"},
+        {"timestamp": 1.0, "image_path": "b.jpg"},
+    ],
+    "output_path": "out.mp4",
+}
+
+
+class ProgressService:
+    """Stand-in for VideoGeneratorService reporting one progress step."""
+
+    reported = threading.Event()
+    release = threading.Event()
+
+    def __init__(self, **kwargs):
+        pass
+
+    def generate_video(self, images, output_path, transition_type, progress_callback=None) -> dict:
+        progress_callback(RenderProgress(frames_done=12, total_frames=48, segment_index=1,
+                                         segment_count=3, segment_kind='transition',
+                                         segment_name='cross_dissolve'))
+        ProgressService.reported.set()
+        assert ProgressService.release.wait(timeout=10)
+        return {
+            'output_path': output_path, 'duration': 1.6, 'num_images': len(images),
+            'transition_type': transition_type, 'resolution': (320, 180), 'fps': 30,
+            'encoder': 'ffmpeg_pipe', 'encoder_profile': 'standard', 'image_cache': None,
+            'segment_cache': None, 'from_cache': False,
+        }
+
+
+@pytest.fixture
+def client(monkeypatch):
+    """API client whose jobs run ProgressService, polled every 10 ms."""
+    ProgressService.reported = threading.Event()
+    ProgressService.release = threading.Event()
+    monkeypatch.setattr(render_jobs, 'VideoGeneratorService', ProgressService)
+    monkeypatch.setattr(settings, 'render_progress_interval_seconds', 0.01)
+    manager = RenderJobManager(max_workers=1)
+    monkeypatch.setattr(video_routes, 'get_render_job_manager', lambda: manager)
+    app = FastAPI()
+    setup_exception_handlers(app)
+    app.include_router(video_routes.router)
+    yield TestClient(app)
+    ProgressService.release.set()
+    manager.shutdown()
+
+
+def parse_events(body: str) -> List[Tuple[str, dict]]:
+    """Decode an SSE body into (event, data) pairs, skipping comments."""
+    events = []
+    for message in body.strip().split('\n\n'):
+        fields = dict(line.split(': ', 1) for line in message.split('\n') if not line.startswith(':'))
+        if fields:
+            events.append((fields['event'], json.loads(fields['data'])))
+    return events
+
+
+def test_events_report_progress_then_the_result(client, monkeypatch):
+    find_job_document = video_routes._find_job_document
+    lookups = []
+
+    async def find_then_release(job_id: str):
+        # The render finishes once the stream (after the route's existence
+        # check) has seen it running
+        document = await find_job_document(job_id)
+        lookups.append(job_id)
+        if len(lookups) == 2:
+            ProgressService.release.set()
+        return document
+
+    monkeypatch.setattr(video_routes, '_find_job_document', find_then_release)
+    job_id = client.post('/videos/jobs', json=REQUEST_BODY).json()['job_id']
+    assert ProgressService.reported.wait(timeout=10)
+
+    response = client.get(f'/videos/jobs/{job_id}/events')
+
+    assert response.status_code == 200
+    assert response.headers['content-type'].startswith('text/event-stream')
+    assert response.headers['cache-control'] == 'no-cache'
+    events = parse_events(response.text)
+
+    (first_kind, first), (last_kind, last) = events[0], events[-1]
+    assert first_kind == 'progress'
+    assert (first['state'], first['frames_done'], first['total_frames']) == ('running', 12, 48)
+    assert first['progress'] == 0.25
+    assert (first['segment_index'], first['segment_kind'], first['segment_name']) == (
+        1, 'transition', 'cross_dissolve'
+    )
+    assert 'result' not in first
+    assert all(kind == 'progress' for kind, _ in events[:-1])
+    assert last_kind == 'done'
+    assert last['state'] == 'succeeded' and last['progress'] == 1.0
+    assert last['result']['output_path'] == 'out.mp4'
+
+
+def test_events_of_an_unknown_job_are_not_found(client):
+    assert client.get('/videos/jobs/unknown/events').status_code == 404
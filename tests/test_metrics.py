@@ -0,0 +1,45 @@
+"""Tests of the Prometheus metrics."""
+
+import pytest
+
+from app.core import metrics
+
+
+@pytest.fixture
+def state_collector():
+    metrics.register_state_collector()
+    yield
+    metrics.unregister_state_collector()
+
+
+def scrape() -> str:
+    payload, _ = metrics.render_latest()
+    return payload.decode()
+
+
+def test_state_metrics_are_only_exposed_once_registered():
+    assert 'video_render_queue_depth' not in scrape()
+
+
+def test_registered_collector_exposes_queue_and_cache_state(state_collector):
+    # Registering twice must not duplicate the samples
+    metrics.register_state_collector()
+    payload = scrape()
+
+    assert payload.count('\nvideo_render_queue_depth ') == 1
+    assert 'video_render_workers_max ' in payload
+    assert 'video_cache_lookups_total{cache="image",result="hit"}' in payload
+
+    metrics.unregister_state_collector()
+    assert 'video_render_queue_depth' not in scrape()
+
+
+@pytest.mark.parametrize('num_images, label', [(2, '1-10'), (10, '1-10'), (11, '11-50'), (5000, '1001+')])
+def test_image_count_label(num_images, label):
+    assert metrics.image_count_label(num_images) == label
+
+
+@pytest.mark.parametrize('resolution, label', [((1280, 720), '720p'), ((720, 1280), '720p'),
+                                               ((1920, 1081), '1440p'), ((7680, 4320), '2160p+')])
+def test_resolution_label(resolution, label):
+    assert metrics.resolution_label(resolution) == label
@@ -0,0 +1,82 @@
+"""Tests of the pan effect's prepared-source fast paths against the warp."""
+
+import numpy as np
+import pytest
+
+from app.models.video_models import ImageTimestamp
+from app.services.effects.base import EffectBase
+from app.services.effects.registry import EffectRegistry
+from app.services.timeline import TimelinePlan
+
+FRAME_SIZE = (64, 48)
+
+
+def image(width: int, height: int) -> np.ndarray:
+    return np.random.default_rng(0).integers(0, 256, (height, width, 3), dtype=np.uint8)
+
+
+def reference(effect, fitted: np.ndarray, progress: float) -> np.ndarray:
+    """The pan frame as a single warp of the fitted source."""
+    h, w = fitted.shape[:2]
+    offset = effect._calculate_offset(
+        effect.ease_in_out(progress), w - FRAME_SIZE[0], h - FRAME_SIZE[1]
+    )
+    if not effect.subpixel:
+        offset = (int(offset[0]), int(offset[1]))
+    return EffectBase.resize_crop(fitted, (w, h), offset, FRAME_SIZE)
+
+
+def test_prepare_fits_the_source_once():
+    effect = EffectRegistry.get('pan_right')
+    fitted = effect.prepare(image(200, 100), FRAME_SIZE)
+
+    # Wider than the frame: fitted to its height
+    assert fitted.shape == (48, 96, 3)
+    assert effect.prepare(fitted, FRAME_SIZE) is fitted
+
+
+@pytest.mark.parametrize('progress', [0.0, 0.3, 0.5, 1.0])
+def test_whole_pixel_frames_are_views_of_the_fitted_source(progress):
+    effect = EffectRegistry.get('pan_right')
+    fitted = effect.prepare(image(200, 100), FRAME_SIZE)
+
+    frame = effect.apply(fitted, progress, FRAME_SIZE)
+
+    assert np.shares_memory(frame, fitted)
+    np.testing.assert_array_equal(frame, reference(effect, fitted, progress))
+    out = np.empty_like(frame)
+    assert effect.apply(fitted, progress, FRAME_SIZE, out=out) is out
+    np.testing.assert_array_equal(out, frame)
+
+
+@pytest.mark.parametrize('name, size', [
+    # Fractional x offsets
+    ('pan_right', (200, 100)),
+    # Fractional y offsets
+    ('pan_down', (64, 101)),
+    # Fractional y centre (max_y / 2 = 1.5) of a horizontal pan
+    ('pan_left', (64, 51)),
+])
+@pytest.mark.parametrize('progress', [0.1, 0.3, 0.7])
+def test_subpixel_translate_matches_the_warp(name, size, progress):
+    effect = EffectRegistry.get(name, subpixel=True)
+    fitted = effect.prepare(image(*size), FRAME_SIZE)
+    out = np.empty((FRAME_SIZE[1], FRAME_SIZE[0], 3), dtype=np.uint8)
+
+    frame = effect.apply(fitted, progress, FRAME_SIZE, out=out)
+
+    assert frame is out
+    expected = reference(effect, fitted, progress)
+    # warpAffine quantizes the interpolation weights to 1/32
+    assert np.abs(frame.astype(int) - expected).max() <= 2
+    # Not the whole-pixel frame
+    assert not np.array_equal(frame, EffectRegistry.get(name).apply(fitted, progress, FRAME_SIZE))
+
+
+def test_subpixel_is_an_image_option():
+    images = [
+        ImageTimestamp(timestamp=0.0, image_path='a.jpg', effect='pan_right', effect_subpixel=True),
+        ImageTimestamp(timestamp=2.0, image_path='b.jpg', effect='pan_right'),
+    ]
+    plan = TimelinePlan.compile(images, 30, 0.5, 'cross_dissolve')
+    assert [effect.subpixel for effect in plan.effects] == [True, False]
@@ -0,0 +1,41 @@
+"""End-to-end tests of the ffmpeg_parallel backend (segment workers + concat)."""
+
+import os
+
+from app.models.video_models import ImageTimestamp
+from app.services.cache import FileCache
+from app.services.timeline import TimelinePlan
+from tests.conftest import read_video
+
+
+def timeline(paths):
+    effects = ['static', 'pan_right', 'zoom_in_continuous', 'static']
+    return [
+        ImageTimestamp(timestamp=i * 0.8, image_path=path, effect=effect)
+        for i, (path, effect) in enumerate(zip(paths, effects))
+    ]
+
+
+def test_parallel_render_concatenates_every_segment(make_service, image_files, tmp_path):
+    service = make_service(fps=15, encoder='ffmpeg_parallel', max_workers=2)
+    images = timeline(image_files)
+    plan = TimelinePlan.compile(images, service.fps, service.transition_duration, 'cross_dissolve')
+    output_path = os.path.join(tmp_path, 'parallel.mp4')
+
+    result = service.generate_video(images, output_path)
+
+    assert result['segment_cache'] == {'hits': 0, 'misses': len(plan.segments)}
+    assert read_video(output_path) == (plan.total_frames, (320, 180))
+
+
+def test_parallel_render_reuses_cached_segments(make_service, image_files, tmp_path):
+    segment_cache = FileCache(os.path.join(tmp_path, 'segment-cache'), 10**9, 0)
+    service = make_service(fps=15, encoder='ffmpeg_parallel', max_workers=2, segment_cache=segment_cache)
+    images = timeline(image_files)
+    plan = TimelinePlan.compile(images, service.fps, service.transition_duration, 'cross_dissolve')
+
+    service.generate_video(images, os.path.join(tmp_path, 'first.mp4'))
+    result = service.generate_video(images, os.path.join(tmp_path, 'second.mp4'))
+
+    assert result['segment_cache'] == {'hits': len(plan.segments), 'misses': 0}
+    assert read_video(os.path.join(tmp_path, 'second.mp4')) == (plan.total_frames, (320, 180))
@@ -0,0 +1,104 @@
+"""Tests of the preview frame routes."""
+
+import threading
+
+import cv2
+import numpy as np
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.core.exceptions import setup_exception_handlers
+from app.models.video_models import ImageTimestamp, VideoRequest
+from app.routes import video_routes
+from app.services import render_jobs
+from app.services.render_jobs import RenderJobManager
+from app.services.video_generator_service import VideoGeneratorService
+
+
+class IdleService:
+    """Stand-in for VideoGeneratorService whose renders wait until teardown."""
+
+    release = threading.Event()
+
+    def __init__(self, **kwargs):
+        pass
+
+    def generate_video(self, images, output_path, transition_type, progress_callback=None) -> dict:
+        assert IdleService.release.wait(timeout=10)
+        return {'output_path': output_path}
+
+
+@pytest.fixture
+def manager(monkeypatch):
+    """Manager whose jobs never render (previews use the real service)."""
+    IdleService.release = threading.Event()
+    monkeypatch.setattr(render_jobs, 'VideoGeneratorService', IdleService)
+    manager = RenderJobManager(max_workers=1)
+    yield manager
+    IdleService.release.set()
+    manager.shutdown()
+
+
+@pytest.fixture
+def client(manager, monkeypatch):
+    monkeypatch.setattr(video_routes, 'get_render_job_manager', lambda: manager)
+    app = FastAPI()
+    setup_exception_handlers(app)
+    app.include_router(video_routes.router)
+    return TestClient(app)
+
+
+def timeline(image_files):
+    return [{"timestamp": i * 1.0, "image_path": path, "effect": "pan_right"}
+            for i, path in enumerate(image_files[:3])]
+
+
+def decode(content: bytes) -> np.ndarray:
+    """Decode an image response to RGB."""
+    bgr = cv2.imdecode(np.frombuffer(content, dtype=np.uint8), cv2.IMREAD_COLOR)
+    return cv2.cvtColor(bgr, cv2.COLOR_BGR2RGB)
+
+
+@pytest.mark.parametrize('time', [0.2, 0.6, 2.4])
+def test_post_renders_the_frame_of_the_service(client, image_files, time):
+    images = timeline(image_files)
+    response = client.post('/videos/preview-frame', json={
+        "images": images, "time": time, "resolution": [320, 180], "format": "png",
+        "transition_type": "wipe_left",
+    })
+
+    assert response.status_code == 200
+    assert response.headers['content-type'] == 'image/png'
+    assert response.headers['cache-control'] == 'no-store'
+    expected = VideoGeneratorService(fps=30, resolution=(320, 180)).render_frame(
+        [ImageTimestamp(**image) for image in images], time, 'wipe_left'
+    )
+    # PNG is lossless: the exact frame the encoders receive
+    np.testing.assert_array_equal(decode(response.content), expected)
+
+
+def test_post_rejects_times_outside_the_video(client, image_files):
+    response = client.post('/videos/preview-frame', json={
+        "images": timeline(image_files), "time": 60.0, "resolution": [320, 180],
+    })
+    assert response.status_code == 400
+
+
+def test_get_renders_a_job_frame_at_its_render_resolution(client, manager, image_files):
+    job = manager.submit(VideoRequest(
+        images=timeline(image_files), output_path='out.mp4', resolution=(320, 180),
+        encoder_profile='draft'
+    ))
+
+    response = client.get('/videos/preview-frame', params={"job_id": job.job_id, "time": 0.5})
+
+    assert response.status_code == 200
+    assert response.headers['content-type'] == 'image/jpeg'
+    # The draft profile renders at half resolution
+    assert decode(response.content).shape == (90, 160, 3)
+
+
+def test_get_of_an_unknown_job_is_not_found(client):
+    response = client.get('/videos/preview-frame', params={"job_id": "unknown", "time": 0.5})
+    assert response.status_code == 404
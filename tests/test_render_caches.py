@@ -0,0 +1,210 @@
+"""Tests of the on-disk render caches and of their keys."""
+
+import os
+import time
+
+import pytest
+
+from app.models.video_models import ImageTimestamp
+from app.services import video_generator_service
+from app.services.cache import FileCache, VideoOutputCache
+from app.services.cache.file_cache import place_file
+from app.services.timeline import TimelinePlan
+
+
+def write_file(path: str, size: int, last_used: float = None) -> str:
+    with open(path, 'wb') as file:
+        file.write(b'x' * size)
+    if last_used is not None:
+        os.utime(path, (last_used, last_used))
+    return path
+
+
+def cached_keys(cache: FileCache) -> set:
+    return {os.path.splitext(name)[0] for name in os.listdir(cache.directory)}
+
+
+def test_place_file_hard_links(tmp_path):
+    source = write_file(os.path.join(tmp_path, 'source'), 10)
+    destination = os.path.join(tmp_path, 'destination')
+    write_file(destination, 3)
+    place_file(source, destination)
+    assert os.stat(destination).st_ino == os.stat(source).st_ino
+    assert [name for name in os.listdir(tmp_path) if name.startswith('.tmp_')] == []
+
+
+def test_place_file_copies_when_links_fail(tmp_path, monkeypatch):
+    def no_link(source, destination):
+        raise OSError("cross-device link")
+
+    monkeypatch.setattr(os, 'link', no_link)
+    source = write_file(os.path.join(tmp_path, 'source'), 10)
+    destination = os.path.join(tmp_path, 'destination')
+    place_file(source, destination)
+    assert os.stat(destination).st_ino != os.stat(source).st_ino
+    assert os.path.getsize(destination) == 10
+
+
+def test_evicts_least_recently_used_entries_over_budget(tmp_path):
+    cache = FileCache(os.path.join(tmp_path, 'cache'), max_bytes=250, max_age_seconds=0)
+    os.makedirs(cache.directory)
+    now = time.time()
+    for age, key in ((30, 'old'), (20, 'middle'), (10, 'recent')):
+        write_file(cache.path(key, '.mp4'), 100, last_used=now - age)
+
+    cache.evict()
+    assert cached_keys(cache) == {'middle', 'recent'}
+
+
+def test_fetch_refreshes_an_entry(tmp_path):
+    cache = FileCache(os.path.join(tmp_path, 'cache'), max_bytes=250, max_age_seconds=0)
+    os.makedirs(cache.directory)
+    now = time.time()
+    for age, key in ((30, 'old'), (20, 'middle'), (10, 'recent')):
+        write_file(cache.path(key, '.mp4'), 100, last_used=now - age)
+
+    assert cache.fetch_file('old', '.mp4', os.path.join(tmp_path, 'out.mp4'))
+    cache.evict()
+    assert cached_keys(cache) == {'old', 'recent'}
+
+
+def test_files_of_an_entry_share_its_budget(tmp_path):
+    cache = FileCache(os.path.join(tmp_path, 'cache'), max_bytes=150, max_age_seconds=0)
+    os.makedirs(cache.directory)
+    now = time.time()
+    write_file(cache.path('a', '.mp4'), 100, last_used=now - 20)
+    write_file(cache.path('a', '.json'), 20, last_used=now - 1)
+    write_file(cache.path('b', '.mp4'), 100, last_used=now - 10)
+
+    # 'a' was used last through its .json: 'b' goes, both files of 'a' stay
+    cache.evict()
+    assert sorted(os.listdir(cache.directory)) == ['a.json', 'a.mp4']
+
+
+def test_evicts_expired_entries_under_budget(tmp_path):
+    cache = FileCache(os.path.join(tmp_path, 'cache'), max_bytes=10_000, max_age_seconds=60)
+    os.makedirs(cache.directory)
+    now = time.time()
+    write_file(cache.path('expired', '.mp4'), 10, last_used=now - 120)
+    write_file(cache.path('fresh', '.mp4'), 10, last_used=now - 30)
+
+    cache.evict()
+    assert cached_keys(cache) == {'fresh'}
+
+
+def test_disabled_cache_stores_nothing(tmp_path):
+    cache = FileCache(os.path.join(tmp_path, 'cache'), max_bytes=0, max_age_seconds=0)
+    cache.store_file('a', '.mp4', write_file(os.path.join(tmp_path, 'video.mp4'), 10))
+    assert not os.path.exists(cache.directory)
+    assert not cache.fetch_file('a', '.mp4', os.path.join(tmp_path, 'out.mp4'))
+    assert cache.stats()['misses'] == 0
+
+
+def test_output_cache_round_trip(tmp_path):
+    cache = VideoOutputCache(os.path.join(tmp_path, 'outputs'), max_bytes=10_000, max_age_seconds=0)
+    output_path = os.path.join(tmp_path, 'out.mp4')
+    assert cache.fetch('key', '.mp4', output_path) is None
+
+    cache.store('key', '.mp4', write_file(os.path.join(tmp_path, 'video.mp4'), 10), {"duration": 4.0})
+    assert cache.fetch('key', '.mp4', output_path) == {"duration": 4.0}
+    assert os.path.getsize(output_path) == 10
+    assert cache.stats() == {"hits": 1, "misses": 1, "hit_ratio": 0.5}
+
+
+def test_output_cache_hits_leave_served_videos_untouched(tmp_path):
+    cache = VideoOutputCache(os.path.join(tmp_path, 'outputs'), max_bytes=10_000, max_age_seconds=0)
+    cache.store('key', '.mp4', write_file(os.path.join(tmp_path, 'video.mp4'), 10), {})
+    first = os.path.join(tmp_path, 'first.mp4')
+    assert cache.fetch('key', '.mp4', first) == {}
+    stale = time.time() - 3600
+    os.utime(first, (stale, stale))
+    os.utime(cache.path('key', '.json'), (stale, stale))
+
+    assert cache.fetch('key', '.mp4', os.path.join(tmp_path, 'second.mp4')) == {}
+
+    # The served videos share the entry's inode: only the metadata is touched
+    assert os.stat(first).st_ino == os.stat(cache.path('key', '.mp4')).st_ino
+    assert os.stat(first).st_mtime == stale
+    assert os.stat(cache.path('key', '.json')).st_mtime > stale
+
+
+def test_output_cache_stays_within_budget(tmp_path):
+    cache = VideoOutputCache(os.path.join(tmp_path, 'outputs'), max_bytes=350, max_age_seconds=0)
+    for i in range(5):
+        video = write_file(os.path.join(tmp_path, f'video{i}.mp4'), 100)
+        cache.store(f'key{i}', '.mp4', video, {})
+        os.utime(cache.path(f'key{i}', '.mp4'), (time.time() - 10 + i, time.time() - 10 + i))
+    assert cached_keys(cache) == {'key2', 'key3', 'key4'}
+
+
+def timeline(paths):
+    return [
+        ImageTimestamp(timestamp=i * 1.5, image_path=path, effect='pan_right' if i % 2 else 'static')
+        for i, path in enumerate(paths)
+    ]
+
+
+def edit_image(write_image, path: str) -> None:
+    """Rewrite an image with other pixels (and a later mtime)."""
+    stat = os.stat(path)
+    write_image(os.path.basename(path), color=(1, 2, 3))
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+
+def test_request_key_follows_image_content(make_service, image_files, write_image, tmp_path):
+    service = make_service()
+    images = timeline(image_files)
+    key = service._request_key(images, 'cross_dissolve', '.mp4')
+
+    # Same content under another name: same key
+    copy = os.path.join(tmp_path, 'copy.jpg')
+    with open(image_files[0], 'rb') as source, open(copy, 'wb') as destination:
+        destination.write(source.read())
+    assert service._request_key(timeline([copy] + image_files[1:]), 'cross_dissolve', '.mp4') == key
+
+    edit_image(write_image, image_files[2])
+    assert service._request_key(images, 'cross_dissolve', '.mp4') != key
+
+
+def test_request_key_follows_settings(make_service, image_files, monkeypatch):
+    images = timeline(image_files)
+    key = make_service()._request_key(images, 'cross_dissolve', '.mp4')
+
+    assert make_service(encoder_profile='archival')._request_key(images, 'cross_dissolve', '.mp4') != key
+    assert make_service(encoder='ffmpeg_pipe')._request_key(images, 'cross_dissolve', '.mp4') != key
+    assert make_service()._request_key(images, 'wipe_left', '.mp4') != key
+    assert make_service()._request_key(images, 'cross_dissolve', '.mov') != key
+
+    monkeypatch.setattr(video_generator_service, 'RENDER_VERSION', video_generator_service.RENDER_VERSION + 1)
+    assert make_service()._request_key(images, 'cross_dissolve', '.mp4') != key
+
+
+def test_editing_an_image_invalidates_only_its_segments(make_service, image_files, write_image):
+    service = make_service()
+    images = timeline(image_files)
+    plan = TimelinePlan.compile(images, service.fps, service.transition_duration, 'cross_dissolve')
+    keys = service._segment_keys(images, plan)
+    assert len(set(keys)) == len(plan.segments) == 9
+
+    edit_image(write_image, image_files[2])
+    changed = [
+        segment.index
+        for segment, before, after in zip(plan.segments, keys, service._segment_keys(images, plan))
+        if before != after
+    ]
+    # The image's effect segment and the transitions into and out of it
+    assert changed == [segment.index for segment in plan.segments if 2 in segment.sources]
+    assert len(changed) == 3
+
+
+def test_segment_keys_follow_profile_and_render_version(make_service, image_files, monkeypatch):
+    images = timeline(image_files)
+    service = make_service()
+    plan = TimelinePlan.compile(images, service.fps, service.transition_duration, 'cross_dissolve')
+    keys = service._segment_keys(images, plan)
+
+    archival = make_service(encoder_profile='archival')
+    assert not set(archival._segment_keys(images, plan)) & set(keys)
+
+    monkeypatch.setattr(video_generator_service, 'RENDER_VERSION', video_generator_service.RENDER_VERSION + 1)
+    assert not set(service._segment_keys(images, plan)) & set(keys)
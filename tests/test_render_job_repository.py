@@ -0,0 +1,145 @@
+"""Tests of the render job repository, against an in-memory MongoDB."""
+
+import asyncio
+from datetime import timedelta
+
+import pytest
+from mongomock_motor import AsyncMongoMockClient
+
+from app.helpers.datetime_utils import now_utc
+from app.models.video_models import ImageTimestamp, VideoRequest
+from app.repositories.render_job_repository import RenderJobRepository
+from app.services.render_job_persister import RenderJobPersister
+from app.services.render_jobs import RenderJob
+
+
+@pytest.fixture
+def repository() -> RenderJobRepository:
+    return RenderJobRepository(AsyncMongoMockClient()["test_db"])
+
+
+def job_document(job_id: str, state: str = "running", owner: str = "live", age: float = 0.0) -> dict:
+    """Minimal job document whose lease was last renewed ``age`` seconds ago."""
+    renewed = now_utc() - timedelta(seconds=age)
+    return {"_id": job_id, "owner": owner, "state": state, "created_at": renewed,
+            "updated_at": renewed, "heartbeat_at": renewed}
+
+
+def states(repository: RenderJobRepository) -> dict:
+    documents = asyncio.run(repository.collection.find({}).to_list(length=None))
+    return {document["_id"]: document["state"] for document in documents}
+
+
+def test_mark_interrupted_only_fails_stale_jobs(repository):
+    documents = [
+        job_document("live-running"),
+        job_document("live-queued", state="queued"),
+        job_document("stale-running", owner="gone", age=120),
+        job_document("stale-succeeded", state="succeeded", owner="gone", age=120),
+    ]
+    legacy = {"_id": "legacy", "state": "running", "created_at": now_utc()}
+    asyncio.run(repository.save_many(documents + [legacy]))
+
+    assert asyncio.run(repository.mark_interrupted(60)) == 2
+    assert states(repository) == {
+        "live-running": "running",
+        "live-queued": "queued",
+        "stale-running": "failed",
+        "stale-succeeded": "succeeded",
+        "legacy": "failed",
+    }
+
+
+def test_mark_interrupted_fails_own_jobs_from_previous_run(repository):
+    asyncio.run(repository.save_many([job_document("mine", owner="me"), job_document("other")]))
+
+    assert asyncio.run(repository.mark_interrupted(60, owner="me")) == 1
+    assert states(repository) == {"mine": "failed", "other": "running"}
+
+
+def test_heartbeat_renews_own_unfinished_jobs(repository):
+    asyncio.run(repository.save_many([
+        job_document("mine", owner="me", age=50),
+        job_document("mine-done", state="succeeded", owner="me", age=50),
+        job_document("other", age=50),
+    ]))
+
+    assert asyncio.run(repository.heartbeat("me")) == 1
+    # The other instance stopped renewing its job: only that one is stale
+    assert asyncio.run(repository.mark_interrupted(40)) == 1
+    assert states(repository) == {"mine": "running", "mine-done": "succeeded", "other": "failed"}
+
+
+def test_list_pages_through_jobs_created_in_the_same_millisecond(repository):
+    created = now_utc().replace(microsecond=123000)
+    documents = [
+        {"_id": f"job-{index}", "state": "succeeded", "request": {},
+         "created_at": created - timedelta(seconds=index // 3)}
+        for index in range(7)
+    ]
+    asyncio.run(repository.save_many(documents))
+
+    pages = []
+    before = before_id = None
+    while True:
+        page = asyncio.run(repository.list(limit=2, before=before, before_id=before_id))
+        pages.append([document["_id"] for document in page])
+        if len(page) < 2:
+            break
+        before, before_id = page[-1]["created_at"], page[-1]["_id"]
+
+    assert pages == [["job-2", "job-1"], ["job-0", "job-5"], ["job-4", "job-3"], ["job-6"]]
+    assert all("request" not in document for document in page)
+
+
+def test_save_many_writes_the_request_only_on_insert(repository):
+    document = dict(job_document("job"), state="queued", request={"images": ["a.jpg"]})
+    asyncio.run(repository.save_many([document]))
+
+    # Later writes leave the request out, or carry a stale copy of it
+    asyncio.run(repository.save_many([dict(job_document("job"), frames_done=10)]))
+    asyncio.run(repository.save_many([dict(job_document("job", state="succeeded"), request={})]))
+
+    stored = asyncio.run(repository.get("job"))
+    assert stored["request"] == {"images": ["a.jpg"]}
+    assert (stored["state"], stored["frames_done"]) == ("succeeded", 10)
+
+
+class DirtyJobs:
+    """Stand-in for RenderJobManager whose jobs are always dirty."""
+
+    instance_id = "me"
+    track_changes = False
+
+    def __init__(self, jobs):
+        self.jobs = jobs
+
+    def drain_dirty(self):
+        return list(self.jobs)
+
+    def mark_dirty(self, jobs):
+        pass
+
+
+def test_persister_sends_the_request_once(repository, monkeypatch):
+    request = VideoRequest(images=[ImageTimestamp(timestamp=0.0, image_path="a.jpg"),
+                                   ImageTimestamp(timestamp=1.0, image_path="b.jpg")],
+                           output_path="out.mp4")
+    job = RenderJob(job_id="job", request=request, owner="me")
+    persister = RenderJobPersister(DirtyJobs([job]), repository)
+    save_many = repository.save_many
+    written = []
+
+    async def record(documents):
+        written.extend(documents)
+        await save_many(documents)
+
+    monkeypatch.setattr(repository, "save_many", record)
+    asyncio.run(persister.flush())
+    job.state = "running"
+    asyncio.run(persister.flush())
+
+    assert ["request" in document for document in written] == [True, False]
+    stored = asyncio.run(repository.get("job"))
+    assert stored["state"] == "running"
+    assert stored["request"]["images"][0]["image_path"] == "a.jpg"
@@ -0,0 +1,216 @@
+"""Tests of the render job manager's admission control and its 429 response."""
+
+import threading
+from typing import List
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.core.exceptions import setup_exception_handlers
+from app.models.video_models import ImageTimestamp, VideoRequest
+from app.routes import video_routes
+from app.services import render_jobs
+from app.services.render_jobs import RenderJobManager, RenderQueueFullError
+
+REQUEST_BODY = {
+    "images": [
+        {"timestamp": 0.0, "image_path": "a.jpg"},
+        {"timestamp": 1.0, "image_path": "b.jpg"},
+    ],
+    "output_path": "out.mp4",
+}
+
+
+class BlockingService:
+    """Stand-in for VideoGeneratorService whose renders wait for a release."""
+
+    release = threading.Event()
+    started: List[dict] = []
+
+    def __init__(self, **kwargs):
+        self.kwargs = kwargs
+
+    def generate_video(self, images, output_path, transition_type, progress_callback=None) -> dict:
+        BlockingService.started.append(self.kwargs)
+        assert BlockingService.release.wait(timeout=10)
+        return {'output_path': output_path, 'from_cache': False}
+
+
+@pytest.fixture
+def blocking_service(monkeypatch):
+    """Replace the renderer with BlockingService; release the renders on teardown."""
+    BlockingService.release = threading.Event()
+    BlockingService.started = []
+    monkeypatch.setattr(render_jobs, 'VideoGeneratorService', BlockingService)
+    yield BlockingService
+    BlockingService.release.set()
+
+
+@pytest.fixture
+def manager(blocking_service):
+    """Manager with one render slot and one place in the wait queue."""
+    manager = RenderJobManager(max_workers=1, max_queued=1, default_retry_after=7)
+    yield manager
+    blocking_service.release.set()
+    manager.shutdown()
+
+
+def make_request() -> VideoRequest:
+    """A two-image request (never rendered: the service is replaced)."""
+    return VideoRequest(
+        images=[ImageTimestamp(timestamp=0.0, image_path='a.jpg'),
+                ImageTimestamp(timestamp=1.0, image_path='b.jpg')],
+        output_path='out.mp4'
+    )
+
+
+def wait_running(manager: RenderJobManager, count: int) -> None:
+    """Wait until ``count`` renders have started."""
+    for _ in range(200):
+        if manager.queue_stats()['running'] == count:
+            return
+        threading.Event().wait(0.01)
+    raise AssertionError(f"{count} renders never started: {manager.queue_stats()}")
+
+
+def test_submit_accepts_until_slots_and_queue_are_full(manager):
+    running = manager.submit(make_request())
+    wait_running(manager, 1)
+    queued = manager.submit(make_request())
+
+    assert running.queue_position == 0
+    assert queued.queue_position == 1
+    assert queued.state == "queued"
+    stats = manager.queue_stats()
+    assert (stats['running'], stats['queued']) == (1, 1)
+
+    with pytest.raises(RenderQueueFullError) as raised:
+        manager.submit(make_request())
+    assert raised.value.queue['running'] + raised.value.queue['queued'] == 2
+    # Rejected jobs are not tracked
+    assert len(manager.list()) == 2
+
+
+def test_slots_free_up_once_renders_finish(manager, blocking_service):
+    jobs = [manager.submit(make_request()) for _ in range(2)]
+    blocking_service.release.set()
+    results = [job.future.result(timeout=10) for job in jobs]
+
+    assert [result['output_path'] for result in results] == ['out.mp4', 'out.mp4']
+    assert all(job.state == "succeeded" for job in jobs)
+    stats = manager.queue_stats()
+    assert (stats['running'], stats['queued']) == (0, 0)
+    assert stats['average_job_seconds'] is not None
+    manager.submit(make_request())
+
+
+def test_queue_position_counts_jobs_waiting_ahead(blocking_service):
+    manager = RenderJobManager(max_workers=2, max_queued=3)
+    try:
+        positions = [manager.submit(make_request()).queue_position for _ in range(5)]
+        assert positions == [0, 0, 1, 2, 3]
+        with pytest.raises(RenderQueueFullError):
+            manager.submit(make_request())
+    finally:
+        blocking_service.release.set()
+        manager.shutdown()
+
+
+def test_retry_after_uses_default_then_queue_depth(manager):
+    manager.submit(make_request())
+    wait_running(manager, 1)
+    manager.submit(make_request())
+    with pytest.raises(RenderQueueFullError) as raised:
+        manager.submit(make_request())
+    assert raised.value.retry_after == 7
+
+    # One job waiting ahead, one slot: two average renders before a slot frees
+    manager._average_duration = 12.5
+    with pytest.raises(RenderQueueFullError) as raised:
+        manager.submit(make_request())
+    assert raised.value.retry_after == 25
+
+
+def test_job_splits_its_cpu_share_between_frames_and_encoder(blocking_service, monkeypatch):
+    monkeypatch.setattr(render_jobs.os, 'cpu_count', lambda: 8)
+    manager = RenderJobManager(max_workers=2)
+    try:
+        manager.submit(make_request())
+        wait_running(manager, 1)
+        assert manager.threads_per_job == 4
+        assert blocking_service.started[0]['threads'] == 4
+        assert blocking_service.started[0]['frame_threads'] == 2
+    finally:
+        blocking_service.release.set()
+        manager.shutdown()
+
+
+def test_list_pages_on_creation_date_then_id(manager):
+    jobs = [manager.submit(make_request()) for _ in range(2)]
+    created = jobs[0].created_at
+    for job in jobs:
+        job.created_at = created
+    newest, oldest = sorted(jobs, key=lambda job: job.job_id, reverse=True)
+
+    assert manager.list(limit=1) == [newest]
+    assert manager.list(limit=1, before=created, before_id=newest.job_id) == [oldest]
+    assert manager.list(before=created, before_id=oldest.job_id) == []
+
+
+@pytest.fixture
+def client(manager, monkeypatch):
+    """API client whose routes use the test manager."""
+    monkeypatch.setattr(video_routes, 'get_render_job_manager', lambda: manager)
+    app = FastAPI()
+    setup_exception_handlers(app)
+    app.include_router(video_routes.router)
+    return TestClient(app)
+
+
+def test_submit_route_reports_queue_position(client, manager):
+    first = client.post('/videos/jobs', json=REQUEST_BODY)
+    wait_running(manager, 1)
+    second = client.post('/videos/jobs', json=REQUEST_BODY)
+
+    assert first.status_code == 202
+    assert first.json()['queue_position'] == 0
+    assert second.status_code == 202
+    assert second.json()['queue_position'] == 1
+    assert second.json()['status_url'].endswith(f"/videos/jobs/{second.json()['job_id']}")
+
+
+def test_full_queue_answers_429_with_retry_after(client, manager):
+    for _ in range(2):
+        assert client.post('/videos/jobs', json=REQUEST_BODY).status_code == 202
+
+    response = client.post('/videos/jobs', json=REQUEST_BODY)
+
+    assert response.status_code == 429
+    assert response.headers['Retry-After'] == '7'
+    wait_running(manager, 1)
+    queue = client.get('/videos/queue').json()
+    assert (queue['running'], queue['queued']) == (1, 1)
+
+
+def test_shutdown_fails_the_queued_jobs(manager, blocking_service):
+    manager.track_changes = True
+    running = manager.submit(make_request())
+    wait_running(manager, 1)
+    queued = manager.submit(make_request())
+    manager.drain_dirty()
+
+    manager.shutdown()
+
+    assert queued.state == "failed" and queued.error == "Canceled by a service shutdown"
+    assert queued.finished_at is not None
+    assert queued.future.cancelled()
+    stats = manager.queue_stats()
+    assert (stats['running'], stats['queued']) == (1, 0)
+    # Flagged for the persister's last flush
+    assert manager.drain_dirty() == [queued]
+
+    # The running render is left to finish
+    blocking_service.release.set()
+    assert running.future.result(timeout=10)['output_path'] == 'out.mp4'
+    assert running.state == "succeeded"
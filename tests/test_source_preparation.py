@@ -0,0 +1,52 @@
+"""Tests of the per-effect source downscale."""
+
+import numpy as np
+import pytest
+
+from app.services.effects.registry import EffectRegistry
+
+
+def image(width: int, height: int) -> np.ndarray:
+    return np.random.default_rng(0).integers(0, 256, (height, width, 3), dtype=np.uint8)
+
+
+def test_static_source_is_cover_fitted(make_service):
+    service = make_service(resolution=(320, 180))
+    source = service._prepare_source(image(1280, 960), EffectRegistry.get('static'))
+    # Cover fit: the width is the binding side (scale 0.25)
+    assert source.shape == (240, 320, 3)
+
+
+@pytest.mark.parametrize('intensity', [0.5, 1.0, 2.0])
+def test_zoom_source_keeps_the_peak_zoom(make_service, intensity):
+    service = make_service(resolution=(320, 180))
+    effect = EffectRegistry.get('zoom_in_continuous', intensity=intensity)
+    source = service._prepare_source(image(1920, 1440), effect)
+
+    scale = (320 / 1920) * effect.max_source_scale()
+    assert source.shape[:2] == (int(np.ceil(1440 * scale)), int(np.ceil(1920 * scale)))
+    # Every frame of the zoom is covered without upscaling
+    assert source.shape[1] >= 320 * effect.max_source_scale()
+    assert source.shape[0] >= 180 * effect.max_source_scale()
+
+
+def test_small_images_are_never_upscaled(make_service):
+    service = make_service(resolution=(320, 180))
+    frame = image(200, 100)
+    assert service._prepare_source(frame, EffectRegistry.get('static')) is frame
+
+
+def test_zoom_on_an_image_just_above_cover_size_is_not_downscaled(make_service):
+    service = make_service(resolution=(320, 180))
+    frame = image(400, 300)
+    # Cover scale 0.8, times a 1.6 peak zoom: above 1, the original is kept
+    effect = EffectRegistry.get('zoom_in_continuous', intensity=2.0)
+    assert service._prepare_source(frame, effect) is frame
+
+
+def test_loaded_sources_are_prepared(make_service, write_image):
+    service = make_service(resolution=(320, 180))
+    path = write_image('large.jpg', size=(1280, 960))
+    frame, cached = service._load_source(path, EffectRegistry.get('static'))
+    assert not cached
+    assert frame.shape == (240, 320, 3)
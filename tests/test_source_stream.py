@@ -0,0 +1,78 @@
+"""Tests of the look-ahead loading and release of render sources."""
+
+import threading
+from typing import List
+
+import numpy as np
+
+from app.models.video_models import ImageTimestamp
+from app.services.source_stream import SourceStream
+from app.services.stage_timings import RENDER_WAITING_ON_DECODE, StageTimings
+from app.services.timeline import TimelinePlan
+
+
+class CountingLoader:
+    """SourceLoader stand-in recording the paths it loads."""
+
+    def __init__(self):
+        self.calls: List[str] = []
+        self._lock = threading.Lock()
+
+    def __call__(self, image_path, effect, key, timings):
+        with self._lock:
+            self.calls.append(image_path)
+        return np.full((2, 2, 3), len(self.calls), dtype=np.uint8), False
+
+
+def open_stream(paths, loader, lookahead=2, timings=None) -> SourceStream:
+    images = [ImageTimestamp(timestamp=2.0 * i, image_path=path) for i, path in enumerate(paths)]
+    plan = TimelinePlan.compile(images, 30, 0.5, 'cross_dissolve')
+    return SourceStream(plan, images, lambda image, effect: image.image_path, loader,
+                        lookahead, timings)
+
+
+def render_all(stream: SourceStream) -> None:
+    """Walk the plan the way a renderer does."""
+    for segment in stream.plan.segments:
+        for index in segment.sources:
+            stream.frame(index)
+        stream.release(segment)
+
+
+def test_frame_schedules_the_following_images():
+    loader = CountingLoader()
+    with open_stream(['0.jpg', '1.jpg', '2.jpg', '3.jpg', '4.jpg'], loader) as stream:
+        stream.frame(0)
+        scheduled = dict(stream._frames)
+        for future in scheduled.values():
+            future.result(timeout=10)
+
+        assert sorted(scheduled) == ['0.jpg', '1.jpg', '2.jpg']
+        assert sorted(loader.calls) == ['0.jpg', '1.jpg', '2.jpg']
+
+
+def test_full_pass_loads_each_image_once_and_releases_it():
+    loader = CountingLoader()
+    timings = StageTimings()
+    with open_stream(['0.jpg', '1.jpg', '2.jpg', '1.jpg', '4.jpg'], loader,
+                     timings=timings) as stream:
+        render_all(stream)
+
+        # 1.jpg is read by two images sharing its key: loaded once
+        assert sorted(loader.calls) == ['0.jpg', '1.jpg', '2.jpg', '4.jpg']
+        assert stream._frames == {}
+        assert stream.stats() == {"hits": 0, "misses": 4, "unique_images": 4}
+    assert RENDER_WAITING_ON_DECODE in timings.summary()['stalls']
+
+
+def test_without_lookahead_images_load_on_first_use():
+    loader = CountingLoader()
+    with open_stream(['0.jpg', '1.jpg', '2.jpg'], loader, lookahead=0) as stream:
+        assert stream._executor is None
+        for segment in stream.plan.segments[:2]:
+            stream.release(segment)
+        # Image 0 has no segment left; image 1 is loaded on first use
+        stream.frame(1)
+
+        assert loader.calls == ['1.jpg']
+        assert list(stream._frames) == ['1.jpg']
@@ -0,0 +1,83 @@
+"""Tests of static holds: rendered once, written as repeated frames."""
+
+import os
+from typing import List, Tuple
+
+import numpy as np
+
+from app.services.effects.registry import EffectRegistry
+from app.services.encoders import FFmpegPipeWriter
+from app.services.encoders.segments import encode_segment, is_static_segment, write_segment
+from tests.conftest import read_video
+
+RESOLUTION = (64, 48)
+
+
+class RecordingWriter:
+    """Writer double recording write calls as (kind, count)."""
+
+    def __init__(self):
+        self.calls: List[Tuple[str, int]] = []
+        self.frames_written = 0
+
+    def write_frame(self, frame: np.ndarray) -> None:
+        self.write_repeated(frame, 1)
+        self.calls[-1] = ('frame', 1)
+
+    def write_repeated(self, frame: np.ndarray, count: int) -> None:
+        assert frame.shape == (RESOLUTION[1], RESOLUTION[0], 3)
+        self.calls.append(('repeated', count))
+        self.frames_written += count
+
+
+def effect_segment(effect: str, frame_count: int, intensity: float = 1.0) -> dict:
+    frame = np.random.default_rng(0).integers(0, 256, (60, 80, 3), dtype=np.uint8)
+    return {
+        'kind': 'effect', 'name': effect, 'sources': (0,), 'frame_count': frame_count,
+        'duration': frame_count / 15, 'frame': frame,
+        'effect': EffectRegistry.get(effect, intensity=intensity),
+    }
+
+
+def test_static_hold_is_written_once_with_its_frame_count():
+    segment = effect_segment('static', 37)
+    writer = RecordingWriter()
+    progress: List[int] = []
+
+    write_segment(segment, writer, RESOLUTION, on_frames=progress.append)
+
+    assert is_static_segment(segment)
+    assert writer.calls == [('repeated', 37)]
+    assert progress == [37]
+
+
+def test_zero_intensity_effect_is_a_static_hold():
+    segment = effect_segment('pan_right', 12, intensity=0.0)
+    writer = RecordingWriter()
+    write_segment(segment, writer, RESOLUTION)
+    assert writer.calls == [('repeated', 12)]
+
+
+def test_moving_effect_writes_every_frame():
+    segment = effect_segment('pan_right', 12)
+    writer = RecordingWriter()
+    write_segment(segment, writer, RESOLUTION)
+    assert writer.calls == [('frame', 1)] * 12
+
+
+def test_repeated_frames_are_all_encoded(tmp_path):
+    output_path = os.path.join(tmp_path, 'hold.mp4')
+    frame = np.full((RESOLUTION[1], RESOLUTION[0], 3), 90, dtype=np.uint8)
+    with FFmpegPipeWriter(output_path, fps=15, resolution=RESOLUTION, preset='ultrafast') as writer:
+        writer.write_repeated(frame, 9)
+        writer.write_frame(frame)
+
+    assert writer.frames_written == 10
+    assert read_video(output_path) == (10, RESOLUTION)
+
+
+def test_encoded_static_segment_repeats_its_frame(tmp_path):
+    # The segment encoder pipes the hold frame once and lets ffmpeg loop it
+    output_path = os.path.join(tmp_path, 'segment.mp4')
+    encode_segment(effect_segment('static', 23), output_path, 15, RESOLUTION)
+    assert read_video(output_path) == (23, RESOLUTION)
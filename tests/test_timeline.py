@@ -0,0 +1,143 @@
+"""Tests of the compiled timeline plan."""
+
+import numpy as np
+import pytest
+
+from app.models.video_models import ImageTimestamp
+from app.services.timeline import DEFAULT_IMAGE_DURATION, TimelinePlan, frame_progresses
+
+
+def images_at(*timestamps, **kwargs):
+    return [
+        ImageTimestamp(timestamp=timestamp, image_path=f"{i}.jpg", **kwargs)
+        for i, timestamp in enumerate(timestamps)
+    ]
+
+
+def layout(plan: TimelinePlan):
+    return [(segment.kind, segment.sources, segment.start_frame, segment.frame_count)
+            for segment in plan.segments]
+
+
+@pytest.fixture
+def plan() -> TimelinePlan:
+    # 1.5 s effects and 0.5 s transitions; the last image reuses the 2 s gap
+    return TimelinePlan.compile(images_at(0.0, 2.0, 4.0), 30, 0.5, 'cross_dissolve')
+
+
+def test_compile_lays_out_effects_and_transitions(plan):
+    assert layout(plan) == [
+        ('effect', (0,), 0, 45),
+        ('transition', (0, 1), 45, 15),
+        ('effect', (1,), 60, 45),
+        ('transition', (1, 2), 105, 15),
+        ('effect', (2,), 120, 45),
+    ]
+    assert plan.total_frames == 165
+    assert plan.duration == 5.5
+    assert plan.segment_starts == (0, 45, 60, 105, 120)
+    assert [segment.index for segment in plan.segments] == [0, 1, 2, 3, 4]
+    assert len(plan.effects) == 3
+    assert plan.segments[2].effect is plan.effects[1]
+    assert plan.segments[1].transition is not None and plan.segments[1].effect is None
+
+
+def test_segments_are_contiguous(plan):
+    for previous, segment in zip(plan.segments, plan.segments[1:]):
+        assert segment.start_frame == previous.end_frame
+    assert plan.segments[-1].end_frame == plan.total_frames
+
+
+def test_boundaries_are_rounded_cumulative_times():
+    # 0.51 s effects: 15.3 frames each, which would drift if rounded one by one
+    plan = TimelinePlan.compile(images_at(0.0, 1.01, 2.02), 30, 0.5, 'cross_dissolve')
+
+    assert [segment.end_frame for segment in plan.segments] == [15, 30, 46, 61, 76]
+    assert [segment.frame_count for segment in plan.segments] == [15, 15, 16, 15, 15]
+    assert plan.total_frames == round(2.53 * 30)
+
+
+def test_half_frames_round_up():
+    # 0.25 s at 30 fps is 7.5 frames
+    plan = TimelinePlan.compile(images_at(0.0, 0.75), 30, 0.5, 'cross_dissolve')
+    assert [segment.end_frame for segment in plan.segments] == [8, 23, 30]
+
+
+def test_zero_frame_segments_are_dropped():
+    # 0.01 s effect before the transition: a third of a frame
+    plan = TimelinePlan.compile(images_at(0.0, 0.51), 30, 0.5, 'cross_dissolve')
+
+    # The last effect (0.52 s cumulative, 15.6 frames) keeps its single frame
+    assert layout(plan) == [('transition', (0, 1), 0, 15), ('effect', (1,), 15, 1)]
+    assert [segment.index for segment in plan.segments] == [0, 1]
+
+
+def test_gaps_shorter_than_the_transition_have_no_effect_segment():
+    plan = TimelinePlan.compile(images_at(0.0, 0.4, 0.8), 30, 0.5, 'cross_dissolve')
+    assert [segment.kind for segment in plan.segments] == ['transition', 'transition']
+    assert all(segment.frame_count > 0 for segment in plan.segments)
+
+
+def test_single_image_uses_the_default_duration():
+    plan = TimelinePlan.compile(images_at(0.0), 30, 0.5, 'cross_dissolve')
+    assert layout(plan) == [('effect', (0,), 0, round((DEFAULT_IMAGE_DURATION - 0.5) * 30))]
+
+
+def test_per_image_transition_overrides_the_default():
+    images = images_at(0.0, 2.0, 4.0)
+    images[1].transition_type = 'wipe_left'
+    plan = TimelinePlan.compile(images, 30, 0.5, 'cross_dissolve')
+    assert [segment.name for segment in plan.segments if segment.kind == 'transition'] == [
+        'cross_dissolve', 'wipe_left'
+    ]
+
+
+def test_unknown_types_are_rejected():
+    with pytest.raises(ValueError):
+        TimelinePlan.compile(images_at(0.0, 2.0), 30, 0.5, 'no_such_transition')
+    with pytest.raises(ValueError):
+        TimelinePlan.compile(images_at(0.0, 2.0, effect='no_such_effect'), 30, 0.5, 'cross_dissolve')
+
+
+@pytest.mark.parametrize('frame, index, offset', [
+    (0, 0, 0),
+    (44, 0, 44),
+    (45, 1, 0),
+    (59, 1, 14),
+    (60, 2, 0),
+    (164, 4, 44),
+    # Past the end: the last segment
+    (200, 4, 80),
+])
+def test_segment_at_frame(plan, frame, index, offset):
+    segment, segment_offset = plan.segment_at_frame(frame)
+    assert (segment.index, segment_offset) == (index, offset)
+    assert plan.segment_index_at_frame(frame) == index
+
+
+def test_segment_at_time_edges(plan):
+    assert plan.segment_at_time(0.0)[0].index == 0
+    # k / fps lands on frame k despite float error
+    assert plan.frame_at_time(1.5) == 45
+    assert plan.segment_at_time(1.5) == (plan.segments[1], 0)
+    assert plan.frame_at_time(1.5 - 1e-3) == 44
+    # The end of the video shows the last frame
+    assert plan.frame_at_time(plan.duration) == 164
+    assert plan.segment_at_time(plan.duration) == (plan.segments[4], 44)
+
+
+@pytest.mark.parametrize('time', [-0.01, 5.51])
+def test_times_outside_the_video_are_rejected(plan, time):
+    with pytest.raises(ValueError):
+        plan.segment_at_time(time)
+
+
+def test_frame_progresses_match_progress_at(plan):
+    segment = plan.segments[1]
+    progresses = frame_progresses(segment.frame_count)
+
+    assert progresses[0] == 0.0 and progresses[-1] < 1.0
+    np.testing.assert_array_equal(
+        progresses, [segment.progress_at(offset) for offset in range(segment.frame_count)]
+    )
+    np.testing.assert_array_equal(frame_progresses(4), [0.0, 0.25, 0.5, 0.75])
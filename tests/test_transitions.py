@@ -0,0 +1,88 @@
+"""Tests of the transition blending."""
+
+import cv2
+import numpy as np
+import pytest
+
+from app.services.transitions.blending import blend, blend_constant
+from app.services.transitions.registry import TransitionRegistry
+from app.services.transitions.smooth import GlitchTransition, SmoothStretchTransition
+
+PROGRESSES = np.linspace(0.0, 1.0, 16)
+
+
+def random_frames(height: int = 90, width: int = 160, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    frame1 = rng.integers(0, 256, (height, width, 3), dtype=np.uint8)
+    frame2 = rng.integers(0, 256, (height, width, 3), dtype=np.uint8)
+    return frame1, frame2
+
+
+@pytest.mark.parametrize('alpha', [0.0, 0.1, 0.5, 0.73, 1.0])
+def test_blend_is_the_rounded_float_blend(alpha):
+    frame1, frame2 = random_frames()
+    expected = frame1 * (1 - alpha) + frame2 * alpha
+    assert np.abs(blend(frame1, frame2, alpha).astype(float) - expected).max() <= 0.5 + 1e-6
+
+
+def test_blend_constant_writes_into_out():
+    frame, _ = random_frames()
+    out = np.empty_like(frame)
+    result = blend_constant(frame, 255.0, 0.25, out)
+    assert result is out
+    assert np.abs(out.astype(float) - (frame * 0.75 + 255 * 0.25)).max() <= 0.5 + 1e-6
+
+
+@pytest.mark.parametrize('name', TransitionRegistry.list_available())
+def test_transitions_write_into_out(name):
+    transition = TransitionRegistry.get(name)
+    frame1, frame2 = random_frames()
+    for progress in PROGRESSES:
+        out = np.empty_like(frame1)
+        result = transition.apply(frame1, frame2, float(progress), out=out)
+        assert result.shape == frame1.shape and result.dtype == np.uint8
+        np.testing.assert_array_equal(result, transition.apply(frame1, frame2, float(progress)))
+
+
+def test_glitch_truncates_a_single_float_blend():
+    frame1, frame2 = random_frames()
+    width = frame1.shape[1]
+    transition = GlitchTransition()
+    for progress in PROGRESSES:
+        eased = transition._ease_in_out_sine(progress)
+        intensity = 1.0 - abs(eased - 0.5) * 2
+        base = frame1 * (1.0 - eased) + frame2 * eased
+        if intensity <= 0.1:
+            continue
+        shift = int(width * 0.02 * intensity)
+        k = intensity * 0.6
+        glitched = base.copy()
+        glitched[:, :, 2] = 0
+        glitched[:, shift:, 2] = base[:, :width - shift, 2]
+        glitched[:, :, 0] = 0
+        glitched[:, :width - shift, 0] = base[:, shift:, 0]
+        expected = np.trunc(base * (1.0 - k) + glitched * k)
+        result = transition.apply(frame1, frame2, float(progress))
+        # float32 arithmetic may land on the other side of an integer
+        assert np.abs(result - expected).max() <= 1
+        assert np.mean(result == expected) > 0.95
+
+
+def test_stretch_overshoot_saturates():
+    frame1, frame2 = random_frames()
+    height, width = frame1.shape[:2]
+    transition = SmoothStretchTransition()
+    overshoot = [p for p in PROGRESSES if transition._ease_out_back(p) > 1.0]
+    assert overshoot
+    for progress in PROGRESSES:
+        assert transition.apply(frame1, frame2, float(progress)).shape == frame1.shape
+    for progress in overshoot:
+        # frame2 is larger than the frame and opaque: only its center shows
+        eased = transition._ease_out_back(progress)
+        scaled = cv2.resize(frame2, (int(width * eased), int(height * eased)))
+        top = -((height - scaled.shape[0]) // 2)
+        left = -((width - scaled.shape[1]) // 2)
+        np.testing.assert_array_equal(
+            transition.apply(frame1, frame2, float(progress)),
+            scaled[top:top + height, left:left + width]
+        )